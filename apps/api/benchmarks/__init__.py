@@ -0,0 +1 @@
+"""Ad-hoc performance benchmarks for the API services (not part of the test suite)."""
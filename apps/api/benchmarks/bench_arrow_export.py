@@ -0,0 +1,63 @@
+"""Bulk Arrow export vs one JSON request per geo, with peak Python heap during the export.
+
+The heap is measured around the stream generator itself, since the in-process
+test client buffers whole response bodies.
+
+    PYTHONPATH=. python -m benchmarks.bench_arrow_export --geos 400 --weeks 520
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.marketing_mix as marketing_mix
+from benchmarks.synthetic import write_synthetic_dataset
+from services.marketing_mix_export import geo_arrow_stream
+from services.marketing_mix_service import MarketingMixService, get_marketing_mix_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--geos", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=260)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_synthetic_dataset(Path(tmp), geos=args.geos, weeks=args.weeks)
+        service = MarketingMixService(data_dir=data_dir, backend="columnar", use_snapshot=False)
+        app = FastAPI()
+        app.include_router(marketing_mix.router)
+        app.dependency_overrides[get_marketing_mix_service] = lambda: service
+        client = TestClient(app)
+
+        started = time.perf_counter()
+        json_bytes = sum(
+            len(client.get(f"/marketing-mix/geos/{geo}").content) for geo in service.list_geos()
+        )
+        print(f"per-geo JSON : {time.perf_counter() - started:6.2f} s  {json_bytes / 2**20:7.1f} MiB")
+
+        # Pull one batch first so pyarrow's lazy imports are not counted as export memory.
+        warm_up = geo_arrow_stream(service)
+        next(warm_up), next(warm_up)
+        warm_up.close()
+        tracemalloc.start()
+        started = time.perf_counter()
+        arrow_bytes = sum(len(chunk) for chunk in geo_arrow_stream(service))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"arrow stream : {elapsed:6.2f} s  {arrow_bytes / 2**20:7.1f} MiB"
+            f"  (peak traced heap {peak / 2**20:.1f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
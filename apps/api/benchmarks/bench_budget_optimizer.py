@@ -0,0 +1,52 @@
+"""Budget optimizer latency on synthetic cached response curves.
+
+    PYTHONPATH=. python -m benchmarks.bench_budget_optimizer --channels 10 --steps 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from services.mmm_optimizer import ResponseCurveTable, optimize_budget
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    baseline = rng.uniform(1e5, 1e6, args.channels)
+    spend = baseline[:, None] * np.linspace(0, 3, 61)
+    half = (baseline * rng.uniform(0.5, 2.0, args.channels))[:, None]
+    shape = rng.uniform(1.0, 3.0, args.channels)[:, None]
+    mean = (baseline * 2)[:, None] * spend**shape / (spend**shape + half**shape)
+    table = ResponseCurveTable(
+        channels=tuple(f"channel{i}" for i in range(args.channels)),
+        spend=spend,
+        mean=mean,
+        lower=mean,
+        upper=mean,
+        baseline_spend=baseline,
+        credible_interval=0.9,
+    )
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        allocation = optimize_budget(table, float(baseline.sum()), steps=args.steps)
+        timings.append(time.perf_counter() - started)
+    print(
+        f"{args.channels} channels, {args.steps} steps: "
+        f"median {np.median(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms; "
+        f"outcome {allocation.expected_outcome:,.0f} vs historical mix {allocation.baseline_outcome:,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
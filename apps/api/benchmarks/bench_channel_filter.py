@@ -0,0 +1,81 @@
+"""Allocation micro-benchmark for channel-filtered series requests.
+
+Compares the old per-row ``GeoRecord`` copy against the projected record
+proxies and the columnar :class:`SeriesView` on a synthetic 5-year x 200-geo
+dataset::
+
+    PYTHONPATH=. python -m benchmarks.bench_channel_filter
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.synthetic import write_synthetic_dataset
+from services.marketing_mix_service import GeoRecord, MarketingMixService
+
+CHANNELS = ["channel1", "channel3"]
+
+
+def _copy_filter(service: MarketingMixService, geo: str):
+    """The pre-projection behaviour: rebuild every record with the kept channels."""
+    allowed = set(CHANNELS)
+    result = []
+    for record in service.get_geo_series(geo):
+        result.append(
+            GeoRecord(
+                geo=record.geo,
+                time=record.time,
+                conversions=record.conversions,
+                revenue_per_conversion=record.revenue_per_conversion,
+                competitor_sales_control=record.competitor_sales_control,
+                sentiment_score_control=record.sentiment_score_control,
+                promo=record.promo,
+                population=record.population,
+                channels=[c for c in record.channels if c.id in allowed],
+            )
+        )
+    return result
+
+
+def _measure(label: str, geos, fn: Callable[[str], object]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    before = tracemalloc.take_snapshot()
+    kept = [fn(geo) for geo in geos]
+    after = tracemalloc.take_snapshot()
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    print(f"{label:>18}: {blocks:>9,d} blocks {size / 1024**2:8.2f} MiB {elapsed * 1000:8.1f} ms")
+    del kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--geos", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=260)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_synthetic_dataset(Path(tmp), geos=args.geos, weeks=args.weeks)
+        records = MarketingMixService(data_dir=data_dir, backend="records", use_snapshot=False)
+        columnar = MarketingMixService(data_dir=data_dir, backend="columnar", use_snapshot=False)
+        geos = records.list_geos()
+
+        print(f"{len(geos)} geos x {args.weeks} weeks, channels={CHANNELS}")
+        _measure("copy (before)", geos, lambda geo: _copy_filter(records, geo))
+        _measure("record proxies", geos, lambda geo: records.get_geo_series(geo, channels=CHANNELS))
+        _measure("columnar view", geos, lambda geo: columnar.get_geo_view(geo, channels=CHANNELS))
+
+
+if __name__ == "__main__":
+    main()
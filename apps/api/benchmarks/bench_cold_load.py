@@ -0,0 +1,65 @@
+"""Compare cold ``MarketingMixService`` start-up from CSV against the binary snapshot.
+
+Each measurement runs in a fresh interpreter so nothing is shared between runs::
+
+    PYTHONPATH=. python -m benchmarks.bench_cold_load --geos 200 --weeks 260
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic import write_synthetic_dataset
+
+_CHILD = """
+import json, sys, time
+from pathlib import Path
+from services.marketing_mix_service import MarketingMixService
+started = time.perf_counter()
+MarketingMixService(data_dir=Path(sys.argv[1]), backend=sys.argv[2], use_snapshot=sys.argv[3] == "1")
+print(json.dumps({"seconds": time.perf_counter() - started}))
+"""
+
+
+def _cold_start(data_dir: Path, backend: str, use_snapshot: bool) -> float:
+    env_root = Path(__file__).resolve().parents[1]
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(data_dir), backend, "1" if use_snapshot else "0"],
+        cwd=env_root,
+        env={"PYTHONPATH": str(env_root), "MARKETING_MIX_SNAPSHOT": "0"},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])["seconds"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--geos", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=260)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", default="columnar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_synthetic_dataset(Path(tmp), geos=args.geos, weeks=args.weeks)
+        _cold_start(data_dir, args.backend, use_snapshot=True)  # build the snapshot once
+
+        for label, use_snapshot in (("csv", False), ("snapshot", True)):
+            runs = [_cold_start(data_dir, args.backend, use_snapshot) for _ in range(args.repeat)]
+            print(
+                f"{label:>8}: median {statistics.median(runs) * 1000:8.1f} ms "
+                f"(min {min(runs) * 1000:.1f}, max {max(runs) * 1000:.1f}) "
+                f"[{args.backend}, {args.geos} geos x {args.weeks} weeks]"
+            )
+
+
+if __name__ == "__main__":
+    main()
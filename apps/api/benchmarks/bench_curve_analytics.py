@@ -0,0 +1,54 @@
+"""Response-curve analytics latency on a synthetic response-curve cube.
+
+    PYTHONPATH=. python -m benchmarks.bench_curve_analytics --channels 10 --draws 1000 --steps 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from services.mmm_response_curves import CUBE_SPEND_MULTIPLIERS, ResponseCurveCube
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--draws", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    multipliers = CUBE_SPEND_MULTIPLIERS[None, :, None]
+    half = rng.uniform(0.3, 1.5, (args.draws, 1, args.channels))
+    shape = rng.uniform(1.0, 3.0, (1, 1, args.channels))
+    ceiling = rng.uniform(1e5, 1e6, (args.draws, 1, args.channels))
+    draws = ceiling * multipliers**shape / (multipliers**shape + half**shape)
+    cube = ResponseCurveCube.from_draws(
+        draws,
+        CUBE_SPEND_MULTIPLIERS,
+        rng.uniform(1e5, 1e6, args.channels),
+        [f"channel{i}" for i in range(args.channels)],
+    )
+    grid = np.linspace(0, 2, args.steps)
+
+    for label, run in (
+        ("curves", lambda: cube.curves(grid, 0.9)),
+        ("analytics", lambda: cube.analytics(grid, 0.9)),
+    ):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        print(
+            f"{label}: {args.channels} channels x {args.draws} draws x {args.steps} steps: "
+            f"median {np.median(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Requests per second for the time-series endpoints, Pydantic vs fast JSON path.
+
+Runs the marketing-mix router in-process against a synthetic dataset::
+
+    PYTHONPATH=. python -m benchmarks.bench_series_json --weeks 520
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.marketing_mix as marketing_mix
+from benchmarks.synthetic import write_synthetic_dataset
+from services.marketing_mix_service import MarketingMixService, get_marketing_mix_service
+
+
+def _rps(client: TestClient, url: str, seconds: float) -> tuple[float, int]:
+    client.get(url)  # warm-up
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = client.get(url)
+        count += 1
+    size = len(response.content)
+    return count / (time.perf_counter() - started), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--geos", type=int, default=4)
+    parser.add_argument("--weeks", type=int, default=520)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_synthetic_dataset(Path(tmp), geos=args.geos, weeks=args.weeks)
+        service = MarketingMixService(data_dir=data_dir, backend="columnar", use_snapshot=False)
+        app = FastAPI()
+        app.include_router(marketing_mix.router)
+        app.dependency_overrides[get_marketing_mix_service] = lambda: service
+        client = TestClient(app)
+
+        for url in ("/marketing-mix/geos/Geo0", "/marketing-mix/national"):
+            for fast in (False, True):
+                marketing_mix.FAST_JSON_ENABLED = fast
+                rps, size = _rps(client, url, args.seconds)
+                label = "fast-json" if fast else "pydantic"
+                print(f"{url:<28} {label:>9}: {rps:8.1f} req/s  ({size / 1024:.0f} KiB, {args.weeks} weeks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Report per-worker RSS/PSS for N service workers with and without mmap mode.
+
+Every worker loads the same columnar snapshot, touches all of its pages (as a
+long-running server eventually does) and then parks while the parent reads
+``/proc/<pid>/smaps_rollup``. PSS divides shared pages between the processes
+mapping them, so it shows what each extra worker really costs (Linux only)::
+
+    PYTHONPATH=. python -m benchmarks.bench_worker_memory --workers 4 --geos 200 --weeks 260
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.synthetic import write_synthetic_dataset
+
+
+def _worker(data_dir: str, snapshot_dir: str, mmap: bool, ready, release) -> None:
+    from services.marketing_mix_service import MarketingMixService
+
+    service = MarketingMixService(
+        data_dir=Path(data_dir),
+        backend="columnar",
+        use_snapshot=True,
+        snapshot_dir=Path(snapshot_dir),
+        mmap=mmap,
+    )
+    touched = 0.0
+    for geo in service.list_geos():
+        frame = service.get_geo_frame(geo)
+        touched += float(frame.spend.sum() + frame.impressions.sum() + frame.conversions.sum())
+    ready.release()
+    release.wait()
+
+
+def _memory_kib(pid: int) -> Dict[str, int]:
+    values: Dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if parts and parts[0] in ("Rss:", "Pss:", "Shared_Clean:"):
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return values
+
+
+def _measure(data_dir: Path, snapshot_dir: Path, workers: int, mmap: bool) -> List[Dict[str, int]]:
+    ctx = mp.get_context("spawn")
+    ready = ctx.Semaphore(0)
+    release = ctx.Event()
+    procs = [
+        ctx.Process(target=_worker, args=(str(data_dir), str(snapshot_dir), mmap, ready, release))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        for _ in procs:
+            ready.acquire()
+        return [_memory_kib(proc.pid) for proc in procs]
+    finally:
+        release.set()
+        for proc in procs:
+            proc.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--geos", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=260)
+    args = parser.parse_args()
+
+    from services.marketing_mix_service import MarketingMixService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_synthetic_dataset(Path(tmp) / "data", geos=args.geos, weeks=args.weeks)
+        snapshot_dir = Path(tmp) / "snapshot"
+        # Build the snapshot up front so the workers only ever read it.
+        MarketingMixService(data_dir=data_dir, backend="columnar", snapshot_dir=snapshot_dir)
+        snapshot_mib = sum(p.stat().st_size for p in snapshot_dir.rglob("*.npy")) / 1024**2
+        print(f"snapshot: {snapshot_mib:.1f} MiB, {args.geos} geos x {args.weeks} weeks")
+
+        for mmap in (False, True):
+            stats = _measure(data_dir, snapshot_dir, args.workers, mmap)
+            label = "mmap" if mmap else "heap"
+            for idx, item in enumerate(stats):
+                print(
+                    f"{label} worker {idx}: RSS {item['Rss'] / 1024:7.1f} MiB  "
+                    f"PSS {item['Pss'] / 1024:7.1f} MiB  "
+                    f"shared-clean {item.get('Shared_Clean', 0) / 1024:7.1f} MiB"
+                )
+            total_pss = sum(item["Pss"] for item in stats) / 1024
+            print(f"{label} total PSS across {args.workers} workers: {total_pss:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Synthetic marketing-mix CSVs shaped like ``data/*_all_channels.csv``."""
+
+from __future__ import annotations
+
+import csv
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from services.marketing_mix_service import CHANNEL_COUNT, DATA_FILENAMES
+
+GEO_HEADER = (
+    ["", "geo", "time"]
+    + [f"Channel{idx}_impression" for idx in range(CHANNEL_COUNT)]
+    + ["competitor_sales_control", "sentiment_score_control"]
+    + [f"Channel{idx}_spend" for idx in range(CHANNEL_COUNT)]
+    + ["Organic_channel0_impression", "Promo", "conversions", "revenue_per_conversion", "population"]
+)
+NATIONAL_HEADER = [name for name in GEO_HEADER if name not in ("", "geo", "population")]
+
+
+def write_synthetic_dataset(dest: Path, geos: int = 200, weeks: int = 260, seed: int = 7) -> Path:
+    """Write geo and national CSVs with ``geos`` x ``weeks`` rows into ``dest``."""
+    rng = np.random.default_rng(seed)
+    dest.mkdir(parents=True, exist_ok=True)
+    times = [(date(2019, 1, 7) + timedelta(weeks=week)).isoformat() for week in range(weeks)]
+
+    spend = rng.gamma(2.0, 500.0, size=(geos, weeks, CHANNEL_COUNT))
+    impressions = spend * rng.uniform(80, 160, size=(geos, 1, CHANNEL_COUNT))
+    conversions = rng.gamma(5.0, 2e5, size=(geos, weeks))
+    population = rng.uniform(5e4, 5e6, size=geos)
+
+    with (dest / DATA_FILENAMES["geo"]).open("w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(GEO_HEADER)
+        row_id = 0
+        for g in range(geos):
+            for w in range(weeks):
+                writer.writerow(
+                    [row_id, f"Geo{g}", times[w]]
+                    + impressions[g, w].round().tolist()
+                    + [rng.normal(), rng.normal()]
+                    + spend[g, w].round(4).tolist()
+                    + [round(impressions[g, w, 0] * 0.3), int(w % 4 == 0),
+                       conversions[g, w].round(2), 0.02, population[g].round(2)]
+                )
+                row_id += 1
+
+    with (dest / DATA_FILENAMES["national"]).open("w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(NATIONAL_HEADER)
+        for w in range(weeks):
+            writer.writerow(
+                [times[w]]
+                + impressions[:, w].sum(axis=0).round().tolist()
+                + [0.0, 0.0]
+                + spend[:, w].sum(axis=0).round(4).tolist()
+                + [round(impressions[:, w, 0].sum() * 0.3), 0.25,
+                   conversions[:, w].sum().round(2), 0.02]
+            )
+    return dest
@@ -1,4 +1,5 @@
 from fastapi import Depends, FastAPI, HTTPException
+import asyncio
 import threading
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,7 +10,8 @@ from auth import auth_required
 from db.deps import get_db
 from routers.marketing_mix import router as marketing_mix_router
 from routers.mmm import router as mmm_router
-from routers.mmm import warm_response_curves_chart_cache  # type: ignore
+from routers.mmm import mmm_executor, precompute_charts, warm_response_curves_chart_cache  # type: ignore
+from services.marketing_mix_service import RELOAD_INTERVAL, marketing_mix_datasets
 from services.user_service import UserService
 
 # Set up logging
@@ -47,21 +49,42 @@ async def root():
     return {"status": "ok"}
 
 
-def _background_warmup() -> None:
+def _background_warmup(loop: asyncio.AbstractEventLoop) -> None:
     try:
-        warm_response_curves_chart_cache()
+        # Starts the compute workers (each loads the model) and warms their caches.
+        mmm_executor.warm_up(warm_response_curves_chart_cache)
+        # The chart cache lives on the event loop; fill it once the workers are warm.
+        asyncio.run_coroutine_threadsafe(precompute_charts(), loop).result()
     except Exception:
         # Warmup failures should not block the app
         pass
 
 
 @app.on_event("startup")
-def schedule_warmup() -> None:
+async def schedule_warmup() -> None:
     # Run warmup in a background thread so startup is not blocked
-    thread = threading.Thread(target=_background_warmup, daemon=True)
+    thread = threading.Thread(
+        target=_background_warmup, args=(asyncio.get_running_loop(),), daemon=True
+    )
     thread.start()
 
 
+@app.on_event("startup")
+def start_marketing_mix_watcher() -> None:
+    if RELOAD_INTERVAL > 0:
+        marketing_mix_datasets.start_watcher(RELOAD_INTERVAL)
+
+
+@app.on_event("shutdown")
+def stop_marketing_mix_watcher() -> None:
+    marketing_mix_datasets.stop_watcher()
+
+
+@app.on_event("shutdown")
+def stop_mmm_executor() -> None:
+    mmm_executor.shutdown()
+
+
 @app.get("/me")
 async def me(
     claims: dict = Depends(auth_required),
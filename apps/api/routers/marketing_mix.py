@@ -1,28 +1,70 @@
 from __future__ import annotations
 
+import os
+import secrets
+from collections import Counter
 from datetime import date
-from typing import List, Optional
+from typing import Any, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, Query
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
 from schemas.marketing_mix import (
     ChannelAggregate,
-    ChannelPoint,
+    GeoBatchRequest,
+    GeoBatchResponse,
     GeoListItem,
     GeoMetricPoint,
+    GeoSeriesColumnsResponse,
     GeoSeriesResponse,
     NationalMetricPoint,
+    NationalSeriesColumnsResponse,
     NationalSeriesResponse,
+    ReloadResponse,
+    ScenarioBatchRequest,
+    ScenarioBatchResponse,
     ScenarioChannelProjection,
     ScenarioRequest,
     ScenarioResponse,
     SummaryMetric,
     SummaryResponse,
 )
-from services.marketing_mix_service import MarketingMixService, get_marketing_mix_service
+from services.json_utils import encode_json
+from services.marketing_mix_columnar import SeriesView, optional_floats
+from services.marketing_mix_export import (
+    ARROW_STREAM_MEDIA_TYPE,
+    geo_arrow_stream,
+)
+from services.marketing_mix_scenarios import ScenarioError, check_scenario_count
+from services.marketing_mix_service import (
+    CHANNEL_NAMES,
+    MarketingMixService,
+    get_marketing_mix_service,
+    marketing_mix_datasets,
+)
 
 router = APIRouter(prefix="/marketing-mix", tags=["marketing-mix"])
 
+# Opt-in: serialise time-series responses straight from the service arrays,
+# skipping Pydantic model construction and response-model revalidation.
+FAST_JSON_ENABLED = os.getenv("MARKETING_MIX_FAST_JSON", "0") == "1"
+
+# Shared secret for the admin endpoints (``X-Admin-Token``); unset disables them.
+ADMIN_TOKEN = os.getenv("MARKETING_MIX_ADMIN_TOKEN", "")
+
+SeriesFormat = Literal["rows", "columnar"]
+_FORMAT_DESCRIPTION = "'rows' (one object per week) or 'columnar' (parallel arrays per field)"
+
+
+class FastJSONResponse(Response):
+    """Compact JSON response rendered with :func:`services.json_utils.encode_json`."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
 
 @router.get("/geos", response_model=List[GeoListItem])
 def list_geos(service: MarketingMixService = Depends(get_marketing_mix_service)) -> List[GeoListItem]:
@@ -39,53 +81,35 @@ def list_geos(service: MarketingMixService = Depends(get_marketing_mix_service))
     return items
 
 
-@router.get("/geos/{geo}", response_model=GeoSeriesResponse)
+@router.get(
+    "/export/geos.arrow",
+    response_class=StreamingResponse,
+    responses={200: {"content": {ARROW_STREAM_MEDIA_TYPE: {}}}},
+)
+def export_geos_arrow(
+    start: Optional[date] = Query(None, description="Inclusive start date"),
+    end: Optional[date] = Query(None, description="Inclusive end date"),
+    channels: Optional[List[str]] = Query(None, description="Filter to specific channel IDs"),
+    service: MarketingMixService = Depends(get_marketing_mix_service),
+) -> StreamingResponse:
+    """Stream every geo as an Arrow IPC stream (one record batch per geo)."""
+    return StreamingResponse(
+        geo_arrow_stream(service, start=start, end=end, channels=channels),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="marketing-mix-geos.arrow"'},
+    )
+
+
+@router.get("/geos/{geo}", response_model=Union[GeoSeriesResponse, GeoSeriesColumnsResponse])
 def get_geo_timeseries(
     geo: str,
     start: Optional[date] = Query(None, description="Inclusive start date"),
     end: Optional[date] = Query(None, description="Inclusive end date"),
     channels: Optional[List[str]] = Query(None, description="Filter to specific channel IDs"),
+    response_format: SeriesFormat = Query("rows", alias="format", description=_FORMAT_DESCRIPTION),
     service: MarketingMixService = Depends(get_marketing_mix_service),
-) -> GeoSeriesResponse:
-    series = service.get_geo_series(geo, start=start, end=end, channels=channels)
-    channel_totals = service.get_channel_totals()
-
-    points: List[GeoMetricPoint] = []
-    prev_conversions: Optional[float] = None
-    for record in series:
-        total_spend = sum(channel.spend for channel in record.channels)
-        conversions = record.conversions or 0.0
-        efficiency = (conversions / total_spend) if total_spend and conversions else None
-        lift = None
-        if prev_conversions not in (None, 0):
-            lift = (conversions - prev_conversions) / prev_conversions
-        if conversions:
-            prev_conversions = conversions
-
-        points.append(
-            GeoMetricPoint(
-                time=record.time,
-                conversions=record.conversions,
-                revenue_per_conversion=record.revenue_per_conversion,
-                competitor_sales_control=record.competitor_sales_control,
-                sentiment_score_control=record.sentiment_score_control,
-                promo=record.promo,
-                population=record.population,
-                channels=[
-                    ChannelPoint(
-                        id=channel.id,
-                        name=channel_totals.get(channel.id, {}).get("name", channel.id.title()),
-                        spend=channel.spend,
-                        impressions=channel.impressions,
-                        organic_impressions=channel.organic_impressions,
-                    )
-                    for channel in record.channels
-                ],
-                total_spend=total_spend,
-                spend_efficiency=efficiency,
-                lift_vs_prev=lift,
-            )
-        )
+) -> Union[GeoSeriesResponse, FastJSONResponse]:
+    view = service.get_geo_view(geo, start=start, end=end, channels=channels)
 
     start_date, end_date = service.get_geo_bounds(geo)
     if start:
@@ -93,54 +117,96 @@ def get_geo_timeseries(
     if end:
         end_date = min(end_date, end)
 
-    return GeoSeriesResponse(geo=geo, start=start_date, end=end_date, points=points)
+    if response_format == "columnar":
+        return FastJSONResponse(
+            {
+                "geo": geo,
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat(),
+                **_series_columns(view, service.get_channel_totals(), include_population=True),
+            }
+        )
+
+    points = _point_fields(view, service.get_channel_totals(), include_population=True)
+    if FAST_JSON_ENABLED:
+        return FastJSONResponse(
+            {
+                "geo": geo,
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat(),
+                "points": points,
+            }
+        )
+    return GeoSeriesResponse(
+        geo=geo,
+        start=start_date,
+        end=end_date,
+        points=[GeoMetricPoint(**fields) for fields in points],
+    )
+
 
+@router.post("/geos/batch", response_model=GeoBatchResponse)
+def get_geo_batch(
+    payload: GeoBatchRequest,
+    service: MarketingMixService = Depends(get_marketing_mix_service),
+) -> Union[GeoBatchResponse, FastJSONResponse]:
+    """Several geos in one call: aggregated per week, or each geo's own series."""
+    geos = service.resolve_geos(None if payload.geos == "all" else payload.geos)
+    start_date, end_date = service.get_geos_bounds(geos)
+    if payload.start:
+        start_date = max(start_date, payload.start)
+    if payload.end:
+        end_date = min(end_date, payload.end)
 
-@router.get("/national", response_model=NationalSeriesResponse)
+    channel_totals = service.get_channel_totals()
+    content: dict = {
+        "geos": geos,
+        "aggregation": payload.aggregation,
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "points": [],
+        "series": [],
+    }
+    if payload.aggregation == "none":
+        for geo in geos:
+            view = service.get_geo_view(
+                geo, start=payload.start, end=payload.end, channels=payload.channels
+            )
+            geo_start, geo_end = service.get_geo_bounds(geo)
+            content["series"].append(
+                {
+                    "geo": geo,
+                    "start": max(geo_start, payload.start or geo_start).isoformat(),
+                    "end": min(geo_end, payload.end or geo_end).isoformat(),
+                    "points": _point_fields(view, channel_totals, include_population=True),
+                }
+            )
+    else:
+        view = service.get_geo_aggregate_view(
+            geos,
+            start=payload.start,
+            end=payload.end,
+            channels=payload.channels,
+            aggregation=payload.aggregation,
+        )
+        content["points"] = _point_fields(view, channel_totals, include_population=True)
+
+    if FAST_JSON_ENABLED:
+        return FastJSONResponse(content)
+    return GeoBatchResponse(**content)
+
+
+@router.get(
+    "/national", response_model=Union[NationalSeriesResponse, NationalSeriesColumnsResponse]
+)
 def get_national_timeseries(
     start: Optional[date] = Query(None, description="Inclusive start date"),
     end: Optional[date] = Query(None, description="Inclusive end date"),
     channels: Optional[List[str]] = Query(None, description="Filter to specific channel IDs"),
+    response_format: SeriesFormat = Query("rows", alias="format", description=_FORMAT_DESCRIPTION),
     service: MarketingMixService = Depends(get_marketing_mix_service),
-) -> NationalSeriesResponse:
-    series = service.get_national_series(start=start, end=end, channels=channels)
-    channel_totals = service.get_channel_totals()
-
-    points: List[NationalMetricPoint] = []
-    prev_conversions: Optional[float] = None
-    for record in series:
-        total_spend = sum(channel.spend for channel in record.channels)
-        conversions = record.conversions or 0.0
-        efficiency = (conversions / total_spend) if total_spend and conversions else None
-        lift = None
-        if prev_conversions not in (None, 0):
-            lift = (conversions - prev_conversions) / prev_conversions
-        if conversions:
-            prev_conversions = conversions
-
-        points.append(
-            NationalMetricPoint(
-                time=record.time,
-                conversions=record.conversions,
-                revenue_per_conversion=record.revenue_per_conversion,
-                competitor_sales_control=record.competitor_sales_control,
-                sentiment_score_control=record.sentiment_score_control,
-                promo=record.promo,
-                channels=[
-                    ChannelPoint(
-                        id=channel.id,
-                        name=channel_totals.get(channel.id, {}).get("name", channel.id.title()),
-                        spend=channel.spend,
-                        impressions=channel.impressions,
-                        organic_impressions=channel.organic_impressions,
-                    )
-                    for channel in record.channels
-                ],
-                total_spend=total_spend,
-                spend_efficiency=efficiency,
-                lift_vs_prev=lift,
-            )
-        )
+) -> Union[NationalSeriesResponse, FastJSONResponse]:
+    view = service.get_national_view(start=start, end=end, channels=channels)
 
     start_date, end_date = service.get_national_bounds()
     if start:
@@ -148,14 +214,152 @@ def get_national_timeseries(
     if end:
         end_date = min(end_date, end)
 
-    return NationalSeriesResponse(start=start_date, end=end_date, points=points)
+    if response_format == "columnar":
+        return FastJSONResponse(
+            {
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat(),
+                **_series_columns(view, service.get_channel_totals()),
+            }
+        )
+
+    points = _point_fields(view, service.get_channel_totals())
+    if FAST_JSON_ENABLED:
+        return FastJSONResponse(
+            {"start": start_date.isoformat(), "end": end_date.isoformat(), "points": points}
+        )
+    return NationalSeriesResponse(
+        start=start_date,
+        end=end_date,
+        points=[NationalMetricPoint(**fields) for fields in points],
+    )
+
+
+def _point_fields(
+    view: SeriesView, channel_totals: dict, include_population: bool = False
+) -> List[dict]:
+    """JSON-ready point dicts (in schema field order) sliced from the view's columns.
+
+    Both the Pydantic path and the fast JSON path are built from these, so the
+    two stay byte-for-byte identical.
+    """
+    names = [
+        "conversions",
+        "revenue_per_conversion",
+        "competitor_sales_control",
+        "sentiment_score_control",
+        "promo",
+    ]
+    if include_population:
+        names.append("population")
+    scalars = [view.optional_values(name) for name in names]
+    efficiency = view.optional_values("spend_efficiency")
+    lift = view.optional_values("lift_vs_prev")
+    times = np.datetime_as_string(view.frame.times, unit="D").tolist()
+
+    points: List[dict] = []
+    for idx, (total_spend, channels) in enumerate(
+        zip(view.total_spend.tolist(), _channel_points(view, channel_totals))
+    ):
+        point = {"time": times[idx]}
+        for name, column in zip(names, scalars):
+            point[name] = column[idx]
+        point["channels"] = channels
+        point["total_spend"] = total_spend
+        point["spend_efficiency"] = efficiency[idx]
+        point["lift_vs_prev"] = lift[idx]
+        points.append(point)
+    return points
+
+
+def _series_columns(
+    view: SeriesView, channel_totals: dict, include_population: bool = False
+) -> dict:
+    """Parallel arrays per field and per channel, converted from the view in bulk."""
+    names = [
+        "conversions",
+        "revenue_per_conversion",
+        "competitor_sales_control",
+        "sentiment_score_control",
+        "promo",
+    ]
+    if include_population:
+        names.append("population")
+
+    columns: dict = {"time": np.datetime_as_string(view.frame.times, unit="D").tolist()}
+    for name in names:
+        columns[name] = view.optional_values(name)
+    columns["total_spend"] = view.total_spend.tolist()
+    columns["spend_efficiency"] = view.optional_values("spend_efficiency")
+    columns["lift_vs_prev"] = view.optional_values("lift_vs_prev")
+
+    organic = view.organic_impressions
+    columns["channels"] = [
+        {
+            "id": channel_id,
+            "name": channel_totals.get(channel_id, {}).get("name", channel_id.title()),
+            "spend": view.spend[:, pos].tolist(),
+            "impressions": view.impressions[:, pos].tolist(),
+            "organic_impressions": optional_floats(organic[:, pos]),
+        }
+        for pos, channel_id in enumerate(view.channel_ids)
+    ]
+    return columns
+
+
+def _channel_points(view: SeriesView, channel_totals: dict) -> List[List[dict]]:
+    """Build the per-week channel dicts straight from the projected channel columns."""
+    ids = view.channel_ids
+    names = [channel_totals.get(cid, {}).get("name", cid.title()) for cid in ids]
+    return [
+        [
+            {
+                "id": ids[pos],
+                "name": names[pos],
+                "spend": spend_row[pos],
+                "impressions": impression_row[pos],
+                "organic_impressions": organic_row[pos],
+            }
+            for pos in range(len(ids))
+        ]
+        for spend_row, impression_row, organic_row in zip(
+            view.spend.tolist(),
+            view.impressions.tolist(),
+            view.optional_channel_rows("organic_impressions"),
+        )
+    ]
+
+
+def admin_token_required(token: Optional[str] = Header(None, alias="X-Admin-Token")) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if token is None or not secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post(
+    "/reload", response_model=ReloadResponse, dependencies=[Depends(admin_token_required)]
+)
+def reload_data(
+    force: bool = Query(False, description="Rebuild from scratch even if the files are unchanged"),
+) -> ReloadResponse:
+    """Pick up new data files without a restart; in-flight requests keep their generation.
+
+    Only the worker process that handles the request reloads; with several
+    workers, set ``MARKETING_MIX_RELOAD_INTERVAL`` so each one watches the
+    files. Forced rebuilds are rate-limited by ``MARKETING_MIX_FORCE_RELOAD_INTERVAL``.
+    """
+    return ReloadResponse(**marketing_mix_datasets.reload(force=force))
 
 
 @router.get("/channels", response_model=List[ChannelAggregate])
 def get_channel_totals(
+    start: Optional[date] = Query(None, description="Inclusive start date"),
+    end: Optional[date] = Query(None, description="Inclusive end date"),
+    weeks: Optional[int] = Query(None, ge=1, description="Only the trailing weeks of the window"),
     service: MarketingMixService = Depends(get_marketing_mix_service),
 ) -> List[ChannelAggregate]:
-    totals = service.get_channel_totals()
+    totals = service.get_channel_totals(start=start, end=end, weeks=weeks)
     aggregated = [
         ChannelAggregate(
             id=channel_id,
@@ -176,8 +380,13 @@ def get_channel_totals(
 
 
 @router.get("/summary", response_model=SummaryResponse)
-def get_summary(service: MarketingMixService = Depends(get_marketing_mix_service)) -> SummaryResponse:
-    metrics = service.get_summary_metrics()
+def get_summary(
+    start: Optional[date] = Query(None, description="Inclusive start date"),
+    end: Optional[date] = Query(None, description="Inclusive end date"),
+    weeks: Optional[int] = Query(None, ge=1, description="Only the trailing weeks of the window"),
+    service: MarketingMixService = Depends(get_marketing_mix_service),
+) -> SummaryResponse:
+    metrics = service.get_summary_metrics(start=start, end=end, weeks=weeks)
     mapped = [
         SummaryMetric(label="Total Spend", value=metrics["total_spend"], unit="USD"),
         SummaryMetric(
@@ -237,3 +446,68 @@ def simulate_shift(
         delta_revenue=delta_revenue,
         channels=channels,
     )
+
+
+@router.post("/scenarios/batch", response_model=ScenarioBatchResponse)
+def simulate_batch(
+    payload: ScenarioBatchRequest,
+    service: MarketingMixService = Depends(get_marketing_mix_service),
+) -> FastJSONResponse:
+    """Evaluate a list of shifts, a source x target x ratio grid, or reallocation matrices."""
+    window = {"start": payload.start, "end": payload.end, "weeks": payload.weeks}
+    shifts: Optional[List[tuple]] = None
+    if payload.shifts is not None:
+        shifts = [
+            (shift.source_channel, shift.target_channel, shift.shift_ratio)
+            for shift in payload.shifts
+        ]
+    elif payload.grid is not None:
+        sources = payload.grid.sources or list(CHANNEL_NAMES)
+        targets = payload.grid.targets or list(CHANNEL_NAMES)
+        # Size the grid before expanding it, so an oversized one costs nothing.
+        source_counts, target_counts = Counter(sources), Counter(targets)
+        pairs = len(sources) * len(targets) - sum(
+            count * target_counts[channel] for channel, count in source_counts.items()
+        )
+        try:
+            check_scenario_count(pairs * len(payload.grid.ratios))
+        except ScenarioError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        shifts = [
+            (source, target, ratio)
+            for source in sources
+            for target in targets
+            if source != target
+            for ratio in payload.grid.ratios
+        ]
+
+    if shifts is not None:
+        batch = service.simulate_budget_shifts(shifts, **window)
+    else:
+        try:
+            matrices = np.asarray(payload.reallocations, dtype=np.float64)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400, detail="Reallocation matrices must be square"
+            ) from exc
+        batch = service.simulate_reallocations(matrices, **window)
+
+    return FastJSONResponse(
+        {
+            "channels": list(CHANNEL_NAMES),
+            "scenarios": len(batch),
+            "source_channel": [shift[0] for shift in shifts] if shifts is not None else None,
+            "target_channel": [shift[1] for shift in shifts] if shifts is not None else None,
+            "shift_ratio": [shift[2] for shift in shifts] if shifts is not None else None,
+            "spend": batch.spend.tolist(),
+            "estimated_conversions": batch.estimated_conversions.tolist(),
+            "estimated_revenue": batch.estimated_revenue.tolist(),
+            "roas": batch.roas.tolist(),
+            "cac": [optional_floats(row) for row in batch.cac],
+            "total_spend": batch.total_spend.tolist(),
+            "projected_conversions": batch.projected_conversions.tolist(),
+            "projected_revenue": batch.projected_revenue.tolist(),
+            "delta_conversions": batch.delta_conversions.tolist(),
+            "delta_revenue": batch.delta_revenue.tolist(),
+        }
+    )
@@ -1,45 +1,99 @@
 from __future__ import annotations
 
 import copy
+import logging
 import math
-from concurrent.futures import Future, TimeoutError
-from threading import Lock
-from time import monotonic
-from typing import Optional, Dict, Tuple
+import os
+from typing import Literal, Optional, Tuple, Union
 from pathlib import Path
 from functools import lru_cache
 
 import numpy as np
-import pandas as pd
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 from meridian.model.model import load_mmm
-from meridian.analysis.analyzer import Analyzer
+from meridian import constants as meridian_constants
+from meridian.analysis.analyzer import Analyzer, DataTensors
 from meridian.analysis import visualizer
 
+from schemas.mmm import (
+    BudgetOptimizationRequest,
+    BudgetOptimizationResponse,
+    ContributionSeriesColumnsResponse,
+    ContributionSeriesResponse,
+    CurveAnalyticsResponse,
+)
+from services.chart_cache import CachedChart, ChartCache
+from services.mmm_cache import AnalyzerResultCache, Arrays, model_digest
+from services.mmm_contributions import ContributionPosterior, ContributionSummary
+from services.mmm_executor import (
+    EXECUTOR_KIND,
+    EXECUTOR_QUEUE_LIMIT,
+    EXECUTOR_WORKERS,
+    REQUEST_TIMEOUT,
+    WORKER_MAX_TASKS,
+    ComputeExecutor,
+    ComputeTimeout,
+    ExecutorSaturated,
+    ExecutorUnavailable,
+)
+from services.mmm_optimizer import OptimizationError, ResponseCurveTable, optimize_budget
+from services.mmm_response_curves import (
+    CUBE_SPEND_MULTIPLIERS,
+    ResponseCurveCube,
+    ResponseCurveError,
+    curve_markers,
+)
+from services.single_flight import SingleFlightCache
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/mmm", tags=["mmm"])
 
 # Model path
 MMM_MODEL_PATH = Path(__file__).resolve().parents[1] / "saved_mmm.pkl"
 
+# Analyzer results persist here across restarts and workers (set MMM_CACHE=0 to disable).
+MMM_CACHE_ENABLED = os.getenv("MMM_CACHE", "1") != "0"
+MMM_CACHE_DIR = Path(os.getenv("MMM_CACHE_DIR") or MMM_MODEL_PATH.parent / ".mmm_cache")
+
 
 _CHART_CACHE_TTL_SECONDS = 5 * 60
+_CHART_CACHE_MAX_BYTES = int(os.getenv("MMM_CHART_CACHE_BYTES", str(64 * 1024 * 1024)))
+_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("MMM_RESPONSE_TTL", str(_CHART_CACHE_TTL_SECONDS)))
 _DEFAULT_SPEND_STEPS_FOR_CHART = 50
+# Sampled once for the budget optimizer: 0-3x historical spend in 5% steps.
+_OPTIMIZER_SPEND_MULTIPLIERS = np.linspace(0, 3, 61)
+_OPTIMIZER_CONFIDENCE_LEVEL = 0.9
+
 
+# Serialized Vega-Lite chart payloads, served as bytes with ETags
+_chart_cache = ChartCache(ttl=_CHART_CACHE_TTL_SECONDS, max_bytes=_CHART_CACHE_MAX_BYTES)
 
-ChartCacheKey = Tuple[float, bool, bool]
+# Finished responses of analyzer-backed endpoints, shared by identical concurrent requests
+_response_cache = SingleFlightCache(ttl=_RESPONSE_CACHE_TTL_SECONDS)
 
-# In-memory cache for Vega specs to prevent repeated heavy computations
-_chart_cache: Dict[ChartCacheKey, Tuple[float, dict[str, object]]] = {}
-_chart_promises: Dict[ChartCacheKey, Future] = {}
-_chart_cache_lock = Lock()
+# Model file version (size, mtime) behind this process's response caches and loaded model
+_served_model_version: Optional[Tuple[int, int]] = None
+_loaded_model_version: Optional[Tuple[int, int]] = None
+
+
+def _model_file_version() -> Tuple[int, int]:
+    try:
+        stat = MMM_MODEL_PATH.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=500, detail="MMM model file not found") from None
+    return (stat.st_size, stat.st_mtime_ns)
 
 
 @lru_cache(maxsize=1)
 def _load_mmm_model():
-    """Load the MMM model from disk. Cached after first load."""
-    if not MMM_MODEL_PATH.exists():
-        raise HTTPException(status_code=500, detail="MMM model file not found")
-    return load_mmm(str(MMM_MODEL_PATH))
+    """Load the MMM model from disk. Cached until the model file changes."""
+    global _loaded_model_version
+    version = _model_file_version()
+    mmm = load_mmm(str(MMM_MODEL_PATH))
+    _loaded_model_version = version
+    return mmm
 
 
 @lru_cache(maxsize=1)
@@ -48,59 +102,241 @@ def _get_analyzer():
     return Analyzer(_load_mmm_model())
 
 
-def _response_curve_chart_cache_key(
-    confidence_level: float,
-    plot_separately: bool,
-    include_ci: bool,
-) -> ChartCacheKey:
-    # Round confidence level to avoid floating point precision noise in cache keys
-    return (round(confidence_level, 4), bool(plot_separately), bool(include_ci))
+def _init_compute_worker() -> None:
+    """Load the model and analyzer once when a compute worker process starts."""
+    _get_analyzer()
 
 
-def _get_response_curves_chart_spec(
-    confidence_level: float,
-    plot_separately: bool,
-    include_ci: bool,
-) -> dict[str, object]:
-    key = _response_curve_chart_cache_key(confidence_level, plot_separately, include_ci)
-
-    with _chart_cache_lock:
-        cached = _chart_cache.get(key)
-        if cached:
-            cached_at, spec = cached
-            if monotonic() - cached_at < _CHART_CACHE_TTL_SECONDS:
-                return copy.deepcopy(spec)
-            _chart_cache.pop(key, None)
-
-        promise = _chart_promises.get(key)
-        if promise is None:
-            promise = Future()
-            _chart_promises[key] = promise
-            should_compute = True
-        else:
-            should_compute = False
+def _worker_status() -> dict[str, object]:
+    mmm = _load_mmm_model()
+    _get_analyzer()
+    return {"pid": os.getpid(), "channels": list(mmm.input_data.media_channel.values)}
+
+
+# Dedicated pool for analyzer work (MMM_EXECUTOR_KIND=process for per-core worker processes).
+mmm_executor = ComputeExecutor(
+    EXECUTOR_WORKERS,
+    EXECUTOR_QUEUE_LIMIT,
+    name="mmm",
+    processes=EXECUTOR_KIND == "process",
+    initializer=_init_compute_worker,
+    max_tasks_per_worker=WORKER_MAX_TASKS,
+)
+
+
+class _AnalysisHTTPError(Exception):
+    """Picklable stand-in for an HTTPException raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: object) -> None:
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _refresh_model_caches() -> None:
+    """Drop this process's model and everything derived from it once the model file changes."""
+    if _loaded_model_version is None or _model_file_version() == _loaded_model_version:
+        return
+    for cached in (
+        _load_mmm_model,
+        _get_analyzer,
+        _get_result_cache,
+        _get_contribution_posterior,
+        _get_response_curve_cube,
+        _get_response_curve_table,
+    ):
+        cached.cache_clear()
+
+
+def _call_analysis(fn, *args):
+    try:
+        _refresh_model_caches()
+        return fn(*args)
+    except HTTPException as exc:
+        raise _AnalysisHTTPError(exc.status_code, exc.detail) from None
 
-    if should_compute:
-        try:
-            spec = _build_response_curves_chart_spec(confidence_level, plot_separately, include_ci)
-        except Exception as exc:  # pragma: no cover - propagate downstream
-            promise.set_exception(exc)
-            with _chart_cache_lock:
-                _chart_promises.pop(key, None)
-            raise
-        else:
-            promise.set_result(spec)
-            with _chart_cache_lock:
-                _chart_cache[key] = (monotonic(), spec)
-                _chart_promises.pop(key, None)
-            return copy.deepcopy(spec)
 
-    # Wait for the in-flight computation to complete and return a copy of the spec
+async def _run_analysis(fn, *args):
+    """Run MMM work on the dedicated executor, mapping overload and timeouts to HTTP errors.
+
+    ``fn`` and its arguments must be picklable so the same call works with worker processes.
+    """
+    try:
+        return await mmm_executor.run(_call_analysis, fn, *args, timeout=REQUEST_TIMEOUT)
+    except _AnalysisHTTPError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from None
+    except (ExecutorSaturated, ExecutorUnavailable) as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="MMM analysis is at capacity; please retry",
+            headers={"Retry-After": "5"},
+        ) from exc
+    except ComputeTimeout as exc:
+        raise HTTPException(status_code=504, detail="MMM analysis timed out; please retry") from exc
+
+
+def _served_model() -> Tuple[int, int]:
+    """Current model file version; a change empties the response and chart caches."""
+    global _served_model_version
+    version = _model_file_version()
+    if version != _served_model_version:
+        _response_cache.clear()
+        _chart_cache.clear()
+        _served_model_version = version
+    return version
+
+
+async def _coalesced_analysis(key: tuple, fn, *args):
+    """:func:`_run_analysis` behind the response cache: identical requests share one job.
+
+    ``key`` starts with the endpoint name and holds the normalized parameters; the
+    model file version is appended so results never outlive the model they came from.
+    """
+    key = (*key, _served_model())
+    return await _response_cache.get(key, lambda: _run_analysis(fn, *args))
+
+
+def _render_chart(fn, *args) -> CachedChart:
+    """Build a chart payload and serialize it, on the worker rather than the event loop."""
+    return CachedChart.from_content(fn(*args))
+
+
+async def _get_chart(key: tuple, fn, *args, ttl: Optional[float] = None) -> CachedChart:
+    """A chart from the byte cache, keyed to the model file and rendered on the MMM executor."""
+    key = (*key, _served_model())
+    return await _chart_cache.get(key, lambda: _run_analysis(_render_chart, fn, *args), ttl)
+
+
+def _chart_response(request: Request, chart: CachedChart) -> Response:
+    """Serve cached chart bytes, honouring ``If-None-Match`` and gzip."""
+    headers = {"ETag": chart.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if chart.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if chart.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(chart.gzip_body, media_type="application/json", headers=headers)
+    return Response(chart.body, media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=1)
+def _get_result_cache() -> Optional[AnalyzerResultCache]:
+    """On-disk analyzer result cache for the model version that is loaded."""
+    if not MMM_CACHE_ENABLED:
+        return None
+    _load_mmm_model()
     try:
-        return copy.deepcopy(promise.result(timeout=25))
-    except TimeoutError:
-        # Fail fast rather than hanging requests indefinitely
-        raise HTTPException(status_code=504, detail="Chart computation timed out; please retry")
+        cache = AnalyzerResultCache(MMM_CACHE_DIR, model_digest(MMM_MODEL_PATH, MMM_CACHE_DIR))
+    except OSError:
+        return None
+    cache.prune()
+    return cache
+
+
+def _cached_result(name: str, params: dict, compute) -> Arrays:
+    cache = _get_result_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(name, params, compute)
+
+
+def _get_incremental_outcome() -> np.ndarray:
+    """Per-time, per-channel incremental outcome draws: (n_chains, n_draws, n_times, n_channels)."""
+
+    def compute() -> Arrays:
+        incr_outcome = _get_analyzer().incremental_outcome(
+            aggregate_times=False,
+            aggregate_geos=True,
+            include_non_paid_channels=False,
+        )
+        return {"incremental_outcome": np.array(incr_outcome)}
+
+    params = {"aggregate_times": False, "aggregate_geos": True, "include_non_paid_channels": False}
+    return _cached_result("incremental_outcome", params, compute)["incremental_outcome"]
+
+
+@lru_cache(maxsize=1)
+def _get_contribution_posterior() -> ContributionPosterior:
+    """Contribution draws for the loaded model, held in memory for per-request slicing."""
+    mmm = _load_mmm_model()
+    return ContributionPosterior.from_draws(
+        _get_incremental_outcome(), mmm.input_data.time.values, mmm.input_data.media_channel.values
+    )
+
+
+def _get_response_curve_draws() -> Arrays:
+    """Incremental-outcome draws of every paid channel on the cube's spend-multiplier grid.
+
+    Mirrors ``Analyzer.response_curves`` (media and reach scaled by each
+    multiplier, outcome aggregated over geos and times) but keeps the draws
+    instead of reducing them to one credible interval.
+    """
+
+    def compute() -> Arrays:
+        mmm = _load_mmm_model()
+        analyzer = _get_analyzer()
+        channels = mmm.input_data.get_all_paid_channels()
+        data = DataTensors().validate_and_fill_missing_data(
+            required_tensors_names=meridian_constants.PERFORMANCE_DATA + (meridian_constants.TIME,),
+            meridian=mmm,
+            allow_modified_times=True,
+        )
+        draws = []
+        for multiplier in CUBE_SPEND_MULTIPLIERS:
+            if multiplier == 0:
+                draws.append(None)
+                continue
+            scaled = DataTensors(
+                media=None if data.media is None else data.media * multiplier,
+                reach=None if data.reach is None else data.reach * multiplier,
+                frequency=data.frequency,
+                revenue_per_kpi=data.revenue_per_kpi,
+            )
+            outcome = analyzer.incremental_outcome(
+                new_data=scaled.filter_fields(meridian_constants.PAID_DATA),
+                inverse_transform_outcome=True,
+                include_non_paid_channels=False,
+                aggregate_geos=True,
+                aggregate_times=True,
+            )
+            draws.append(np.asarray(outcome, dtype=np.float64).reshape(-1, len(channels)))
+        n_samples = next(d.shape[0] for d in draws if d is not None)
+        zeros = np.zeros((n_samples, len(channels)))
+        spend = np.asarray(data.total_spend(), dtype=np.float64)
+        return {
+            "channel": np.array(channels, dtype=str),
+            "spend": spend.reshape(-1, len(channels)).sum(axis=0),
+            "draws": np.stack([zeros if d is None else d for d in draws], axis=1),
+        }
+
+    params = {"spend_multipliers": np.round(CUBE_SPEND_MULTIPLIERS, 8).tolist()}
+    return _cached_result("response_curve_draws", params, compute)
+
+
+@lru_cache(maxsize=1)
+def _get_response_curve_cube() -> ResponseCurveCube:
+    """Response-curve draws for the loaded model, held in memory for per-request resampling."""
+    arrays = _get_response_curve_draws()
+    return ResponseCurveCube.from_draws(
+        arrays["draws"], CUBE_SPEND_MULTIPLIERS, arrays["spend"], arrays["channel"].tolist()
+    )
+
+
+def _get_response_curves(
+    spend_multipliers: np.ndarray,
+    confidence_level: float,
+    channels: Optional[list[str]] = None,
+) -> Arrays:
+    """Response curves as arrays: ``channel`` plus ``(channels, points)`` spend/mean/ci_lo/ci_hi."""
+    return _get_response_curve_cube().curves(spend_multipliers, confidence_level, channels)
+
+
+@lru_cache(maxsize=1)
+def _get_response_curve_table() -> ResponseCurveTable:
+    """Response curves sampled once for the optimizer, which only interpolates them."""
+    curves = _get_response_curves(_OPTIMIZER_SPEND_MULTIPLIERS, _OPTIMIZER_CONFIDENCE_LEVEL)
+    return ResponseCurveTable.from_arrays(
+        curves, _OPTIMIZER_SPEND_MULTIPLIERS, _OPTIMIZER_CONFIDENCE_LEVEL
+    )
 
 
 def _build_response_curves_chart_spec(
@@ -108,31 +344,19 @@ def _build_response_curves_chart_spec(
     plot_separately: bool,
     include_ci: bool,
 ) -> dict[str, object]:
-    analyzer = _get_analyzer()
-    # Use a fixed, modest grid to keep compute bounded in production
+    # A fixed grid keeps the spec (and its payload) small; points are interpolated from the cube
     spend_multipliers_array = np.linspace(0, 2, _DEFAULT_SPEND_STEPS_FOR_CHART)
-    response_curves_ds = analyzer.response_curves(
-        spend_multipliers=spend_multipliers_array.tolist(),
-        confidence_level=confidence_level,
-    )
-
-    raw_channels = response_curves_ds.coords["channel"].values
-    if raw_channels.size == 0:
-        raise HTTPException(status_code=500, detail="No MMM channels available for response curves")
+    curves = _get_response_curves(spend_multipliers_array, confidence_level)
 
     values: list[dict[str, float | str]] = []
     channels: list[str] = []
-    for raw_channel in raw_channels:
-        channel_key = raw_channel.item() if hasattr(raw_channel, "item") else raw_channel
-        channel_label = str(channel_key)
+    for row, channel_label in enumerate(curves["channel"].tolist()):
         channels.append(channel_label)
 
-        channel_data = response_curves_ds.sel(channel=channel_key)
-        spend_array = channel_data["spend"].values
-        incremental_outcome = channel_data["incremental_outcome"]
-        mean_response = incremental_outcome.sel(metric="mean").values
-        lower_response = incremental_outcome.sel(metric="ci_lo").values
-        upper_response = incremental_outcome.sel(metric="ci_hi").values
+        spend_array = curves["spend"][row]
+        mean_response = curves["mean"][row]
+        lower_response = curves["ci_lo"][row]
+        upper_response = curves["ci_hi"][row]
 
         for idx in range(len(spend_array)):
             values.append(
@@ -277,34 +501,59 @@ def _build_response_curves_chart_spec(
 
 
 @router.get("/healthz")
-def healthz() -> dict[str, object]:
-    """Health check endpoint."""
-    mmm = _load_mmm_model()
-    channels = list(mmm.input_data.media_channel.values)
+async def healthz() -> dict[str, object]:
+    """Liveness check: answered in-process, so a busy compute pool never fails it."""
     return {
         "status": "ok",
         "model_version": 1,
-        "channels": channels,
+        "executor": mmm_executor.stats(),
+        "response_cache": _response_cache.stats(),
+        "chart_cache": _chart_cache.stats(),
+    }
+
+
+@router.get("/readyz")
+async def readyz() -> dict[str, object]:
+    """Readiness check: a compute worker must answer with the model loaded.
+
+    Goes through the executor like any analysis, so a saturated pool answers 503
+    and the instance is taken out of rotation rather than restarted.
+    """
+    worker = await _run_analysis(_worker_status)
+    return {
+        "status": "ready",
+        "channels": worker["channels"],
+        "worker_pid": worker["pid"],
+        "executor": mmm_executor.stats(),
     }
 
 
 def warm_response_curves_chart_cache() -> None:
-    """Compute and cache common response-curve chart specs to avoid first-request stalls."""
+    """Load the analyzer results behind the curve and chart endpoints to avoid first-request stalls.
+
+    Runs on the compute workers; :func:`precompute_charts` then renders the chart payloads
+    into the web process's byte cache.
+    """
     # Ensure analyzer is initialized
     _ = _get_analyzer()
-    # Warm a couple of typical combinations; ignore errors during warmup
+    # Ignore errors during warmup
     try:
-        _get_response_curves_chart_spec(0.9, False, True)
+        _get_response_curve_cube()
+        _get_response_curve_table()
     except Exception:
         pass
     try:
-        _get_response_curves_chart_spec(0.9, True, True)
+        _get_contribution_posterior()
     except Exception:
         pass
 
 @router.post("/preload")
-def preload_model() -> dict[str, object]:
+async def preload_model() -> dict[str, object]:
     """Preload the MMM model and analyzer to warm up the cache."""
+    return await _run_analysis(_preload_model)
+
+
+def _preload_model() -> dict[str, object]:
     try:
         mmm = _load_mmm_model()
         analyzer = _get_analyzer()
@@ -326,54 +575,58 @@ def preload_model() -> dict[str, object]:
         raise HTTPException(status_code=500, detail=f"Failed to preload: {exc}") from exc
 
 
-@router.get("/contributions")
-def get_contributions(
+@router.get(
+    "/contributions",
+    response_model=Union[ContributionSeriesResponse, ContributionSeriesColumnsResponse],
+)
+async def get_contributions(
     start: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     credible_interval: float = Query(0.9, ge=0.5, le=0.99, description="Credible interval"),
+    response_format: Literal["rows", "columnar"] = Query(
+        "rows",
+        alias="format",
+        description="'rows' (one object per week) or 'columnar' (parallel arrays per field)",
+    ),
 ) -> dict[str, object]:
     """Get time-series contribution data for all channels."""
-    try:
-        mmm = _load_mmm_model()
-        analyzer = _get_analyzer()
+    credible_interval = round(credible_interval, 4)
+    return await _coalesced_analysis(
+        ("contributions", start or None, end or None, credible_interval, response_format),
+        _build_contributions,
+        start,
+        end,
+        credible_interval,
+        response_format,
+    )
 
-        # Get incremental outcome (contributions) without time aggregation
-        incr_outcome = analyzer.incremental_outcome(
-            aggregate_times=False,
-            aggregate_geos=True,
-            include_non_paid_channels=False
-        )
 
-        # Convert to numpy
-        incr_np = np.array(incr_outcome)  # Shape: (n_chains, n_draws, n_times, n_channels)
+def _build_contributions(
+    start: Optional[str],
+    end: Optional[str],
+    credible_interval: float,
+    response_format: str,
+) -> dict[str, object]:
+    try:
+        posterior = _get_contribution_posterior()
+        channels = list(posterior.channels)
 
-        # Get time and channel info
-        times = pd.to_datetime(mmm.input_data.time.values)
-        channels = list(mmm.input_data.media_channel.values)
+        # Only the date window and the quantiles depend on the request
+        summary = posterior.summarize(start, end, credible_interval)
+        times = summary.times
+        mean_contrib = summary.mean  # (n_times, n_channels)
+        lower_contrib = summary.lower
+        upper_contrib = summary.upper
 
-        # Filter by date range if provided
-        if start or end:
-            mask = np.ones(len(times), dtype=bool)
-            if start:
-                mask &= times >= pd.to_datetime(start)
-            if end:
-                mask &= times <= pd.to_datetime(end)
-            times = times[mask]
-            incr_np = incr_np[:, :, mask, :]
-
-        # Compute statistics across chains and draws
-        mean_contrib = incr_np.mean(axis=(0, 1))  # (n_times, n_channels)
-        lower_q = (1 - credible_interval) / 2
-        upper_q = 1 - lower_q
-        lower_contrib = np.quantile(incr_np, lower_q, axis=(0, 1))
-        upper_contrib = np.quantile(incr_np, upper_q, axis=(0, 1))
-
-        # Build response
+        if response_format == "columnar":
+            return _contribution_columns(summary, channels)
+
+        # Build response; the total band comes from the summed draws, not summed quantiles
         points = []
         for t in range(len(times)):
-            total_mean = float(mean_contrib[t, :].sum())
-            total_lower = float(lower_contrib[t, :].sum())
-            total_upper = float(upper_contrib[t, :].sum())
+            total_mean = float(summary.total_mean[t])
+            total_lower = float(summary.total_lower[t])
+            total_upper = float(summary.total_upper[t])
 
             channel_data = []
             for c, channel in enumerate(channels):
@@ -407,140 +660,179 @@ def get_contributions(
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+def _contribution_columns(summary: ContributionSummary, channels: list) -> dict[str, object]:
+    """Struct-of-arrays contribution payload, built with whole-array operations."""
+    times = summary.times
+    mean_contrib, lower_contrib, upper_contrib = summary.mean, summary.lower, summary.upper
+    total_mean = summary.total_mean
+    share = np.divide(
+        mean_contrib,
+        total_mean[:, None],
+        out=np.zeros_like(mean_contrib),
+        where=total_mean[:, None] > 0,
+    )
+    return {
+        "start": times[0].date().isoformat(),
+        "end": times[-1].date().isoformat(),
+        "time": times.strftime("%Y-%m-%d").tolist(),
+        "total_mean": total_mean.tolist(),
+        "total_lower": summary.total_lower.tolist(),
+        "total_upper": summary.total_upper.tolist(),
+        "channels": [
+            {
+                "id": str(channel),
+                "name": str(channel),
+                "mean": mean_contrib[:, idx].tolist(),
+                "lower": lower_contrib[:, idx].tolist(),
+                "upper": upper_contrib[:, idx].tolist(),
+                "share": share[:, idx].tolist(),
+            }
+            for idx, channel in enumerate(channels)
+        ],
+    }
+
+
 def _build_response_curve(
     channel: Optional[str],
     points: int,
     spend_max: Optional[float],
     credible_interval: float,
+    grid: str,
 ) -> dict[str, object]:
     try:
         mmm = _load_mmm_model()
-        analyzer = _get_analyzer()
 
         # Get available channels
         channels = list(mmm.input_data.media_channel.values)
-        selected_channel = channel or (channels[0] if channels else None)
-        if not selected_channel:
-            raise HTTPException(status_code=400, detail="No channels available")
-
-        if selected_channel not in channels:
-            raise HTTPException(status_code=400, detail=f"Channel '{selected_channel}' not found")
-
-        # Get response curves from Meridian
-        spend_multipliers_array = np.linspace(0, 2, points) if points else None
-        response_curves_ds = analyzer.response_curves(
-            spend_multipliers=spend_multipliers_array.tolist() if spend_multipliers_array is not None else None,
-            confidence_level=credible_interval
-        )
-
-        # Extract data for the selected channel
-        channel_data = response_curves_ds.sel(channel=selected_channel)
-
-        # Get spend and incremental outcome
-        spend_array = channel_data["spend"].values
-        incremental_outcome = channel_data["incremental_outcome"]
-
-        # Extract mean and confidence intervals from the metric dimension
-        mean_response = incremental_outcome.sel(metric="mean").values
-        lower_response = incremental_outcome.sel(metric="ci_lo").values
-        upper_response = incremental_outcome.sel(metric="ci_hi").values
-
-        return {
-            "channel": selected_channel,
-            "spend": spend_array.tolist(),
-            "mean": mean_response.tolist(),
-            "lower": lower_response.tolist(),
-            "upper": upper_response.tolist(),
-            "credible_interval": credible_interval,
-            "model_version": 1,
-        }
+        cube = _get_response_curve_cube()
     except ImportError as exc:
         raise HTTPException(status_code=500, detail=f"Meridian not available: {exc}") from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    selected_channel = channel or (channels[0] if channels else None)
+    if not selected_channel:
+        raise HTTPException(status_code=400, detail="No channels available")
+    if selected_channel not in channels:
+        raise HTTPException(status_code=400, detail=f"Channel '{selected_channel}' not found")
+
+    try:
+        max_multiplier = 2.0 if spend_max is None else cube.max_multiplier(selected_channel, spend_max)
+    except ResponseCurveError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if grid == "adaptive":
+        multipliers = cube.adaptive_multipliers(selected_channel, points, max_multiplier)
+    else:
+        multipliers = np.linspace(0, max_multiplier, points)
+
+    # Resample the in-memory response-curve cube
+    curves = cube.curves(multipliers, credible_interval, [selected_channel])
+    spend_array = curves["spend"][0]
+    mean_response = curves["mean"][0]
+    saturation_spend, diminishing_returns_start = curve_markers(spend_array, mean_response)
+
+    return {
+        "channel": selected_channel,
+        "spend": spend_array.tolist(),
+        "mean": mean_response.tolist(),
+        "lower": curves["ci_lo"][0].tolist(),
+        "upper": curves["ci_hi"][0].tolist(),
+        "credible_interval": credible_interval,
+        "grid": grid,
+        "saturation_spend": float(saturation_spend),
+        "diminishing_returns_start": float(diminishing_returns_start),
+        "model_version": 1,
+    }
+
 
 @router.get("/response-curve")
-def get_response_curve(
+async def get_response_curve(
     channel: Optional[str] = Query(None, description="Channel name"),
     points: int = Query(50, ge=10, le=400, description="Number of points in spend grid"),
-    spend_max: Optional[float] = Query(None, ge=0, description="Max spend to evaluate"),
+    spend_max: Optional[float] = Query(None, gt=0, description="Max spend to evaluate"),
     credible_interval: float = Query(0.8, ge=0.5, le=0.99, description="Posterior credible interval"),
+    grid: Literal["uniform", "adaptive"] = Query(
+        "uniform",
+        description="'uniform' spacing or 'adaptive' (points concentrated where the curve bends)",
+    ),
 ) -> dict[str, object]:
-    return _build_response_curve(channel, points, spend_max, credible_interval)
+    credible_interval = round(credible_interval, 4)
+    return await _coalesced_analysis(
+        ("response-curve", channel or None, points, spend_max, credible_interval, grid),
+        _build_response_curve,
+        channel,
+        points,
+        spend_max,
+        credible_interval,
+        grid,
+    )
 
 
 @router.get("/response-curves")
-def get_response_curves_multiple(
+async def get_response_curves_multiple(
     channels: Optional[list[str]] = Query(None, description="Channel names (if empty, returns all)"),
     spend_steps: int = Query(50, ge=10, le=400, description="Number of points in spend grid"),
     credible_interval: float = Query(0.9, ge=0.5, le=0.99, description="Credible interval"),
 ) -> dict[str, object]:
     """Get response curves for multiple channels."""
+    channels = channels or None
+    credible_interval = round(credible_interval, 4)
+    return await _coalesced_analysis(
+        ("response-curves", tuple(channels or ()), spend_steps, credible_interval),
+        _build_response_curves,
+        channels,
+        spend_steps,
+        credible_interval,
+    )
+
+
+def _build_response_curves(
+    channels: Optional[list[str]],
+    spend_steps: int,
+    credible_interval: float,
+) -> dict[str, object]:
     try:
         mmm = _load_mmm_model()
-        analyzer = _get_analyzer()
 
         # Get available channels
         all_channels = list(mmm.input_data.media_channel.values)
-        selected_channels = channels if channels else all_channels
-
-        # Validate channels
-        for ch in selected_channels:
-            if ch not in all_channels:
-                raise HTTPException(status_code=400, detail=f"Channel '{ch}' not found")
-
-        # Get response curves from Meridian
-        spend_multipliers_array = np.linspace(0, 2, spend_steps)
-        response_curves_ds = analyzer.response_curves(
-            spend_multipliers=spend_multipliers_array.tolist(),
-            confidence_level=credible_interval
-        )
+    except ImportError as exc:
+        raise HTTPException(status_code=500, detail=f"Meridian not available: {exc}") from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-        # Build response for each channel
-        result_channels = []
-        for channel in selected_channels:
-            channel_data = response_curves_ds.sel(channel=channel)
-
-            # Get spend and incremental outcome
-            spend_array = channel_data["spend"].values
-            incremental_outcome = channel_data["incremental_outcome"]
-
-            # Extract mean and confidence intervals
-            mean_response = incremental_outcome.sel(metric="mean").values
-            lower_response = incremental_outcome.sel(metric="ci_lo").values
-            upper_response = incremental_outcome.sel(metric="ci_hi").values
-
-            # Build points array
-            points_list = []
-            for i in range(len(spend_array)):
-                points_list.append({
-                    "spend": float(spend_array[i]),
-                    "mean": float(mean_response[i]),
-                    "lower": float(lower_response[i]),
-                    "upper": float(upper_response[i])
-                })
+    # Validate channels outside the try so a bad request stays a 400
+    selected_channels = channels if channels else all_channels
+    for ch in selected_channels:
+        if ch not in all_channels:
+            raise HTTPException(status_code=400, detail=f"Channel '{ch}' not found")
 
-            # Calculate saturation point (where ROI drops to 50% of initial)
-            roi = mean_response / (spend_array + 1e-10)  # Avoid division by zero
-            initial_roi = roi[1] if len(roi) > 1 else roi[0]
-            saturation_idx = np.where(roi <= initial_roi * 0.5)[0]
-            saturation_spend = float(spend_array[saturation_idx[0]]) if len(saturation_idx) > 0 else float(spend_array[-1])
+    try:
+        # Resample the in-memory response-curve cube
+        curves = _get_response_curves(
+            np.linspace(0, 2, spend_steps), credible_interval, selected_channels
+        )
 
-            # Calculate diminishing returns start (where second derivative turns negative)
-            if len(mean_response) > 2:
-                second_deriv = np.diff(mean_response, n=2)
-                dim_returns_idx = np.where(second_deriv < 0)[0]
-                diminishing_returns_start = float(spend_array[dim_returns_idx[0]]) if len(dim_returns_idx) > 0 else float(spend_array[0])
-            else:
-                diminishing_returns_start = float(spend_array[0])
+        # Saturation point (ROI halves) and start of diminishing returns, all channels at once
+        saturation, diminishing = curve_markers(curves["spend"], curves["mean"])
 
+        # Build response for each channel; curve rows follow selected_channels
+        result_channels = []
+        for row, channel in enumerate(selected_channels):
             result_channels.append({
                 "id": channel,
                 "name": channel,
-                "points": points_list,
-                "saturation_spend": saturation_spend,
-                "diminishing_returns_start": diminishing_returns_start
+                "points": [
+                    {"spend": spend, "mean": mean, "lower": lower, "upper": upper}
+                    for spend, mean, lower, upper in zip(
+                        curves["spend"][row].tolist(),
+                        curves["mean"][row].tolist(),
+                        curves["ci_lo"][row].tolist(),
+                        curves["ci_hi"][row].tolist(),
+                    )
+                ],
+                "saturation_spend": float(saturation[row]),
+                "diminishing_returns_start": float(diminishing[row]),
             })
 
         return {"channels": result_channels}
@@ -551,15 +843,146 @@ def get_response_curves_multiple(
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+@router.get("/response-curves/analytics", response_model=CurveAnalyticsResponse)
+async def get_response_curve_analytics(
+    channels: Optional[list[str]] = Query(None, description="Channel names (if empty, returns all)"),
+    spend_steps: int = Query(200, ge=10, le=400, description="Number of points in spend grid"),
+    credible_interval: float = Query(0.9, ge=0.5, le=0.99, description="Credible interval"),
+) -> dict[str, object]:
+    """Saturation, diminishing-returns and marginal-ROI markers for each channel."""
+    channels = channels or None
+    credible_interval = round(credible_interval, 4)
+    return await _coalesced_analysis(
+        ("response-curve-analytics", tuple(channels or ()), spend_steps, credible_interval),
+        _build_response_curve_analytics,
+        channels,
+        spend_steps,
+        credible_interval,
+    )
+
+
+def _build_response_curve_analytics(
+    channels: Optional[list[str]],
+    spend_steps: int,
+    credible_interval: float,
+) -> dict[str, object]:
+    try:
+        mmm = _load_mmm_model()
+        all_channels = list(mmm.input_data.media_channel.values)
+        cube = _get_response_curve_cube()
+    except ImportError as exc:
+        raise HTTPException(status_code=500, detail=f"Meridian not available: {exc}") from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    selected_channels = channels if channels else all_channels
+    for channel in selected_channels:
+        if channel not in all_channels:
+            raise HTTPException(status_code=400, detail=f"Channel '{channel}' not found")
+
+    analytics = cube.analytics(np.linspace(0, 2, spend_steps), credible_interval, selected_channels)
+    return {
+        "spend_steps": spend_steps,
+        "credible_interval": analytics.credible_interval,
+        "channels": [
+            {
+                "id": channel,
+                "name": channel,
+                "historical_spend": float(analytics.historical_spend[idx]),
+                "saturation_spend": float(analytics.saturation_spend[idx]),
+                "saturation_spend_lower": float(analytics.saturation_lower[idx]),
+                "saturation_spend_upper": float(analytics.saturation_upper[idx]),
+                "diminishing_returns_start": float(analytics.diminishing_returns_start[idx]),
+                "marginal_roi": float(analytics.marginal_roi[idx]),
+            }
+            for idx, channel in enumerate(analytics.channels)
+        ],
+    }
+
+
+@router.post("/optimize", response_model=BudgetOptimizationResponse)
+async def optimize_budget_allocation(payload: BudgetOptimizationRequest) -> dict[str, object]:
+    """Allocate a total budget across channels to maximize expected incremental outcome."""
+    bounds = tuple(
+        sorted(
+            (channel, limits.min_spend, limits.max_spend)
+            for channel, limits in payload.bounds.items()
+        )
+    )
+    return await _coalesced_analysis(
+        ("optimize", payload.total_budget, bounds), _build_budget_allocation, payload
+    )
+
+
+def _build_budget_allocation(payload: BudgetOptimizationRequest) -> dict[str, object]:
+    try:
+        table = _get_response_curve_table()
+    except ImportError as exc:
+        raise HTTPException(status_code=500, detail=f"Meridian not available: {exc}") from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    bounds = {
+        channel: (limits.min_spend, limits.max_spend) for channel, limits in payload.bounds.items()
+    }
+    try:
+        allocation = optimize_budget(table, payload.total_budget, bounds)
+    except OptimizationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return {
+        "total_budget": payload.total_budget,
+        "expected_outcome": allocation.expected_outcome,
+        "baseline_outcome": allocation.baseline_outcome,
+        "credible_interval": table.credible_interval,
+        "channels": [
+            {
+                "id": channel,
+                "name": channel,
+                "spend": float(allocation.spend[idx]),
+                "mean": float(allocation.mean[idx]),
+                "lower": float(allocation.lower[idx]),
+                "upper": float(allocation.upper[idx]),
+                "min_spend": float(allocation.min_spend[idx]),
+                "max_spend": float(allocation.max_spend[idx]),
+                "baseline_spend": float(allocation.baseline_spend[idx]),
+                "baseline_mean": float(allocation.baseline_mean[idx]),
+            }
+            for idx, channel in enumerate(allocation.channels)
+        ],
+    }
+
+
 @router.get("/response-curves-chart")
-def get_response_curves_chart(
+async def get_response_curves_chart(
+    request: Request,
     confidence_level: float = Query(0.9, ge=0.5, le=0.99, description="Confidence level"),
     plot_separately: bool = Query(False, description="Plot each channel separately"),
     include_ci: bool = Query(True, description="Include confidence intervals"),
-) -> dict[str, object]:
+) -> Response:
     """Get response curves as Vega-Lite chart specification using Meridian's visualizer."""
+    confidence_level = round(confidence_level, 4)
+    chart = await _response_curves_chart(confidence_level, plot_separately, include_ci)
+    return _chart_response(request, chart)
+
+
+async def _response_curves_chart(
+    confidence_level: float, plot_separately: bool, include_ci: bool
+) -> CachedChart:
+    return await _get_chart(
+        ("response-curves-chart", confidence_level, plot_separately, include_ci),
+        _build_response_curves_chart,
+        confidence_level,
+        plot_separately,
+        include_ci,
+    )
+
+
+def _build_response_curves_chart(
+    confidence_level: float, plot_separately: bool, include_ci: bool
+) -> dict[str, object]:
     try:
-        vega_spec = _get_response_curves_chart_spec(confidence_level, plot_separately, include_ci)
+        vega_spec = _build_response_curves_chart_spec(confidence_level, plot_separately, include_ci)
 
         return {
             "spec": vega_spec,
@@ -573,10 +996,48 @@ def get_response_curves_chart(
 
 
 @router.get("/contribution-chart")
-def get_contribution_chart(
-    time_granularity: str = Query("quarterly", description="Time granularity: weekly, monthly, quarterly"),
-) -> dict[str, object]:
+async def get_contribution_chart(
+    request: Request,
+    time_granularity: str = Query("quarterly", description="Time granularity: weekly or quarterly"),
+) -> Response:
     """Get contribution area chart as Vega-Lite specification using Meridian's visualizer."""
+    if time_granularity not in meridian_constants.TIME_GRANULARITIES:
+        allowed = ", ".join(sorted(meridian_constants.TIME_GRANULARITIES))
+        raise HTTPException(status_code=400, detail=f"time_granularity must be one of: {allowed}")
+    return _chart_response(request, await _contribution_chart(time_granularity))
+
+
+async def _contribution_chart(time_granularity: str) -> CachedChart:
+    # Depends only on the model, so it is kept until the model file changes (or is evicted).
+    return await _get_chart(
+        ("contribution-chart", time_granularity),
+        _build_contribution_chart,
+        time_granularity,
+        ttl=math.inf,
+    )
+
+
+async def precompute_charts() -> None:
+    """Render the default response-curve charts and every contribution chart into the cache.
+
+    Run once the compute workers are warm; failures are logged and left to the first request.
+    """
+    charts = [
+        (_response_curves_chart, (0.9, False, True)),
+        (_response_curves_chart, (0.9, True, True)),
+        *(
+            (_contribution_chart, (granularity,))
+            for granularity in sorted(meridian_constants.TIME_GRANULARITIES)
+        ),
+    ]
+    for render, args in charts:
+        try:
+            await render(*args)
+        except Exception as exc:
+            logger.warning("Chart precompute failed: %s", getattr(exc, "detail", exc))
+
+
+def _build_contribution_chart(time_granularity: str) -> dict[str, object]:
     try:
         mmm = _load_mmm_model()
         media_summary = visualizer.MediaSummary(mmm)
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from services.marketing_mix_scenarios import MAX_SCENARIOS
+
+# Bound on channel lists and matrix rows in scenario requests; far above the channel count.
+MAX_SCENARIO_CHANNELS = 64
 
 
 class ChannelPoint(BaseModel):
@@ -41,6 +46,59 @@ class GeoSeriesResponse(BaseModel):
     points: List[GeoMetricPoint]
 
 
+class ChannelColumns(BaseModel):
+    id: str = Field(..., description="Stable identifier for the channel")
+    name: str = Field(..., description="Human readable channel label")
+    spend: List[float]
+    impressions: List[float]
+    organic_impressions: List[Optional[float]]
+
+
+class GeoSeriesColumnsResponse(BaseModel):
+    """Struct-of-arrays variant of :class:`GeoSeriesResponse` (``format=columnar``)."""
+
+    geo: str
+    start: date
+    end: date
+    time: List[date]
+    conversions: List[Optional[float]]
+    revenue_per_conversion: List[Optional[float]]
+    competitor_sales_control: List[Optional[float]]
+    sentiment_score_control: List[Optional[float]]
+    promo: List[Optional[float]]
+    population: List[Optional[float]]
+    total_spend: List[float]
+    spend_efficiency: List[Optional[float]]
+    lift_vs_prev: List[Optional[float]]
+    channels: List[ChannelColumns]
+
+
+class GeoBatchRequest(BaseModel):
+    geos: Union[Literal["all"], List[str]] = Field(
+        "all", description="Geo identifiers to include, or 'all'"
+    )
+    start: Optional[date] = Field(None, description="Inclusive start date")
+    end: Optional[date] = Field(None, description="Inclusive end date")
+    channels: Optional[List[str]] = Field(None, description="Filter to specific channel IDs")
+    aggregation: Literal["none", "sum", "mean", "population_weighted"] = Field(
+        "sum",
+        description="Combine the geos per week, or 'none' to return each geo's series",
+    )
+
+
+class GeoBatchResponse(BaseModel):
+    geos: List[str]
+    aggregation: str
+    start: date
+    end: date
+    points: List[GeoMetricPoint] = Field(
+        default_factory=list, description="Aggregated series (empty when aggregation is 'none')"
+    )
+    series: List[GeoSeriesResponse] = Field(
+        default_factory=list, description="Per-geo series when aggregation is 'none'"
+    )
+
+
 class GeoListItem(BaseModel):
     geo: str
     start: date
@@ -67,6 +125,31 @@ class NationalSeriesResponse(BaseModel):
     points: List[NationalMetricPoint]
 
 
+class NationalSeriesColumnsResponse(BaseModel):
+    """Struct-of-arrays variant of :class:`NationalSeriesResponse` (``format=columnar``)."""
+
+    start: date
+    end: date
+    time: List[date]
+    conversions: List[Optional[float]]
+    revenue_per_conversion: List[Optional[float]]
+    competitor_sales_control: List[Optional[float]]
+    sentiment_score_control: List[Optional[float]]
+    promo: List[Optional[float]]
+    total_spend: List[float]
+    spend_efficiency: List[Optional[float]]
+    lift_vs_prev: List[Optional[float]]
+    channels: List[ChannelColumns]
+
+
+class ReloadResponse(BaseModel):
+    status: Literal["unchanged", "appended", "rebuilt"] = Field(
+        ..., description="How the current data generation was produced"
+    )
+    generation: int = Field(..., ge=1, description="Generation now being served")
+    duration_ms: float = Field(..., ge=0)
+
+
 class ChannelAggregate(BaseModel):
     id: str
     name: str
@@ -116,3 +199,63 @@ class ScenarioResponse(BaseModel):
     delta_conversions: float
     delta_revenue: float
     channels: List[ScenarioChannelProjection]
+
+
+class ScenarioGrid(BaseModel):
+    sources: Optional[List[str]] = Field(
+        None, max_length=MAX_SCENARIO_CHANNELS, description="Source channels (default: all)"
+    )
+    targets: Optional[List[str]] = Field(
+        None, max_length=MAX_SCENARIO_CHANNELS, description="Target channels (default: all)"
+    )
+    ratios: List[float] = Field(
+        ..., min_length=1, max_length=MAX_SCENARIOS, description="Shift ratios to try (0-0.5)"
+    )
+
+
+MatrixRow = Annotated[List[float], Field(max_length=MAX_SCENARIO_CHANNELS)]
+Matrix = Annotated[List[MatrixRow], Field(max_length=MAX_SCENARIO_CHANNELS)]
+
+
+class ScenarioBatchRequest(BaseModel):
+    shifts: Optional[List[ScenarioRequest]] = Field(
+        None, max_length=MAX_SCENARIOS, description="Explicit shifts"
+    )
+    grid: Optional[ScenarioGrid] = Field(
+        None, description="Every source x target x ratio combination, skipping source == target"
+    )
+    reallocations: Optional[List[Matrix]] = Field(
+        None,
+        max_length=MAX_SCENARIOS,
+        description="Channel x channel matrices; entry [i][j] moves that fraction of i's spend to j",
+    )
+    start: Optional[date] = None
+    end: Optional[date] = None
+    weeks: Optional[int] = Field(None, ge=1, description="Trailing weeks used as the baseline")
+
+    @model_validator(mode="after")
+    def _one_scenario_source(self) -> "ScenarioBatchRequest":
+        given = [self.shifts is not None, self.grid is not None, self.reallocations is not None]
+        if sum(given) != 1:
+            raise ValueError("Provide exactly one of shifts, grid or reallocations")
+        return self
+
+
+class ScenarioBatchResponse(BaseModel):
+    """Column-oriented results: per-channel fields are ``scenarios x channels`` matrices."""
+
+    channels: List[str]
+    scenarios: int
+    source_channel: Optional[List[str]]
+    target_channel: Optional[List[str]]
+    shift_ratio: Optional[List[float]]
+    spend: List[List[float]]
+    estimated_conversions: List[List[float]]
+    estimated_revenue: List[List[float]]
+    roas: List[List[float]]
+    cac: List[List[Optional[float]]]
+    total_spend: List[float]
+    projected_conversions: List[float]
+    projected_revenue: List[float]
+    delta_conversions: List[float]
+    delta_revenue: List[float]
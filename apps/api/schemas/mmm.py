@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,6 +31,27 @@ class ContributionSeriesResponse(BaseModel):
     points: List[ContributionPoint]
 
 
+class ContributionChannelColumns(BaseModel):
+    id: str = Field(..., description="Channel identifier")
+    name: str = Field(..., description="Channel display label")
+    mean: List[float]
+    lower: List[float]
+    upper: List[float]
+    share: List[float]
+
+
+class ContributionSeriesColumnsResponse(BaseModel):
+    """Struct-of-arrays variant of :class:`ContributionSeriesResponse` (``format=columnar``)."""
+
+    start: date
+    end: date
+    time: List[date]
+    total_mean: List[float]
+    total_lower: List[float]
+    total_upper: List[float]
+    channels: List[ContributionChannelColumns]
+
+
 class ResponseCurvePoint(BaseModel):
     spend: float = Field(..., ge=0)
     mean: float = Field(..., ge=0)
@@ -49,3 +70,54 @@ class ResponseCurveChannel(BaseModel):
 class ResponseCurvesResponse(BaseModel):
     channels: List[ResponseCurveChannel]
 
+
+class CurveAnalyticsChannel(BaseModel):
+    id: str
+    name: str
+    historical_spend: float = Field(..., ge=0)
+    saturation_spend: float = Field(..., ge=0, description="Spend where ROI halves (mean curve)")
+    saturation_spend_lower: float = Field(..., ge=0)
+    saturation_spend_upper: float = Field(..., ge=0)
+    diminishing_returns_start: float = Field(..., ge=0)
+    marginal_roi: float = Field(..., description="Outcome per extra unit of spend at historical spend")
+
+
+class CurveAnalyticsResponse(BaseModel):
+    spend_steps: int
+    credible_interval: float
+    channels: List[CurveAnalyticsChannel]
+
+
+class ChannelBudgetBounds(BaseModel):
+    min_spend: float = Field(0.0, ge=0, description="Lowest spend the optimizer may assign")
+    max_spend: Optional[float] = Field(
+        None, ge=0, description="Highest spend (default: the end of the channel's response curve)"
+    )
+
+
+class BudgetOptimizationRequest(BaseModel):
+    total_budget: float = Field(..., gt=0, description="Spend to allocate across all channels")
+    bounds: Dict[str, ChannelBudgetBounds] = Field(
+        default_factory=dict, description="Per-channel spend bounds keyed by channel name"
+    )
+
+
+class BudgetAllocationChannel(BaseModel):
+    id: str
+    name: str
+    spend: float = Field(..., ge=0, description="Optimal spend")
+    mean: float = Field(..., description="Expected incremental outcome at the optimal spend")
+    lower: float
+    upper: float
+    min_spend: float = Field(..., ge=0)
+    max_spend: float = Field(..., ge=0)
+    baseline_spend: float = Field(..., ge=0, description="Historical mix scaled to the budget")
+    baseline_mean: float
+
+
+class BudgetOptimizationResponse(BaseModel):
+    total_budget: float
+    expected_outcome: float = Field(..., description="Sum of channel means at the optimum")
+    baseline_outcome: float = Field(..., description="Sum of channel means for the historical mix")
+    credible_interval: float
+    channels: List[BudgetAllocationChannel]
@@ -0,0 +1,158 @@
+"""Bounded cache of serialized chart payloads.
+
+Vega-Lite specs embed every data point, so a chart cache that stores dicts
+and deep-copies them per hit spends nearly as much as building the response.
+This cache keeps each chart as the exact bytes sent to clients, gzipped once
+when large enough, with a weak ETag: a hit is a dictionary lookup, and a
+client holding the current version gets a 304 without any body at all. The
+bytes are produced by :meth:`CachedChart.from_content`, which is meant to run
+wherever the chart is built (an MMM worker), not on the event loop.
+
+Entries are evicted least recently used first once their total size passes
+``max_bytes``, and expire after ``ttl`` seconds (per entry if given, where
+``math.inf`` means "until evicted or cleared"). A hit on an entry past
+``refresh_after`` of its lifetime starts one background rebuild and is still
+served from the old bytes, so popular charts are replaced before they expire
+instead of every client waiting on a rebuild together. Misses are
+single-flight, like :class:`services.single_flight.SingleFlightCache`, and
+everything runs on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import logging
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from services.json_utils import encode_json
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[Hashable, ...]
+
+# Bodies smaller than this are not worth a gzip header and a second copy.
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass(slots=True, frozen=True)
+class CachedChart:
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: Any) -> "CachedChart":
+        """Serialize, compress and fingerprint a JSON-compatible payload."""
+        body = encode_json(content)
+        return cls(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None,
+            # Weak: the plain and gzipped bodies are the same representation.
+            etag='W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+        )
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an ``If-None-Match`` header names this version (weak comparison)."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag.removeprefix("W/") in tags
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+class ChartCache:
+    def __init__(self, ttl: float, max_bytes: int, refresh_after: float = 0.8) -> None:
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._refresh_after = refresh_after
+        self._entries: "OrderedDict[Key, Tuple[float, float, CachedChart]]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[Key, asyncio.Future] = {}
+        self._counters: Counter = Counter()
+
+    async def get(
+        self,
+        key: Key,
+        build: Callable[[], Awaitable[CachedChart]],
+        ttl: Optional[float] = None,
+    ) -> CachedChart:
+        """Return the chart for ``key``, joining or starting ``build`` on a miss."""
+        cached = self._entries.get(key)
+        if cached is not None:
+            stored_at, entry_ttl, chart = cached
+            age = monotonic() - stored_at
+            if age < entry_ttl:
+                self._counters["hit"] += 1
+                self._entries.move_to_end(key)
+                if age >= entry_ttl * self._refresh_after and key not in self._in_flight:
+                    self._counters["refresh"] += 1
+                    self._start(key, build, entry_ttl).add_done_callback(_log_refresh_failure)
+                return chart
+            self._discard(key)
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["miss"] += 1
+            task = self._start(key, build, self._ttl if ttl is None else ttl)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "in_flight": len(self._in_flight),
+            **{
+                kind: self._counters[kind]
+                for kind in ("hit", "miss", "coalesced", "refresh", "eviction")
+            },
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _start(
+        self, key: Key, build: Callable[[], Awaitable[CachedChart]], ttl: float
+    ) -> asyncio.Future:
+        task = asyncio.ensure_future(self._build(key, build, ttl))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return task
+
+    async def _build(
+        self, key: Key, build: Callable[[], Awaitable[CachedChart]], ttl: float
+    ) -> CachedChart:
+        chart = await build()
+        self._discard(key)
+        if chart.size <= self._max_bytes:
+            self._entries[key] = (monotonic(), ttl, chart)
+            self._bytes += chart.size
+            while self._bytes > self._max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._counters["eviction"] += 1
+        return chart
+
+    def _discard(self, key: Key) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._bytes -= cached[2].size
+
+
+def _log_refresh_failure(task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Chart refresh failed; serving the previous version: %s", task.exception())
@@ -0,0 +1,19 @@
+"""Shared JSON encoder for responses rendered outside Pydantic.
+
+Endpoints that skip response-model validation (fast time-series paths, cached
+chart bytes) serialise with :func:`encode_json`, so every such payload is
+encoded the same way. Non-finite floats become ``null``, which is also what
+Pydantic's JSON serialiser does for the validated paths, so a series with a
+gap looks the same whichever path produced it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+
+def encode_json(content: Any) -> bytes:
+    """Compact UTF-8 JSON; ``NaN`` and infinities are written as ``null``."""
+    return orjson.dumps(content)
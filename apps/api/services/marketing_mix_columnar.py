@@ -0,0 +1,488 @@
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+SCALAR_COLUMNS = {
+    "conversions": "conversions",
+    "revenue_per_conversion": "revenue_per_conversion",
+    "competitor_sales_control": "competitor_sales_control",
+    "sentiment_score_control": "sentiment_score_control",
+    "promo": "Promo",
+}
+ORGANIC_COLUMNS = {0: "Organic_channel0_impression"}
+
+
+@dataclass(slots=True, frozen=True)
+class SeriesFrame:
+    """Time-sorted columns for a single geo or for the national roll-up.
+
+    Scalar metrics are ``(time,)`` float64 arrays with ``NaN`` marking missing
+    values. Channel metrics are ``(time, channel)`` matrices whose column order
+    matches ``channel0..channelN``.
+    """
+
+    times: np.ndarray
+    conversions: np.ndarray
+    revenue_per_conversion: np.ndarray
+    competitor_sales_control: np.ndarray
+    sentiment_score_control: np.ndarray
+    promo: np.ndarray
+    population: Optional[np.ndarray]
+    spend: np.ndarray
+    impressions: np.ndarray
+    organic_impressions: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.times.shape[0])
+
+    def take(self, index) -> "SeriesFrame":
+        """Return the rows selected by ``index`` (a slice, mask or positions)."""
+        values = {}
+        for field in fields(self):
+            column = getattr(self, field.name)
+            values[field.name] = column[index] if column is not None else None
+        return SeriesFrame(**values)
+
+
+@dataclass(slots=True, frozen=True)
+class DerivedMetrics:
+    """Per-week metrics derived from a frame once at load time.
+
+    ``spend_efficiency`` and ``lift_vs_prev`` use ``NaN`` where the value is
+    undefined. Lift compares against the previous non-zero week of the full
+    history, so slicing a window keeps its first week's lift correct.
+    """
+
+    total_spend: np.ndarray
+    spend_efficiency: np.ndarray
+    lift_vs_prev: np.ndarray
+
+    def take(self, index) -> "DerivedMetrics":
+        return DerivedMetrics(
+            total_spend=self.total_spend[index],
+            spend_efficiency=self.spend_efficiency[index],
+            lift_vs_prev=self.lift_vs_prev[index],
+        )
+
+
+def derive_metrics(frame: SeriesFrame) -> DerivedMetrics:
+    """Vectorized ``total_spend``, ``spend_efficiency`` and ``lift_vs_prev`` for ``frame``."""
+    total_spend = frame.spend.sum(axis=1)
+    conversions = np.nan_to_num(frame.conversions)
+    previous = previous_nonzero(frame.conversions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift = np.where(np.isnan(previous), np.nan, (conversions - previous) / previous)
+    return DerivedMetrics(
+        total_spend=total_spend,
+        spend_efficiency=spend_efficiency(conversions, total_spend),
+        lift_vs_prev=lift,
+    )
+
+
+def extend_metrics(metrics: DerivedMetrics, frame: SeriesFrame) -> DerivedMetrics:
+    """Extend ``metrics`` over rows appended to ``frame`` since they were derived.
+
+    Only the new rows are derived, seeded with the last non-zero conversions
+    week before them so the first new week's lift matches a full recompute.
+    """
+    known = metrics.total_spend.shape[0]
+    nonzero = np.flatnonzero(np.nan_to_num(frame.conversions[:known]) != 0)
+    seed = int(nonzero[-1]) if nonzero.size else known
+    tail = derive_metrics(frame.take(slice(seed, None))).take(slice(known - seed, None))
+    return DerivedMetrics(
+        total_spend=np.concatenate((metrics.total_spend, tail.total_spend)),
+        spend_efficiency=np.concatenate((metrics.spend_efficiency, tail.spend_efficiency)),
+        lift_vs_prev=np.concatenate((metrics.lift_vs_prev, tail.lift_vs_prev)),
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class WeeklyTotals:
+    """Prefix sums over the weeks of a frame, for O(1) totals over any window.
+
+    Row ``i`` of each cumulative array holds the total of weeks ``[0, i)``, so
+    the total of weeks ``[lo, hi)`` is ``cumulative[hi] - cumulative[lo]``.
+    ``latest_*_lift`` holds, for each week, the index of the most recent week
+    at or before it whose lift is defined (``-1`` if none), so the latest lift
+    inside a window is a single lookup as well.
+    """
+
+    spend: np.ndarray
+    impressions: np.ndarray
+    conversions: np.ndarray
+    revenue: np.ndarray
+    promo_weeks: np.ndarray
+    conversion_lift: np.ndarray
+    spend_lift: np.ndarray
+    latest_conversion_lift: np.ndarray
+    latest_spend_lift: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.conversion_lift.shape[0])
+
+    def window(self, lo: int, hi: int) -> Dict[str, object]:
+        """Totals and latest lifts for weeks ``[lo, hi)``."""
+        hi = max(lo, hi)
+        return {
+            "weeks": hi - lo,
+            "spend": self.spend[hi] - self.spend[lo],
+            "impressions": self.impressions[hi] - self.impressions[lo],
+            "conversions": float(self.conversions[hi] - self.conversions[lo]),
+            "revenue": float(self.revenue[hi] - self.revenue[lo]),
+            "promo_weeks": int(self.promo_weeks[hi] - self.promo_weeks[lo]),
+            "recent_conversion_lift": _latest_in_window(
+                self.conversion_lift, self.latest_conversion_lift, lo, hi
+            ),
+            "recent_spend_lift": _latest_in_window(
+                self.spend_lift, self.latest_spend_lift, lo, hi
+            ),
+        }
+
+    def extend(self, frame: SeriesFrame) -> "WeeklyTotals":
+        """Extend the sums over rows appended to ``frame`` since they were built."""
+        added = weekly_totals(frame, start=len(self))
+        values = {}
+        for name in _CUMULATIVE_FIELDS:
+            head = getattr(self, name)
+            values[name] = np.concatenate((head, getattr(added, name)[1:] + head[-1]))
+        for name in ("conversion_lift", "spend_lift"):
+            values[name] = np.concatenate((getattr(self, name), getattr(added, name)))
+        for name in ("latest_conversion_lift", "latest_spend_lift"):
+            head = getattr(self, name)
+            carried = head[-1] if head.size else -1
+            values[name] = np.concatenate((head, np.maximum(getattr(added, name), carried)))
+        return WeeklyTotals(**values)
+
+
+_CUMULATIVE_FIELDS = ("spend", "impressions", "conversions", "revenue", "promo_weeks")
+
+
+def weekly_totals(frame: SeriesFrame, start: int = 0) -> WeeklyTotals:
+    """Build :class:`WeeklyTotals` for the rows of ``frame`` from ``start`` on.
+
+    Lifts compare against the previous non-zero week of the whole frame, and
+    ``latest_*_lift`` indexes are positions in the whole frame.
+    """
+    conversions = frame.conversions
+    week_spend = frame.spend.sum(axis=1)
+    rows = slice(start, None)
+
+    def cumulative(values: np.ndarray) -> np.ndarray:
+        zero = np.zeros((1,) + values.shape[1:], dtype=values.dtype)
+        return np.concatenate((zero, np.cumsum(values, axis=0)))
+
+    conversion_lift = _lift(conversions, start)
+    spend_lift = _lift(week_spend, start)
+    return WeeklyTotals(
+        spend=cumulative(frame.spend[rows]),
+        impressions=cumulative(frame.impressions[rows]),
+        conversions=cumulative(np.nan_to_num(conversions[rows])),
+        revenue=cumulative(np.nan_to_num(conversions[rows] * frame.revenue_per_conversion[rows])),
+        promo_weeks=cumulative((frame.promo[rows] > 0).astype(np.int64)),
+        conversion_lift=conversion_lift,
+        spend_lift=spend_lift,
+        latest_conversion_lift=_latest_defined(conversion_lift, start),
+        latest_spend_lift=_latest_defined(spend_lift, start),
+    )
+
+
+def _lift(values: np.ndarray, start: int) -> np.ndarray:
+    """Lift of rows ``start:`` against the previous non-zero value, ``NaN`` where undefined."""
+    nonzero = np.flatnonzero(np.nan_to_num(values[:start]) != 0)
+    seed = int(nonzero[-1]) if nonzero.size else start
+    window = values[seed:]
+    previous = previous_nonzero(window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift = (window - previous) / previous
+    return lift[start - seed :]
+
+
+def _latest_defined(lift: np.ndarray, start: int) -> np.ndarray:
+    positions = np.where(np.isnan(lift), -1, np.arange(start, start + lift.size))
+    return np.maximum.accumulate(positions) if positions.size else positions
+
+
+def _latest_in_window(lift: np.ndarray, latest: np.ndarray, lo: int, hi: int) -> float:
+    if hi <= lo:
+        return 0.0
+    idx = int(latest[hi - 1])
+    return float(lift[idx]) if idx >= lo else 0.0
+
+
+def spend_efficiency(conversions: np.ndarray, total_spend: np.ndarray) -> np.ndarray:
+    """Conversions per unit spend, ``NaN`` where either side is zero."""
+    defined = (conversions != 0) & (total_spend != 0)
+    return np.divide(conversions, total_spend, out=np.full(conversions.shape, np.nan), where=defined)
+
+
+def previous_nonzero(values: np.ndarray) -> np.ndarray:
+    """For each row, the last non-zero, non-missing value strictly before it (NaN if none)."""
+    if not values.size:
+        return np.full(0, np.nan)
+    valid = np.nan_to_num(values) != 0
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(values.size), -1))
+    previous = np.concatenate(([-1], last_valid[:-1]))
+    return np.where(previous >= 0, values[np.maximum(previous, 0)], np.nan)
+
+
+AGGREGATIONS = ("sum", "mean", "population_weighted")
+
+
+def aggregate_frames(frames: Sequence[SeriesFrame], aggregation: str) -> SeriesFrame:
+    """Combine several geo frames into one series on the union of their weeks.
+
+    Every metric is grouped by week with ``np.bincount`` over the concatenated
+    rows, ignoring missing values: ``sum`` adds them, ``mean`` averages across
+    the geos reporting that week and ``population_weighted`` weights each geo
+    by its population. ``population`` is always the total population covered.
+    Weeks where no geo has a value stay ``NaN``.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{aggregation}'")
+    stacked = {
+        field.name: np.concatenate([getattr(frame, field.name) for frame in frames])
+        for field in fields(SeriesFrame)
+        if all(getattr(frame, field.name) is not None for frame in frames)
+    }
+    times, slot = np.unique(stacked["times"], return_inverse=True)
+    population = stacked.get("population")
+    if aggregation == "population_weighted":
+        if population is None:
+            raise ValueError("Population-weighted aggregation needs a population column")
+        weights = np.nan_to_num(population)
+    else:
+        weights = np.ones(slot.size)
+
+    def combine(values: np.ndarray) -> np.ndarray:
+        if values.ndim == 2:
+            return np.column_stack([combine(column) for column in values.T])
+        valid = ~np.isnan(values)
+        total = np.bincount(slot, np.where(valid, values * weights, 0.0), times.size)
+        weight = np.bincount(slot, np.where(valid, weights, 0.0), times.size)
+        if aggregation == "sum":
+            counts = np.bincount(slot, valid, times.size)
+            return np.where(counts > 0, total, np.nan)
+        return np.divide(total, weight, out=np.full(times.size, np.nan), where=weight > 0)
+
+    values = {
+        name: combine(column)
+        for name, column in stacked.items()
+        if name not in ("times", "population")
+    }
+    if population is not None:
+        valid = ~np.isnan(population)
+        counts = np.bincount(slot, valid, times.size)
+        total = np.bincount(slot, np.where(valid, population, 0.0), times.size)
+        values["population"] = np.where(counts > 0, total, np.nan)
+    else:
+        values["population"] = None
+    return SeriesFrame(times=times, **values)
+
+
+class SeriesView:
+    """Projection of a frame window onto a subset of channel columns.
+
+    Channel matrices are returned as basic-slice views when the selected
+    columns are contiguous (including the unfiltered case), so no per-row
+    objects are created until a caller converts the columns it needs.
+    Derived metrics come from the precomputed columns unless a channel filter
+    changes what ``total_spend`` covers.
+    """
+
+    __slots__ = ("frame", "metrics", "columns", "channel_ids")
+
+    def __init__(
+        self,
+        frame: SeriesFrame,
+        metrics: DerivedMetrics,
+        columns: Sequence[int],
+        channel_ids: Sequence[str],
+    ) -> None:
+        self.frame = frame
+        self.metrics = metrics
+        self.columns = tuple(columns)
+        self.channel_ids = tuple(channel_ids)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def projected(self) -> bool:
+        """Whether a channel filter dropped any columns."""
+        return self.columns != tuple(range(self.frame.spend.shape[1]))
+
+    @property
+    def total_spend(self) -> np.ndarray:
+        if not self.projected:
+            return self.metrics.total_spend
+        return self.spend.sum(axis=1)
+
+    @property
+    def spend_efficiency(self) -> np.ndarray:
+        if not self.projected:
+            return self.metrics.spend_efficiency
+        return spend_efficiency(np.nan_to_num(self.frame.conversions), self.total_spend)
+
+    @property
+    def lift_vs_prev(self) -> np.ndarray:
+        return self.metrics.lift_vs_prev
+
+    @property
+    def spend(self) -> np.ndarray:
+        return self._project(self.frame.spend)
+
+    @property
+    def impressions(self) -> np.ndarray:
+        return self._project(self.frame.impressions)
+
+    @property
+    def organic_impressions(self) -> np.ndarray:
+        return self._project(self.frame.organic_impressions)
+
+    def optional_values(self, name: str) -> List[Optional[float]]:
+        """Return a scalar column as Python floats with ``None`` for missing values."""
+        column = getattr(self, name) if name in _VIEW_METRICS else getattr(self.frame, name)
+        if column is None:
+            return [None] * len(self)
+        return optional_floats(column)
+
+    def optional_channel_rows(self, name: str) -> List[List[Optional[float]]]:
+        """Return a projected channel matrix as nested lists with ``None`` for missing values."""
+        matrix = self._project(getattr(self.frame, name))
+        return [[None if value != value else value for value in row] for row in matrix.tolist()]
+
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        columns = self.columns
+        if not columns:
+            return matrix[:, :0]
+        if columns == tuple(range(columns[0], columns[-1] + 1)):
+            return matrix[:, columns[0] : columns[-1] + 1]
+        return matrix[:, columns]
+
+
+_VIEW_METRICS = frozenset(("total_spend", "spend_efficiency", "lift_vs_prev"))
+
+
+def optional_floats(values: np.ndarray) -> List[Optional[float]]:
+    """Convert a float array to Python floats, mapping ``NaN`` to ``None``."""
+    return [None if value != value else value for value in values.tolist()]
+
+
+def read_csv_columns(path: Path, offset: int = 0) -> Dict[str, List[str]]:
+    """Read a CSV file into a mapping of header -> raw string column.
+
+    With ``offset`` only the rows starting at that byte position are read (the
+    header still comes from the first line), e.g. the tail appended to a file.
+    """
+    with path.open("rb") as fh:
+        header = next(csv.reader([fh.readline().decode("utf-8")]), [])
+        if offset:
+            fh.seek(offset)
+        text = fh.read().decode("utf-8")
+    reader = csv.reader(io.StringIO(text, newline=""))
+    rows = [row + [""] * (len(header) - len(row)) for row in reader if row]
+    if not rows:
+        return {name: [] for name in header}
+    return {name: list(column) for name, column in zip(header, zip(*rows))}
+
+
+def parse_frame(
+    columns: Dict[str, List[str]],
+    channel_count: int,
+    include_population: bool = False,
+) -> SeriesFrame:
+    """Convert raw CSV columns into a :class:`SeriesFrame` in file order."""
+    size = len(columns.get("time", []))
+
+    def scalar(name: str) -> np.ndarray:
+        return _float_column(columns.get(name), size)
+
+    spend = np.empty((size, channel_count), dtype=np.float64)
+    impressions = np.empty((size, channel_count), dtype=np.float64)
+    organic = np.full((size, channel_count), np.nan, dtype=np.float64)
+    for idx in range(channel_count):
+        spend[:, idx] = np.nan_to_num(scalar(f"Channel{idx}_spend"), nan=0.0)
+        impressions[:, idx] = np.nan_to_num(scalar(f"Channel{idx}_impression"), nan=0.0)
+        if idx in ORGANIC_COLUMNS:
+            organic[:, idx] = scalar(ORGANIC_COLUMNS[idx])
+
+    return SeriesFrame(
+        times=_date_column(columns.get("time"), size),
+        conversions=scalar(SCALAR_COLUMNS["conversions"]),
+        revenue_per_conversion=scalar(SCALAR_COLUMNS["revenue_per_conversion"]),
+        competitor_sales_control=scalar(SCALAR_COLUMNS["competitor_sales_control"]),
+        sentiment_score_control=scalar(SCALAR_COLUMNS["sentiment_score_control"]),
+        promo=scalar(SCALAR_COLUMNS["promo"]),
+        population=scalar("population") if include_population else None,
+        spend=spend,
+        impressions=impressions,
+        organic_impressions=organic,
+    )
+
+
+def build_frame(columns: Dict[str, List[str]], channel_count: int) -> SeriesFrame:
+    """Build a time-sorted :class:`SeriesFrame` from raw CSV columns."""
+    frame = parse_frame(columns, channel_count)
+    return frame.take(np.argsort(frame.times, kind="stable"))
+
+
+def concat_frames(head: SeriesFrame, tail: SeriesFrame) -> SeriesFrame:
+    """Append the rows of ``tail`` after those of ``head``."""
+    values = {}
+    for field in fields(SeriesFrame):
+        first, second = getattr(head, field.name), getattr(tail, field.name)
+        values[field.name] = (
+            np.concatenate((first, second)) if first is not None and second is not None else None
+        )
+    return SeriesFrame(**values)
+
+
+def build_geo_frames(columns: Dict[str, List[str]], channel_count: int) -> Dict[str, SeriesFrame]:
+    """Split the geo CSV columns into one time-sorted :class:`SeriesFrame` per geo."""
+    geo_column = columns.get("geo") or columns.get("Geo") or []
+    geos = np.asarray(geo_column, dtype=str)
+    frames: Dict[str, SeriesFrame] = {}
+    if geos.size == 0:
+        return frames
+
+    parsed = parse_frame(columns, channel_count, include_population=True)
+    # Keep geos in first-seen order, matching the record-based loader.
+    names, first_seen, inverse = np.unique(geos, return_index=True, return_inverse=True)
+    order = np.lexsort((parsed.times, inverse))
+    bounds = np.searchsorted(inverse[order], np.arange(names.size + 1))
+    for code in np.argsort(first_seen, kind="stable"):
+        geo = str(names[code])
+        if not geo:
+            continue
+        frames[geo] = parsed.take(order[bounds[code] : bounds[code + 1]])
+    return frames
+
+
+def _float_column(values: Optional[Sequence[str]], size: int) -> np.ndarray:
+    if values is None:
+        return np.full(size, np.nan, dtype=np.float64)
+    raw = np.asarray(values, dtype=str)
+    try:
+        return np.where(raw == "", "nan", raw).astype(np.float64)
+    except ValueError:
+        return np.array([_parse_cell(value) for value in values], dtype=np.float64)
+
+
+def _parse_cell(raw: str) -> float:
+    try:
+        return float(raw) if raw != "" else np.nan
+    except ValueError:
+        return np.nan
+
+
+def _date_column(values: Optional[Sequence[str]], size: int) -> np.ndarray:
+    raw = np.asarray(values if values is not None else [""] * size, dtype=str)
+    if np.any(raw == ""):
+        raise ValueError("Missing date value in marketing mix dataset")
+    return raw.astype("datetime64[D]")
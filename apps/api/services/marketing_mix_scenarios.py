@@ -0,0 +1,131 @@
+"""Vectorized budget-reallocation scenarios.
+
+Every scenario is a row of an ``(scenarios, channels)`` spend matrix, so a
+whole batch is evaluated with a handful of array operations. Projections use
+the same spend-share attribution as
+:meth:`MarketingMixService.simulate_budget_shift`: each channel is credited
+with the share of total conversions and revenue equal to its share of spend.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+
+MAX_SCENARIOS = 100_000
+MAX_SHIFT_RATIO = 0.5
+
+
+class ScenarioError(ValueError):
+    """Invalid scenario input, reported with the offending scenario's index."""
+
+
+@dataclass(slots=True, frozen=True)
+class ScenarioBatch:
+    """Projected ``(scenarios, channels)`` results plus per-scenario totals.
+
+    ``cac`` is ``NaN`` where a channel has no attributed conversions.
+    """
+
+    spend: np.ndarray
+    estimated_conversions: np.ndarray
+    estimated_revenue: np.ndarray
+    roas: np.ndarray
+    cac: np.ndarray
+    total_spend: np.ndarray
+    projected_conversions: np.ndarray
+    projected_revenue: np.ndarray
+    delta_conversions: np.ndarray
+    delta_revenue: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.spend.shape[0])
+
+
+def shift_spend(
+    base_spend: np.ndarray, sources: np.ndarray, targets: np.ndarray, ratios: np.ndarray
+) -> np.ndarray:
+    """Spend after moving ``ratios`` of each source channel's spend to its target."""
+    check_scenario_count(sources.size)
+    if np.any(sources == targets):
+        raise ScenarioError(
+            f"Source and target must differ (scenario {_first(sources == targets)})"
+        )
+    invalid = (ratios < 0) | (ratios > MAX_SHIFT_RATIO) | np.isnan(ratios)
+    if np.any(invalid):
+        raise ScenarioError(
+            f"Shift ratio must be between 0 and {MAX_SHIFT_RATIO} (scenario {_first(invalid)})"
+        )
+    empty = base_spend[sources] <= 0
+    if np.any(empty):
+        raise ScenarioError(f"Source channel has no spend to shift (scenario {_first(empty)})")
+
+    rows = np.arange(sources.size)
+    amount = base_spend[sources] * ratios
+    spend = np.tile(base_spend, (sources.size, 1))
+    spend[rows, sources] -= amount
+    spend[rows, targets] += amount
+    return spend
+
+
+def reallocate_spend(base_spend: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+    """Spend after applying reallocation matrices.
+
+    ``matrices[s, i, j]`` is the fraction of channel ``i``'s spend moved to
+    channel ``j`` in scenario ``s``; the diagonal is ignored.
+    """
+    channels = base_spend.size
+    if matrices.ndim != 3 or matrices.shape[1:] != (channels, channels):
+        raise ScenarioError(f"Each reallocation matrix must be {channels}x{channels}")
+    check_scenario_count(matrices.shape[0])
+    moved = matrices * (1.0 - np.eye(channels))
+    if np.any(moved < 0) or np.isnan(moved).any():
+        raise ScenarioError("Reallocation fractions must be non-negative")
+    overdrawn = moved.sum(axis=2) > 1.0 + 1e-9
+    if np.any(overdrawn):
+        scenario = _first(overdrawn.any(axis=1))
+        raise ScenarioError(
+            f"A channel cannot give away more than all of its spend (scenario {scenario})"
+        )
+    outgoing = base_spend * moved.sum(axis=2)
+    incoming = np.einsum("i,sij->sj", base_spend, moved)
+    return base_spend - outgoing + incoming
+
+
+def project(spend: np.ndarray, total_conversions: float, total_revenue: float) -> ScenarioBatch:
+    """Attribute conversions and revenue to each scenario's spend by spend share.
+
+    Deltas are relative to ``total_conversions`` and ``total_revenue``.
+    """
+    total_spend = spend.sum(axis=1)
+    share = spend / np.where(total_spend > 0, total_spend, 1.0)[:, None]
+    conversions = total_conversions * share
+    revenue = total_revenue * share
+    roas = np.divide(revenue, spend, out=np.zeros_like(spend), where=spend != 0)
+    cac = np.divide(spend, conversions, out=np.full_like(spend, np.nan), where=conversions != 0)
+    projected_conversions = conversions.sum(axis=1)
+    projected_revenue = revenue.sum(axis=1)
+    return ScenarioBatch(
+        spend=spend,
+        estimated_conversions=conversions,
+        estimated_revenue=revenue,
+        roas=roas,
+        cac=cac,
+        total_spend=total_spend,
+        projected_conversions=projected_conversions,
+        projected_revenue=projected_revenue,
+        delta_conversions=projected_conversions - total_conversions,
+        delta_revenue=projected_revenue - total_revenue,
+    )
+
+
+def check_scenario_count(count: int) -> None:
+    """Reject empty batches and batches over :data:`MAX_SCENARIOS`."""
+    if count == 0:
+        raise ScenarioError("At least one scenario is required")
+    if count > MAX_SCENARIOS:
+        raise ScenarioError(f"At most {MAX_SCENARIOS} scenarios can be evaluated per request")
+
+
+def _first(mask: np.ndarray) -> int:
+    return int(np.flatnonzero(mask)[0])
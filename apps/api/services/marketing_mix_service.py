@@ -1,21 +1,67 @@
 from __future__ import annotations
 
-import csv
 import copy
-from collections import defaultdict
+import hashlib
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from threading import Event, Lock, Thread
+from time import perf_counter
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from fastapi import HTTPException
 
+from services.file_utils import fingerprint
+from services.marketing_mix_columnar import (
+    DerivedMetrics,
+    SeriesFrame,
+    SeriesView,
+    WeeklyTotals,
+    aggregate_frames,
+    build_frame,
+    build_geo_frames,
+    concat_frames,
+    derive_metrics,
+    extend_metrics,
+    optional_floats,
+    read_csv_columns,
+    weekly_totals,
+)
+from services.marketing_mix_scenarios import (
+    ScenarioBatch,
+    ScenarioError,
+    project,
+    reallocate_spend,
+    shift_spend,
+)
+from services.marketing_mix_snapshot import (
+    load_snapshot,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
 CHANNEL_COUNT = 5
 CHANNEL_NAMES = {f"channel{i}": f"Channel {i}" for i in range(CHANNEL_COUNT)}
+CHANNEL_INDEX = {channel_id: idx for idx, channel_id in enumerate(CHANNEL_NAMES)}
 DATA_FILENAMES = {
     "geo": "geo_all_channels.csv",
     "national": "national_all_channels.csv",
 }
+BACKENDS = ("records", "columnar")
+DEFAULT_BACKEND = os.getenv("MARKETING_MIX_BACKEND", "records")
+SNAPSHOT_ENABLED = os.getenv("MARKETING_MIX_SNAPSHOT", "1") != "0"
+SNAPSHOT_DIR = os.getenv("MARKETING_MIX_SNAPSHOT_DIR")
+MMAP_ENABLED = os.getenv("MARKETING_MIX_MMAP", "0") == "1"
+# Seconds between checks of the data files for new data; 0 disables the watcher.
+RELOAD_INTERVAL = float(os.getenv("MARKETING_MIX_RELOAD_INTERVAL", "0"))
+# Minimum seconds between forced rebuilds; a forced reload sooner than that
+# only checks the files for changes.
+FORCE_RELOAD_INTERVAL = float(os.getenv("MARKETING_MIX_FORCE_RELOAD_INTERVAL", "60"))
 
 
 @dataclass(slots=True)
@@ -50,37 +96,116 @@ class NationalRecord:
     channels: List[ChannelRecord]
 
 
-class MarketingMixService:
-    """Service responsible for loading and serving marketing-mix data sets."""
+class ProjectedRecord:
+    """Row proxy exposing a record with only the selected channels.
+
+    The proxy shares the underlying record and its ``ChannelRecord`` objects
+    instead of copying them; every other attribute is read from the record.
+    """
+
+    __slots__ = ("_record", "channels")
+
+    def __init__(self, record, channels: List[ChannelRecord]) -> None:
+        self._record = record
+        self.channels = channels
 
-    def __init__(self, data_dir: Optional[Path] = None) -> None:
+    def __getattr__(self, name: str):
+        return getattr(self._record, name)
+
+
+class MarketingMixService:
+    """Service responsible for loading and serving marketing-mix data sets.
+
+    The ``records`` backend answers :meth:`get_geo_series` and
+    :meth:`get_national_series` with one dataclass per row, materialised from
+    the frames the first time a series is requested. The opt-in ``columnar``
+    backend builds them per request from vectorized slices instead.
+
+    Both backends keep the columnar frames, which the routers read through
+    :class:`SeriesView` channel projections. The frames are loaded from a
+    binary snapshot of the columnar arrays (see
+    :mod:`services.marketing_mix_snapshot`) when it matches the CSV sources.
+    With ``mmap=True`` the columnar backend serves straight from read-only
+    memory maps of that snapshot, so multiple workers share one copy of the data.
+    ``refresh_snapshot=True`` ignores a matching snapshot, parses the CSVs and
+    replaces the snapshot with the result.
+
+    An instance is one immutable generation of the data: :meth:`reloaded`
+    returns a new instance rather than changing this one, and
+    :class:`MarketingMixDatasets` swaps generations in.
+    """
+
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        backend: Optional[str] = None,
+        use_snapshot: Optional[bool] = None,
+        snapshot_dir: Optional[Path] = None,
+        mmap: Optional[bool] = None,
+        refresh_snapshot: bool = False,
+    ) -> None:
         self._data_dir = data_dir or Path(__file__).resolve().parent.parent / "data"
-        self._geo_records: Dict[str, List[GeoRecord]] = {}
-        self._national_records: List[NationalRecord] = []
+        self._use_snapshot = SNAPSHOT_ENABLED if use_snapshot is None else use_snapshot
+        self._snapshot_dir = snapshot_dir or (
+            Path(SNAPSHOT_DIR) if SNAPSHOT_DIR else self._data_dir / ".snapshot"
+        )
+        self._backend = (backend or DEFAULT_BACKEND).lower()
+        if self._backend not in BACKENDS:
+            raise ValueError(f"Unknown marketing mix backend '{self._backend}'")
+        self._mmap = MMAP_ENABLED if mmap is None else mmap
+        if self._mmap and (self._backend != "columnar" or not self._use_snapshot):
+            raise ValueError("Memory-mapped data requires the columnar backend with snapshots enabled")
+        # Records backend only: full-history records per geo (``None`` = national)
+        # and their dates, materialised from the frames on first use.
+        self._records: Dict[Optional[str], Tuple[list, List[date]]] = {}
+        self._geo_frames: Dict[str, SeriesFrame] = {}
+        self._national_frame: Optional[SeriesFrame] = None
+        self._geo_metrics: Dict[str, DerivedMetrics] = {}
+        self._national_metrics: Optional[DerivedMetrics] = None
+        self._weekly_totals: Optional[WeeklyTotals] = None
         self._channel_totals: Dict[str, Dict[str, float]] = {}
         self._summary_cache: Dict[str, float] = {}
         self._insights: List[str] = []
-        self._load_all()
+        self._sources: Dict[str, dict] = {}
+        self._generation = 1
+        self._load_all(refresh_snapshot)
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def snapshot_dir(self) -> Path:
+        return self._snapshot_dir
+
+    @property
+    def memory_mapped(self) -> bool:
+        """Whether the loaded frames are views over the memory-mapped snapshot."""
+        frame = self._national_frame
+        return frame is not None and isinstance(frame.spend, np.memmap)
+
+    @property
+    def generation(self) -> int:
+        """Increments each time the data set is reloaded."""
+        return self._generation
+
     def list_geos(self) -> List[str]:
-        return list(self._geo_records.keys())
+        return list(self._geo_frames.keys())
 
     def geo_metadata(self) -> List[dict]:
-        metadata: List[dict] = []
-        for geo, records in self._geo_records.items():
-            if not records:
-                continue
-            metadata.append(
-                {
-                    "geo": geo,
-                    "start": records[0].time,
-                    "end": records[-1].time,
-                    "sample_size": len(records),
-                }
-            )
+        metadata = [
+            {
+                "geo": geo,
+                "start": frame.times[0].item(),
+                "end": frame.times[-1].item(),
+                "sample_size": len(frame),
+            }
+            for geo, frame in self._geo_frames.items()
+            if len(frame)
+        ]
         metadata.sort(key=lambda item: item["geo"])
         return metadata
 
@@ -91,29 +216,92 @@ class MarketingMixService:
         end: Optional[date] = None,
         channels: Optional[Iterable[str]] = None,
     ) -> List[GeoRecord]:
-        if geo not in self._geo_records:
+        if self._columnar:
+            frame = self.get_geo_frame(geo, start=start, end=end)
+            return self._frame_to_records(frame, channels, geo=geo)
+
+        frame = self._geo_frames.get(geo)
+        if frame is None:
             raise HTTPException(status_code=404, detail=f"Geo '{geo}' not found")
 
-        channel_filter = {c.lower() for c in channels} if channels else None
-        series = self._geo_records[geo]
+        records, times = self._record_index(frame, geo=geo)
+        window = records[self._date_window(times, start, end)]
+        if not channels:
+            return window
+        columns = self._channel_columns(channels)
+        return [self._filter_channels(record, columns) for record in window]
 
-        filtered: List[GeoRecord] = []
-        for record in series:
-            if start and record.time < start:
-                continue
-            if end and record.time > end:
-                continue
-            filtered.append(self._filter_channels(record, channel_filter))
-        return filtered
+    def get_geo_frame(
+        self,
+        geo: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> SeriesFrame:
+        """Return the columnar rows for ``geo`` within ``[start, end]``."""
+        frame = self._geo_frames.get(geo)
+        if frame is None:
+            raise HTTPException(status_code=404, detail=f"Geo '{geo}' not found")
+        return frame.take(self._frame_window(frame, start, end))
+
+    def get_geo_view(
+        self,
+        geo: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        channels: Optional[Iterable[str]] = None,
+    ) -> SeriesView:
+        """Return a channel projection of ``geo`` within ``[start, end]`` without copying rows."""
+        frame = self._geo_frames.get(geo)
+        if frame is None:
+            raise HTTPException(status_code=404, detail=f"Geo '{geo}' not found")
+        return self._view(frame, self._geo_metrics[geo], start, end, channels)
 
     def get_geo_bounds(self, geo: str) -> tuple[date, date]:
-        if geo not in self._geo_records or not self._geo_records[geo]:
+        frame = self._geo_frames.get(geo)
+        if frame is None or not len(frame):
             raise HTTPException(status_code=404, detail=f"Geo '{geo}' not found")
-        records = self._geo_records[geo]
-        return records[0].time, records[-1].time
+        return frame.times[0].item(), frame.times[-1].item()
 
     def get_geo_sample_size(self, geo: str) -> int:
-        return len(self._geo_records.get(geo, []))
+        frame = self._geo_frames.get(geo)
+        return len(frame) if frame is not None else 0
+
+    def resolve_geos(self, geos: Optional[Iterable[str]] = None) -> List[str]:
+        """Validate a geo selection (``None`` meaning every geo), de-duplicated in request order."""
+        if geos is None:
+            return self.list_geos()
+        selected = list(dict.fromkeys(geos))
+        if not selected:
+            raise HTTPException(status_code=400, detail="At least one geo is required")
+        missing = [geo for geo in selected if geo not in self._geo_frames]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Geo '{missing[0]}' not found")
+        return selected
+
+    def get_geo_aggregate_view(
+        self,
+        geos: Sequence[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        channels: Optional[Iterable[str]] = None,
+        aggregation: str = "sum",
+    ) -> SeriesView:
+        """Aggregate ``geos`` into a single series and window it to ``[start, end]``.
+
+        The full histories are combined before windowing so the first week's
+        ``lift_vs_prev`` still compares against the week before the window.
+        """
+        frames = [self.get_geo_frame(geo) for geo in geos]
+        try:
+            frame = aggregate_frames(frames, aggregation)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return self._view(frame, derive_metrics(frame), start, end, channels)
+
+    def get_geos_bounds(self, geos: Sequence[str]) -> tuple[date, date]:
+        """Earliest start and latest end across ``geos``."""
+        bounds = [self.get_geo_bounds(geo) for geo in geos]
+        return min(start for start, _ in bounds), max(end for _, end in bounds)
 
     def get_national_series(
         self,
@@ -121,28 +309,85 @@ class MarketingMixService:
         end: Optional[date] = None,
         channels: Optional[Iterable[str]] = None,
     ) -> List[NationalRecord]:
-        channel_filter = {c.lower() for c in channels} if channels else None
-        filtered: List[NationalRecord] = []
-        for record in self._national_records:
-            if start and record.time < start:
-                continue
-            if end and record.time > end:
-                continue
-            filtered.append(self._filter_channels(record, channel_filter))
-        return filtered
+        if self._columnar:
+            return self._frame_to_records(self.get_national_frame(start=start, end=end), channels)
+
+        if self._national_frame is None:
+            return []
+        records, times = self._record_index(self._national_frame)
+        window = records[self._date_window(times, start, end)]
+        if not channels:
+            return window
+        columns = self._channel_columns(channels)
+        return [self._filter_channels(record, columns) for record in window]
+
+    def get_national_frame(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> SeriesFrame:
+        """Return the columnar national rows within ``[start, end]``."""
+        if self._national_frame is None:
+            raise HTTPException(status_code=404, detail="No national data available")
+        return self._national_frame.take(self._frame_window(self._national_frame, start, end))
+
+    def get_national_view(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        channels: Optional[Iterable[str]] = None,
+    ) -> SeriesView:
+        """Return a channel projection of the national series within ``[start, end]``."""
+        if self._national_frame is None:
+            raise HTTPException(status_code=404, detail="No national data available")
+        return self._view(self._national_frame, self._national_metrics, start, end, channels)
 
     def get_national_bounds(self) -> tuple[date, date]:
-        if not self._national_records:
+        frame = self._national_frame
+        if frame is None or not len(frame):
             raise HTTPException(status_code=404, detail="No national data available")
-        return self._national_records[0].time, self._national_records[-1].time
+        return frame.times[0].item(), frame.times[-1].item()
 
-    def get_channel_totals(self) -> Dict[str, Dict[str, float]]:
-        return self._channel_totals
+    def get_channel_totals(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        weeks: Optional[int] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """Per-channel totals for all time, or for a window of national weeks.
+
+        ``weeks`` keeps only the trailing weeks of ``[start, end]``. Windows are
+        answered from the weekly prefix sums without scanning the history.
+        """
+        window = self._national_window(start, end, weeks)
+        if window is None:
+            return self._channel_totals
+        totals = self._weekly_totals.window(*window)
+        summary = self._window_summary(totals)
+        return _channel_metrics(
+            totals["spend"].tolist(),
+            totals["impressions"].tolist(),
+            totals["weeks"],
+            summary["total_conversions"],
+            summary["total_revenue"],
+        )
 
-    def get_summary_metrics(self) -> Dict[str, float]:
-        cache = dict(self._summary_cache)
-        cache["insights"] = list(self._insights)
-        return cache
+    def get_summary_metrics(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        weeks: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Headline metrics and insights for all time, or for a window (see :meth:`get_channel_totals`)."""
+        window = self._national_window(start, end, weeks)
+        if window is None:
+            cache = dict(self._summary_cache)
+            cache["insights"] = list(self._insights)
+            return cache
+        summary = self._window_summary(self._weekly_totals.window(*window))
+        channel_totals = self.get_channel_totals(start=start, end=end, weeks=weeks)
+        summary["insights"] = _insights_for(channel_totals, summary)
+        return summary
 
     def simulate_budget_shift(
         self, source_channel: str, target_channel: str, shift_ratio: float
@@ -185,243 +430,393 @@ class MarketingMixService:
 
         return totals
 
+    def simulate_budget_shifts(
+        self,
+        shifts: Sequence[Tuple[str, str, float]],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        weeks: Optional[int] = None,
+    ) -> ScenarioBatch:
+        """Evaluate many ``(source, target, ratio)`` shifts in one vectorized pass.
+
+        The baseline is all time, or the window selected by ``start``/``end``/``weeks``.
+        """
+        sources = self._channel_positions([shift[0] for shift in shifts])
+        targets = self._channel_positions([shift[1] for shift in shifts])
+        ratios = np.fromiter((shift[2] for shift in shifts), dtype=np.float64, count=len(shifts))
+        return self._run_scenarios(
+            lambda spend: shift_spend(spend, sources, targets, ratios), start, end, weeks
+        )
+
+    def simulate_reallocations(
+        self,
+        matrices: np.ndarray,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        weeks: Optional[int] = None,
+    ) -> ScenarioBatch:
+        """Evaluate ``(scenarios, channel, channel)`` reallocation matrices at once."""
+        return self._run_scenarios(lambda spend: reallocate_spend(spend, matrices), start, end, weeks)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _load_all(self) -> None:
-        self._load_geo_data()
-        self._load_national_data()
+    def _run_scenarios(self, build_spend, start, end, weeks) -> ScenarioBatch:
+        totals = self.get_channel_totals(start=start, end=end, weeks=weeks)
+        summary = self.get_summary_metrics(start=start, end=end, weeks=weeks)
+        base_spend = np.array([totals[cid]["spend"] for cid in CHANNEL_NAMES], dtype=np.float64)
+        try:
+            spend = build_spend(base_spend)
+        except ScenarioError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return project(spend, summary["total_conversions"], summary["total_revenue"])
+
+    def _channel_positions(self, channels: Sequence[str]) -> np.ndarray:
+        try:
+            return np.fromiter(
+                (CHANNEL_INDEX[channel] for channel in channels), dtype=np.intp, count=len(channels)
+            )
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail="Unknown channel supplied") from exc
+
+    @property
+    def _columnar(self) -> bool:
+        return self._backend == "columnar"
+
+    def _load_all(self, refresh_snapshot: bool = False) -> None:
+        self._load_frames(refresh_snapshot)
+        self._compute_derived_metrics()
+        self._compute_aggregates()
+
+    def _compute_aggregates(self) -> None:
         self._compute_summary()
         self._compute_channel_totals()
         self._build_insights()
 
-    def _load_geo_data(self) -> None:
-        geo_path = self._data_dir / DATA_FILENAMES["geo"]
-        if not geo_path.exists():
-            raise RuntimeError(f"Geo data file missing: {geo_path}")
-
-        by_geo: Dict[str, List[GeoRecord]] = defaultdict(list)
-        with geo_path.open("r", newline="") as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                geo = row.get("geo") or row.get("Geo")
-                if not geo:
-                    continue
-
-                record = GeoRecord(
-                    geo=geo,
-                    time=self._parse_date(row.get("time")),
-                    conversions=self._parse_float(row.get("conversions")),
-                    revenue_per_conversion=self._parse_float(row.get("revenue_per_conversion")),
-                    competitor_sales_control=self._parse_float(
-                        row.get("competitor_sales_control")
-                    ),
-                    sentiment_score_control=self._parse_float(
-                        row.get("sentiment_score_control")
-                    ),
-                    promo=self._parse_float(row.get("Promo")),
-                    population=self._parse_float(row.get("population")),
-                    channels=self._build_channels(row),
-                )
-                by_geo[geo].append(record)
-
-        for geo, records in by_geo.items():
-            records.sort(key=lambda r: r.time)
-        self._geo_records = dict(by_geo)
-
-    def _load_national_data(self) -> None:
-        nat_path = self._data_dir / DATA_FILENAMES["national"]
-        if not nat_path.exists():
-            raise RuntimeError(f"National data file missing: {nat_path}")
-
-        records: List[NationalRecord] = []
-        with nat_path.open("r", newline="") as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                record = NationalRecord(
-                    time=self._parse_date(row.get("time")),
-                    conversions=self._parse_float(row.get("conversions")),
-                    revenue_per_conversion=self._parse_float(row.get("revenue_per_conversion")),
-                    competitor_sales_control=self._parse_float(
-                        row.get("competitor_sales_control")
-                    ),
-                    sentiment_score_control=self._parse_float(
-                        row.get("sentiment_score_control")
-                    ),
-                    promo=self._parse_float(row.get("Promo")),
-                    channels=self._build_channels(row),
-                )
-                records.append(record)
-        records.sort(key=lambda r: r.time)
-        self._national_records = records
-
-    def _build_channels(self, row: Dict[str, str]) -> List[ChannelRecord]:
-        channels: List[ChannelRecord] = []
-        organics = {
-            "channel0": self._parse_float(row.get("Organic_channel0_impression")),
-        }
-        for idx in range(CHANNEL_COUNT):
-            channel_id = f"channel{idx}"
-            spend_key = f"Channel{idx}_spend"
-            impression_key = f"Channel{idx}_impression"
-            record = ChannelRecord(
-                id=channel_id,
-                spend=self._parse_float(row.get(spend_key)) or 0.0,
-                impressions=self._parse_float(row.get(impression_key)) or 0.0,
-                organic_impressions=organics.get(channel_id),
+    def _source_paths(self) -> Dict[str, Path]:
+        sources = {kind: self._data_dir / filename for kind, filename in DATA_FILENAMES.items()}
+        for kind, path in sources.items():
+            if not path.exists():
+                raise RuntimeError(f"{kind.title()} data file missing: {path}")
+        return sources
+
+    def _load_frames(self, refresh_snapshot: bool = False) -> None:
+        sources = self._source_paths()
+
+        if self._use_snapshot and not refresh_snapshot:
+            snapshot = load_snapshot(self._snapshot_dir, sources, CHANNEL_COUNT, mmap=self._mmap)
+            if snapshot is not None:
+                self._geo_frames, self._national_frame, self._sources = snapshot
+                return
+
+        self._sources = {kind: fingerprint(path) for kind, path in sources.items()}
+        self._geo_frames = build_geo_frames(read_csv_columns(sources["geo"]), CHANNEL_COUNT)
+        self._national_frame = build_frame(read_csv_columns(sources["national"]), CHANNEL_COUNT)
+        self._publish_snapshot(sources, replace=refresh_snapshot)
+
+    def _publish_snapshot(self, sources: Dict[str, Path], replace: bool = False) -> None:
+        if not self._use_snapshot:
+            return
+        try:
+            write_snapshot(
+                self._snapshot_dir,
+                sources,
+                CHANNEL_COUNT,
+                self._geo_frames,
+                self._national_frame,
+                fingerprints=self._sources,
+                replace=replace,
             )
-            channels.append(record)
-        return channels
+        except OSError as exc:
+            logger.warning("Could not write marketing mix snapshot: %s", exc)
+            return
+        if self._mmap:
+            # Re-open what we just wrote so this worker shares pages with the others.
+            snapshot = load_snapshot(self._snapshot_dir, sources, CHANNEL_COUNT, mmap=True)
+            if snapshot is not None:
+                self._geo_frames, self._national_frame, self._sources = snapshot
 
-    def _filter_channels(self, record, channel_filter: Optional[Iterable[str]]):
-        if not channel_filter:
-            return record
-        allowed = {self._normalise_channel_id(c) for c in channel_filter}
-        channels = [c for c in record.channels if c.id in allowed]
-        if isinstance(record, GeoRecord):
-            return GeoRecord(
-                geo=record.geo,
-                time=record.time,
-                conversions=record.conversions,
-                revenue_per_conversion=record.revenue_per_conversion,
-                competitor_sales_control=record.competitor_sales_control,
-                sentiment_score_control=record.sentiment_score_control,
-                promo=record.promo,
-                population=record.population,
-                channels=channels,
+    # ------------------------------------------------------------------
+    # Reloading
+    # ------------------------------------------------------------------
+    def reloaded(self, force: bool = False) -> Tuple["MarketingMixService", str]:
+        """Return a generation matching the data files on disk, and how it was built.
+
+        ``self`` is never modified. If the files are unchanged this returns
+        ``self`` with ``"unchanged"``. If rows were only appended to the files,
+        just the new tail is parsed and a copy of this generation is extended
+        (``"appended"``). Otherwise the data is loaded from scratch
+        (``"rebuilt"``). ``force`` always re-parses the CSVs and replaces the
+        snapshot, which also recovers from a damaged one.
+        """
+        sources = self._source_paths()
+        if not force:
+            changes = self._source_changes(sources)
+            if not changes:
+                return self, "unchanged"
+            if set(changes.values()) == {"appended"}:
+                appended = self._appended(sources, list(changes))
+                if appended is not None:
+                    return appended, "appended"
+
+        rebuilt = MarketingMixService(
+            data_dir=self._data_dir,
+            backend=self._backend,
+            use_snapshot=self._use_snapshot,
+            snapshot_dir=self._snapshot_dir,
+            mmap=self._mmap,
+            refresh_snapshot=force,
+        )
+        rebuilt._generation = self._generation + 1
+        return rebuilt, "rebuilt"
+
+    def _source_changes(self, sources: Dict[str, Path]) -> Dict[str, str]:
+        """Classify each changed source as ``"appended"`` or ``"rewritten"``."""
+        changes: Dict[str, str] = {}
+        for kind, path in sources.items():
+            recorded = self._sources.get(kind)
+            if recorded is None:
+                changes[kind] = "rewritten"
+                continue
+            stat = path.stat()
+            if stat.st_size == recorded["size"] and (
+                stat.st_mtime_ns == recorded["mtime_ns"]
+                or _prefix_sha256(path, stat.st_size) == recorded["sha256"]
+            ):
+                continue
+            changes[kind] = "appended" if _is_append(path, stat.st_size, recorded) else "rewritten"
+        return changes
+
+    def _appended(
+        self, sources: Dict[str, Path], kinds: Sequence[str]
+    ) -> Optional["MarketingMixService"]:
+        """Extend a copy of this generation with rows appended to ``kinds``.
+
+        Returns ``None`` when the new rows do not strictly follow the loaded
+        weeks of their series, in which case the caller rebuilds.
+        """
+        fingerprints = dict(self._sources)
+        tails: Dict[str, Dict[str, SeriesFrame]] = {"geo": {}, "national": {}}
+        for kind in kinds:
+            fingerprints[kind] = fingerprint(sources[kind])
+            columns = read_csv_columns(sources[kind], offset=self._sources[kind]["size"])
+            if kind == "geo":
+                tails["geo"] = build_geo_frames(columns, CHANNEL_COUNT)
+            else:
+                tails["national"] = {"national": build_frame(columns, CHANNEL_COUNT)}
+        geo_tails = tails["geo"]
+        national_tail = tails["national"].get("national")
+
+        heads = [(self._geo_frames.get(geo), tail) for geo, tail in geo_tails.items()]
+        heads.append((self._national_frame, national_tail))
+        if not all(_follows(head, tail) for head, tail in heads):
+            logger.info("Appended marketing mix rows overlap loaded weeks; rebuilding instead")
+            return None
+
+        updated = copy.copy(self)
+        updated._generation = self._generation + 1
+        updated._sources = fingerprints
+        updated._geo_frames = dict(self._geo_frames)
+        updated._geo_metrics = dict(self._geo_metrics)
+        for geo, tail in geo_tails.items():
+            head = self._geo_frames.get(geo)
+            if head is None:
+                updated._geo_frames[geo] = tail
+                updated._geo_metrics[geo] = derive_metrics(tail)
+            else:
+                updated._geo_frames[geo] = concat_frames(head, tail)
+                updated._geo_metrics[geo] = extend_metrics(
+                    self._geo_metrics[geo], updated._geo_frames[geo]
+                )
+        if national_tail is not None:
+            updated._national_frame = concat_frames(self._national_frame, national_tail)
+            updated._national_metrics = extend_metrics(
+                self._national_metrics, updated._national_frame
             )
-        return NationalRecord(
-            time=record.time,
-            conversions=record.conversions,
-            revenue_per_conversion=record.revenue_per_conversion,
-            competitor_sales_control=record.competitor_sales_control,
-            sentiment_score_control=record.sentiment_score_control,
-            promo=record.promo,
-            channels=channels,
+            updated._weekly_totals = self._weekly_totals.extend(updated._national_frame)
+
+        # Records are rebuilt from the extended frames on first use.
+        updated._records = {}
+
+        updated._compute_aggregates()
+        updated._publish_snapshot(sources)
+        return updated
+
+    @staticmethod
+    def _frame_window(frame: SeriesFrame, start: Optional[date], end: Optional[date]) -> slice:
+        """Binary-search the sorted times; slicing with the result yields zero-copy views."""
+        lo = int(np.searchsorted(frame.times, np.datetime64(start, "D"), "left")) if start else 0
+        hi = (
+            int(np.searchsorted(frame.times, np.datetime64(end, "D"), "right"))
+            if end
+            else len(frame)
         )
+        return slice(lo, max(lo, hi))
 
-    def _compute_channel_totals(self) -> None:
-        totals: Dict[str, Dict[str, float]] = {
-            cid: {"spend": 0.0, "impressions": 0.0, "name": CHANNEL_NAMES[cid]}
-            for cid in CHANNEL_NAMES
-        }
-        for record in self._national_records:
-            for channel in record.channels:
-                metrics = totals[channel.id]
-                metrics["spend"] += channel.spend
-                metrics["impressions"] += channel.impressions
-
-        total_spend = sum(val["spend"] for val in totals.values()) or 1.0
-        weeks = max(len(self._national_records), 1)
-        total_conversions = self._summary_cache.get("total_conversions", 0.0)
-        total_revenue = self._summary_cache.get("total_revenue", 0.0)
+    @staticmethod
+    def _date_window(times: Sequence[date], start: Optional[date], end: Optional[date]) -> slice:
+        lo = bisect_left(times, start) if start else 0
+        hi = bisect_right(times, end) if end else len(times)
+        return slice(lo, max(lo, hi))
+
+    def _channel_columns(self, channels: Optional[Iterable[str]]) -> Tuple[int, ...]:
+        if not channels:
+            return tuple(range(CHANNEL_COUNT))
+        allowed = {CHANNEL_INDEX.get(self._normalise_channel_id(c)) for c in channels}
+        return tuple(idx for idx in range(CHANNEL_COUNT) if idx in allowed)
+
+    def _view(
+        self,
+        frame: SeriesFrame,
+        metrics: DerivedMetrics,
+        start: Optional[date],
+        end: Optional[date],
+        channels: Optional[Iterable[str]],
+    ) -> SeriesView:
+        window = self._frame_window(frame, start, end)
+        columns = self._channel_columns(channels)
+        channel_ids = list(CHANNEL_NAMES)
+        return SeriesView(
+            frame.take(window), metrics.take(window), columns, [channel_ids[idx] for idx in columns]
+        )
 
-        for channel_id, metrics in totals.items():
-            metrics["spend_share"] = metrics["spend"] / total_spend
-            metrics["average_weekly_spend"] = metrics["spend"] / weeks
-            metrics["estimated_conversions"] = total_conversions * metrics["spend_share"]
-            metrics["estimated_revenue"] = total_revenue * metrics["spend_share"]
-            metrics["roas"] = (
-                metrics["estimated_revenue"] / metrics["spend"]
-                if metrics["spend"]
-                else 0.0
-            )
-            metrics["cac"] = (
-                metrics["spend"] / metrics["estimated_conversions"]
-                if metrics["estimated_conversions"]
-                else None
-            )
-        self._channel_totals = totals
+    def _record_index(
+        self, frame: SeriesFrame, geo: Optional[str] = None
+    ) -> Tuple[list, List[date]]:
+        """Full-history records of ``frame`` and their dates, built on first use and kept."""
+        cached = self._records.get(geo)
+        if cached is None:
+            records = self._frame_to_records(frame, geo=geo)
+            # Records are time-sorted, so the parallel date list is a bisect index.
+            cached = self._records[geo] = (records, [record.time for record in records])
+        return cached
+
+    def _frame_to_records(
+        self,
+        frame: SeriesFrame,
+        channels: Optional[Iterable[str]] = None,
+        geo: Optional[str] = None,
+    ) -> list:
+        """Materialise dataclass records from a (sliced) frame for legacy callers."""
+        columns = self._channel_columns(channels)
+        channel_ids = list(CHANNEL_NAMES)
+        times = frame.times.tolist()
+        conversions = optional_floats(frame.conversions)
+        revenue = optional_floats(frame.revenue_per_conversion)
+        competitor = optional_floats(frame.competitor_sales_control)
+        sentiment = optional_floats(frame.sentiment_score_control)
+        promo = optional_floats(frame.promo)
+        population = (
+            optional_floats(frame.population)
+            if frame.population is not None
+            else [None] * len(frame)
+        )
+        spend = frame.spend[:, columns].tolist()
+        impressions = frame.impressions[:, columns].tolist()
+        organic = [optional_floats(row) for row in frame.organic_impressions[:, columns]]
+
+        records: list = []
+        for row in range(len(frame)):
+            row_channels = [
+                ChannelRecord(
+                    id=channel_ids[col],
+                    spend=spend[row][pos],
+                    impressions=impressions[row][pos],
+                    organic_impressions=organic[row][pos],
+                )
+                for pos, col in enumerate(columns)
+            ]
+            if geo is not None:
+                records.append(
+                    GeoRecord(
+                        geo=geo,
+                        time=times[row],
+                        conversions=conversions[row],
+                        revenue_per_conversion=revenue[row],
+                        competitor_sales_control=competitor[row],
+                        sentiment_score_control=sentiment[row],
+                        promo=promo[row],
+                        population=population[row],
+                        channels=row_channels,
+                    )
+                )
+            else:
+                records.append(
+                    NationalRecord(
+                        time=times[row],
+                        conversions=conversions[row],
+                        revenue_per_conversion=revenue[row],
+                        competitor_sales_control=competitor[row],
+                        sentiment_score_control=sentiment[row],
+                        promo=promo[row],
+                        channels=row_channels,
+                    )
+                )
+        return records
 
-    def _compute_summary(self) -> None:
-        total_spend = 0.0
-        total_conversions = 0.0
-        total_revenue = 0.0
-        total_promo_weeks = 0
-        previous_conversions: Optional[float] = None
-        previous_spend: Optional[float] = None
-        recent_conversion_lift: float = 0.0
-        recent_spend_lift: float = 0.0
-
-        for record in self._national_records:
-            week_spend = sum(channel.spend for channel in record.channels)
-            total_spend += week_spend
-            if record.conversions:
-                total_conversions += record.conversions
-                if record.revenue_per_conversion:
-                    total_revenue += record.conversions * record.revenue_per_conversion
-            if record.promo and record.promo > 0:
-                total_promo_weeks += 1
-
-            if (
-                record.conversions is not None
-                and previous_conversions not in (None, 0)
-            ):
-                recent_conversion_lift = (
-                    record.conversions - previous_conversions
-                ) / previous_conversions
-            previous_conversions = record.conversions or previous_conversions
+    def _filter_channels(self, record, columns: Sequence[int]):
+        if len(columns) == len(record.channels):
+            return record
+        return ProjectedRecord(record, [record.channels[idx] for idx in columns])
 
-            if previous_spend not in (None, 0):
-                recent_spend_lift = (week_spend - previous_spend) / previous_spend
-            previous_spend = week_spend or previous_spend
+    def _compute_derived_metrics(self) -> None:
+        self._geo_metrics = {geo: derive_metrics(frame) for geo, frame in self._geo_frames.items()}
+        self._national_metrics = (
+            derive_metrics(self._national_frame) if self._national_frame is not None else None
+        )
+        self._weekly_totals = (
+            weekly_totals(self._national_frame) if self._national_frame is not None else None
+        )
 
-        roas = total_revenue / total_spend if total_spend else 0.0
-        avg_cac = (total_spend / total_conversions) if total_conversions else 0.0
-        promo_ratio = total_promo_weeks / max(len(self._national_records), 1)
+    def _national_window(
+        self, start: Optional[date], end: Optional[date], weeks: Optional[int]
+    ) -> Optional[Tuple[int, int]]:
+        """Row range ``[lo, hi)`` of the national weeks selected, or ``None`` for all time."""
+        if start is None and end is None and weeks is None:
+            return None
+        if self._national_frame is None or self._weekly_totals is None:
+            raise HTTPException(status_code=404, detail="No national data available")
+        window = self._frame_window(self._national_frame, start, end)
+        lo, hi = window.start, window.stop
+        if weeks is not None:
+            lo = max(lo, hi - weeks)
+        return lo, hi
 
-        self._summary_cache = {
+    @staticmethod
+    def _window_summary(totals: dict) -> Dict[str, float]:
+        weeks = totals["weeks"]
+        total_spend = float(totals["spend"].sum())
+        total_conversions = totals["conversions"]
+        total_revenue = totals["revenue"]
+        return {
             "total_spend": total_spend,
             "total_conversions": total_conversions,
             "total_revenue": total_revenue,
-            "roas": roas,
-            "cac": avg_cac,
-            "promo_rate": promo_ratio,
-            "recent_conversion_lift": recent_conversion_lift,
-            "recent_spend_lift": recent_spend_lift,
+            "roas": total_revenue / total_spend if total_spend else 0.0,
+            "cac": (total_spend / total_conversions) if total_conversions else 0.0,
+            "promo_rate": totals["promo_weeks"] / weeks if weeks else 0.0,
+            "recent_conversion_lift": totals["recent_conversion_lift"],
+            "recent_spend_lift": totals["recent_spend_lift"],
         }
 
-    def _build_insights(self) -> None:
-        if not self._channel_totals:
-            self._insights = []
-            return
-
-        top_channel_id, top_metrics = max(
-            self._channel_totals.items(), key=lambda item: item[1]["spend_share"]
-        )
-        fastest_roi_id, fastest_roi_metrics = max(
-            self._channel_totals.items(), key=lambda item: item[1]["roas"]
+    def _compute_channel_totals(self) -> None:
+        totals = self._weekly_totals.window(0, len(self._weekly_totals))
+        self._channel_totals = _channel_metrics(
+            totals["spend"].tolist(),
+            totals["impressions"].tolist(),
+            totals["weeks"],
+            self._summary_cache.get("total_conversions", 0.0),
+            self._summary_cache.get("total_revenue", 0.0),
         )
 
-        conversion_lift = self._summary_cache.get("recent_conversion_lift", 0.0)
-        conversion_phrase = (
-            f"Conversions increased {conversion_lift:.1%} WoW"
-            if conversion_lift >= 0
-            else f"Conversions decreased {abs(conversion_lift):.1%} WoW"
-        )
+    def _compute_summary(self) -> None:
+        totals = self._weekly_totals.window(0, len(self._weekly_totals))
+        self._summary_cache = self._window_summary(totals)
 
-        self._insights = [
-            f"{top_metrics['name']} represents {top_metrics['spend_share']:.0%} of media spend.",
-            f"{fastest_roi_metrics['name']} currently delivers ROAS {fastest_roi_metrics['roas']:.2f}×.",
-            conversion_phrase,
-        ]
+    def _build_insights(self) -> None:
+        self._insights = _insights_for(self._channel_totals, self._summary_cache)
 
     # ------------------------------------------------------------------
-    @staticmethod
-    def _parse_float(raw: Optional[str]) -> Optional[float]:
-        if raw is None or raw == "":
-            return None
-        try:
-            return float(raw)
-        except ValueError:
-            return None
-
-    @staticmethod
-    def _parse_date(raw: Optional[str]) -> date:
-        if not raw:
-            raise ValueError("Missing date value in marketing mix dataset")
-        return date.fromisoformat(raw)
-
     @staticmethod
     def _normalise_channel_id(channel: str) -> str:
         channel = channel.lower().strip()
@@ -434,8 +829,177 @@ class MarketingMixService:
         raise ValueError(f"Unknown channel identifier '{channel}'")
 
 
-marketing_mix_service = MarketingMixService()
+def _channel_metrics(
+    spend: Sequence[float],
+    impressions: Sequence[float],
+    weeks: int,
+    total_conversions: float,
+    total_revenue: float,
+) -> Dict[str, Dict[str, float]]:
+    """Per-channel totals, shares and spend-share attributed conversions, revenue, ROAS and CAC."""
+    totals: Dict[str, Dict[str, float]] = {
+        cid: {"spend": spend[idx], "impressions": impressions[idx], "name": CHANNEL_NAMES[cid]}
+        for idx, cid in enumerate(CHANNEL_NAMES)
+    }
+    total_spend = sum(val["spend"] for val in totals.values()) or 1.0
+    weeks = max(weeks, 1)
+
+    for metrics in totals.values():
+        metrics["spend_share"] = metrics["spend"] / total_spend
+        metrics["average_weekly_spend"] = metrics["spend"] / weeks
+        metrics["estimated_conversions"] = total_conversions * metrics["spend_share"]
+        metrics["estimated_revenue"] = total_revenue * metrics["spend_share"]
+        metrics["roas"] = (
+            metrics["estimated_revenue"] / metrics["spend"]
+            if metrics["spend"]
+            else 0.0
+        )
+        metrics["cac"] = (
+            metrics["spend"] / metrics["estimated_conversions"]
+            if metrics["estimated_conversions"]
+            else None
+        )
+    return totals
+
+
+def _insights_for(
+    channel_totals: Dict[str, Dict[str, float]], summary: Dict[str, float]
+) -> List[str]:
+    if not channel_totals:
+        return []
+
+    top_channel_id, top_metrics = max(
+        channel_totals.items(), key=lambda item: item[1]["spend_share"]
+    )
+    fastest_roi_id, fastest_roi_metrics = max(
+        channel_totals.items(), key=lambda item: item[1]["roas"]
+    )
+
+    conversion_lift = summary.get("recent_conversion_lift", 0.0)
+    conversion_phrase = (
+        f"Conversions increased {conversion_lift:.1%} WoW"
+        if conversion_lift >= 0
+        else f"Conversions decreased {abs(conversion_lift):.1%} WoW"
+    )
+
+    return [
+        f"{top_metrics['name']} represents {top_metrics['spend_share']:.0%} of media spend.",
+        f"{fastest_roi_metrics['name']} currently delivers ROAS {fastest_roi_metrics['roas']:.2f}×.",
+        conversion_phrase,
+    ]
+
+
+def _is_append(path: Path, size: int, recorded: dict) -> bool:
+    """Whether ``path`` is the recorded file with whole lines added at the end."""
+    if size <= recorded["size"] or recorded["size"] == 0:
+        return False
+    with path.open("rb") as fh:
+        fh.seek(recorded["size"] - 1)
+        boundary = fh.read(2)
+    # The old content must end on a line break, or the appended text must start with one.
+    if boundary[:1] != b"\n" and boundary[1:] not in (b"\n", b"\r"):
+        return False
+    return _prefix_sha256(path, recorded["size"]) == recorded["sha256"]
+
+
+def _prefix_sha256(path: Path, size: int) -> str:
+    """SHA-256 of the first ``size`` bytes of ``path``."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        while size > 0:
+            chunk = fh.read(min(size, 1 << 20))
+            if not chunk:
+                break
+            digest.update(chunk)
+            size -= len(chunk)
+    return digest.hexdigest()
+
+
+def _follows(head: Optional[SeriesFrame], tail: Optional[SeriesFrame]) -> bool:
+    """Whether every week in ``tail`` comes after the last week of ``head``."""
+    if head is None or tail is None or not len(head) or not len(tail):
+        return True
+    return bool(tail.times[0] > head.times[-1])
+
+
+class MarketingMixDatasets:
+    """Holds the current :class:`MarketingMixService` generation and swaps in new ones.
+
+    Generations are never modified once built. Requests resolve
+    :attr:`current` once through the FastAPI dependency, so a request that
+    started before a swap finishes on the generation it began with. Reloads
+    are serialised and run on the admin request's worker thread or on the
+    watcher thread, never on the readers' path. Forced rebuilds are limited
+    to one per ``force_interval`` seconds; requests in between, including
+    ones that queued behind a rebuild, fall back to the cheap change check.
+
+    Each web worker process holds its own instance, so a reload only affects
+    the process that runs it. Deployments with several workers should rely
+    on the file watcher, which runs in every process.
+    """
+
+    def __init__(
+        self, service: MarketingMixService, force_interval: float = FORCE_RELOAD_INTERVAL
+    ) -> None:
+        self._current = service
+        self._force_interval = force_interval
+        self._last_forced = float("-inf")
+        self._reload_lock = Lock()
+        self._stop = Event()
+        self._watcher: Optional[Thread] = None
+
+    @property
+    def current(self) -> MarketingMixService:
+        return self._current
+
+    def reload(self, force: bool = False) -> dict:
+        """Bring the data up to date with the files on disk and report what happened."""
+        with self._reload_lock:
+            started = perf_counter()
+            if force and started - self._last_forced < self._force_interval:
+                force = False
+            previous = self._current
+            service, status = previous.reloaded(force=force)
+            self._current = service
+            if force:
+                self._last_forced = started
+            duration_ms = (perf_counter() - started) * 1000
+        if status != "unchanged":
+            logger.info(
+                "Marketing mix data %s: generation %d -> %d in %.0f ms",
+                status,
+                previous.generation,
+                service.generation,
+                duration_ms,
+            )
+        return {"status": status, "generation": service.generation, "duration_ms": duration_ms}
+
+    def start_watcher(self, interval: float) -> None:
+        """Poll the data files every ``interval`` seconds in a daemon thread."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = Thread(
+            target=self._watch, args=(interval,), name="marketing-mix-reload", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception:  # keep serving the current generation
+                logger.exception("Marketing mix reload failed")
+
+
+marketing_mix_datasets = MarketingMixDatasets(MarketingMixService())
 
 
 def get_marketing_mix_service() -> MarketingMixService:
-    return marketing_mix_service
+    return marketing_mix_datasets.current
@@ -0,0 +1,247 @@
+"""Binary snapshots of the columnar marketing-mix data sets.
+
+A snapshot is a directory of ``.npy`` files (one per column, with every geo
+concatenated geo-major) next to a ``manifest.json`` that records the source
+CSV fingerprints and the per-geo row offsets. Loading a fresh snapshot skips
+CSV parsing entirely; stale snapshots are rebuilt and swapped in atomically.
+
+Snapshots can also be opened as read-only memory maps, in which case every
+worker process on a machine shares the same page-cache pages and only the
+manifest index lives on each worker's heap.
+
+A snapshot the manifest no longer points at is kept for ``PRUNE_GRACE_SECONDS``
+after it was replaced, because another worker may have read the previous
+manifest and still be about to open that directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.file_utils import file_sha256, fingerprint, write_json_atomic
+from services.marketing_mix_columnar import SeriesFrame
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# Seconds a replaced snapshot survives before a later publish deletes it.
+PRUNE_GRACE_SECONDS = float(os.getenv("MARKETING_MIX_SNAPSHOT_GRACE", "300"))
+FRAME_FIELDS = tuple(field.name for field in fields(SeriesFrame))
+
+# Geo frames, national frame, and the source fingerprints they were built from.
+Snapshot = Tuple[Dict[str, SeriesFrame], SeriesFrame, dict]
+
+
+def load_snapshot(
+    cache_dir: Path,
+    sources: Dict[str, Path],
+    channel_count: int,
+    mmap: bool = False,
+) -> Optional[Snapshot]:
+    """Return the snapshot frames when the snapshot matches ``sources``, else ``None``.
+
+    The fingerprints returned with the frames come from the same manifest read
+    that selected them, so they always describe those frames even if another
+    writer publishes a new manifest meanwhile. With ``mmap=True`` the frames
+    are read-only views over memory-mapped files.
+    """
+    manifest = _read_manifest(cache_dir)
+    if manifest is None or manifest.get("channel_count") != channel_count:
+        return None
+    fingerprints = _current_fingerprints(manifest.get("sources", {}), sources)
+    if fingerprints is None:
+        return None
+    if fingerprints != manifest["sources"]:
+        # Contents unchanged but mtimes moved: record them so the next start skips hashing.
+        manifest["sources"] = fingerprints
+        try:
+            write_json_atomic(cache_dir / MANIFEST_NAME, manifest)
+        except OSError:
+            pass
+
+    snapshot_dir = cache_dir / manifest["snapshot"]
+    try:
+        arrays = {
+            name: np.load(snapshot_dir / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in manifest["arrays"]
+        }
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable marketing mix snapshot %s: %s", snapshot_dir, exc)
+        return None
+
+    geo_frames = _unpack_frames("geo", arrays, manifest["geos"], manifest["geo_offsets"])
+    national = _unpack_frames("national", arrays, ["national"], [0, manifest["national_rows"]])
+    return geo_frames, national["national"], fingerprints
+
+
+def write_snapshot(
+    cache_dir: Path,
+    sources: Dict[str, Path],
+    channel_count: int,
+    geo_frames: Dict[str, SeriesFrame],
+    national_frame: SeriesFrame,
+    fingerprints: Optional[dict] = None,
+    replace: bool = False,
+) -> Path:
+    """Persist the frames as a new snapshot and atomically point the manifest at it.
+
+    ``fingerprints`` are the source fingerprints the frames were built from;
+    they are computed from ``sources`` when omitted. An existing snapshot of
+    the same sources is reused unless ``replace`` is set.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if fingerprints is None:
+        fingerprints = {kind: fingerprint(path) for kind, path in sources.items()}
+    content = {kind: entry["sha256"] for kind, entry in fingerprints.items()}
+    digest = hashlib.sha256(
+        json.dumps([SNAPSHOT_VERSION, channel_count, content], sort_keys=True).encode()
+    ).hexdigest()
+    snapshot_name = f"snapshot-{digest[:16]}"
+
+    geos = list(geo_frames)
+    arrays = _pack_frames("geo", [geo_frames[geo] for geo in geos])
+    arrays.update(_pack_frames("national", [national_frame]))
+    offsets = np.cumsum([0] + [len(geo_frames[geo]) for geo in geos]).tolist()
+
+    final_dir = cache_dir / snapshot_name
+    if replace or not final_dir.exists():
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir))
+        try:
+            for name, array in arrays.items():
+                np.save(tmp_dir / f"{name}.npy", array, allow_pickle=False)
+            if replace and final_dir.exists():
+                _discard_dir(final_dir)
+            os.rename(tmp_dir, final_dir)
+        except OSError:
+            # Another process may have published the same snapshot first.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not final_dir.exists():
+                raise
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "channel_count": channel_count,
+        "snapshot": snapshot_name,
+        "sources": fingerprints,
+        "arrays": sorted(arrays),
+        "geos": geos,
+        "geo_offsets": offsets,
+        "national_rows": len(national_frame),
+    }
+    previous = _read_manifest(cache_dir)
+    write_json_atomic(cache_dir / MANIFEST_NAME, manifest)
+    if previous is not None and previous.get("snapshot") != snapshot_name:
+        # Start the replaced snapshot's grace period now, not when it was written.
+        try:
+            os.utime(cache_dir / previous["snapshot"])
+        except OSError:
+            pass
+    _prune_snapshots(cache_dir, keep=snapshot_name)
+    return final_dir
+
+
+# ----------------------------------------------------------------------
+# Internal helpers
+# ----------------------------------------------------------------------
+def _pack_frames(prefix: str, frames: List[SeriesFrame]) -> Dict[str, np.ndarray]:
+    arrays: Dict[str, np.ndarray] = {}
+    for name in FRAME_FIELDS:
+        columns = [getattr(frame, name) for frame in frames]
+        if any(column is None for column in columns):
+            continue
+        arrays[f"{prefix}.{name}"] = np.ascontiguousarray(np.concatenate(columns))
+    return arrays
+
+
+def _unpack_frames(
+    prefix: str,
+    arrays: Dict[str, np.ndarray],
+    names: List[str],
+    offsets: List[int],
+) -> Dict[str, SeriesFrame]:
+    frames: Dict[str, SeriesFrame] = {}
+    for idx, name in enumerate(names):
+        rows = slice(offsets[idx], offsets[idx + 1])
+        frames[name] = SeriesFrame(
+            **{
+                field: arrays[key][rows] if (key := f"{prefix}.{field}") in arrays else None
+                for field in FRAME_FIELDS
+            }
+        )
+    return frames
+
+
+def _read_manifest(cache_dir: Path) -> Optional[dict]:
+    try:
+        with (cache_dir / MANIFEST_NAME).open("r") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == SNAPSHOT_VERSION else None
+
+
+def _current_fingerprints(recorded: dict, sources: Dict[str, Path]) -> Optional[dict]:
+    """Return up-to-date fingerprints if every source still matches ``recorded``."""
+    if set(recorded) != set(sources):
+        return None
+    current = {}
+    for kind, path in sources.items():
+        expected = recorded[kind]
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if stat.st_size != expected["size"]:
+            return None
+        # A matching mtime is trusted; otherwise fall back to the content hash so
+        # that a touched-but-unchanged file (e.g. a fresh checkout) stays fresh.
+        if stat.st_mtime_ns != expected["mtime_ns"] and file_sha256(path) != expected["sha256"]:
+            return None
+        current[kind] = {**expected, "mtime_ns": stat.st_mtime_ns}
+    return current
+
+
+def _discard_dir(path: Path) -> None:
+    """Move ``path`` aside, then delete it; files already open stay readable."""
+    stale = Path(tempfile.mkdtemp(prefix=".stale-", dir=path.parent))
+    os.rename(path, stale / path.name)
+    shutil.rmtree(stale, ignore_errors=True)
+
+
+def _prune_snapshots(cache_dir: Path, keep: str) -> None:
+    """Delete snapshots other than ``keep`` that were replaced over the grace period ago."""
+    cutoff = time.time() - PRUNE_GRACE_SECONDS
+    for child in cache_dir.glob("snapshot-*"):
+        if child.name == keep:
+            continue
+        try:
+            replaced_at = child.stat().st_mtime
+        except OSError:
+            continue
+        if replaced_at <= cutoff:
+            shutil.rmtree(child, ignore_errors=True)
+
+
+def main() -> None:
+    """Build (or validate) the snapshot for the bundled data, e.g. at image build time."""
+    logging.basicConfig(level=logging.INFO)
+    # Importing the service module loads the data, rebuilding a stale snapshot.
+    from services.marketing_mix_service import get_marketing_mix_service
+
+    logger.info("Marketing mix snapshot ready in %s", get_marketing_mix_service().snapshot_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Persistent on-disk cache of Meridian analyzer results.
+
+``Analyzer.incremental_outcome`` and ``Analyzer.response_curves`` dominate the
+MMM endpoints' latency, and their results depend only on the saved model and
+the call parameters. Each result is stored as a directory of ``.npy`` files
+under ``<cache_dir>/<model digest>/``, keyed by a hash of the call name and
+parameters, so it survives restarts (including scale-to-zero) and is shared by
+every worker on the machine: entries are published with an atomic rename and
+opened as read-only memory maps.
+
+The model digest is the SHA-256 of ``saved_mmm.pkl``, so replacing the model
+starts a fresh directory and the entries of previous models are pruned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from services.file_utils import fingerprint, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+MODEL_STAMP = "model.json"
+
+Arrays = Dict[str, np.ndarray]
+
+
+def model_digest(model_path: Path, cache_dir: Path) -> str:
+    """SHA-256 of the model file, reusing the recorded hash while size and mtime match."""
+    stat = model_path.stat()
+    stamp_path = cache_dir / MODEL_STAMP
+    try:
+        with stamp_path.open("r") as fh:
+            stamp = json.load(fh)
+        if (stamp["size"], stamp["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            return stamp["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    stamp = fingerprint(model_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(stamp_path, stamp)
+    except OSError as exc:
+        logger.warning("Could not record MMM model fingerprint in %s: %s", cache_dir, exc)
+    return stamp["sha256"]
+
+
+class AnalyzerResultCache:
+    """Arrays computed from one model version, persisted under ``cache_dir``."""
+
+    def __init__(self, cache_dir: Path, digest: str, mmap: bool = True) -> None:
+        self._cache_dir = cache_dir
+        self._model_dir = cache_dir / digest[:16]
+        self._digest = digest
+        self._mmap = mmap
+
+    @property
+    def model_dir(self) -> Path:
+        return self._model_dir
+
+    def get_or_compute(self, name: str, params: dict, compute: Callable[[], Arrays]) -> Arrays:
+        """Return the stored arrays for ``name(**params)``, computing and storing them once.
+
+        ``params`` must be JSON-serialisable; round floats so equal requests share an entry.
+        """
+        entry = self._model_dir / f"{name}-{self._key(name, params)}"
+        arrays = self._load(entry)
+        if arrays is not None:
+            return arrays
+        arrays = {key: np.asarray(value) for key, value in compute().items()}
+        try:
+            self._store(entry, arrays)
+        except OSError as exc:
+            logger.warning("Could not persist MMM analyzer result %s: %s", entry.name, exc)
+        return arrays
+
+    def prune(self) -> None:
+        """Remove the entries of every other model version."""
+        if not self._cache_dir.is_dir():
+            return
+        for child in self._cache_dir.iterdir():
+            if child.is_dir() and child != self._model_dir:
+                shutil.rmtree(child, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _key(self, name: str, params: dict) -> str:
+        payload = json.dumps([CACHE_VERSION, self._digest, name, params], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+    def _load(self, entry: Path) -> Optional[Arrays]:
+        if not entry.is_dir():
+            return None
+        try:
+            return {
+                path.stem: np.load(path, mmap_mode="r" if self._mmap else None, allow_pickle=False)
+                for path in entry.glob("*.npy")
+            }
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable MMM cache entry %s: %s", entry, exc)
+            return None
+
+    def _store(self, entry: Path, arrays: Arrays) -> None:
+        self._model_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self._model_dir))
+        try:
+            for key, array in arrays.items():
+                np.save(tmp_dir / f"{key}.npy", array, allow_pickle=False)
+            os.rename(tmp_dir, entry)
+        except OSError:
+            # Another worker may have published the same entry first.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not entry.is_dir():
+                raise
@@ -0,0 +1,97 @@
+"""In-memory posterior of per-week MMM channel contributions.
+
+``Analyzer.incremental_outcome(aggregate_times=False, aggregate_geos=True)``
+does not depend on the requested dates or credible interval, so it is
+computed once per model load and held as a ``(samples, times, channels)``
+array with chains and draws flattened together and sorted along the sample
+axis. A request then only selects a contiguous range of weeks (a view, found
+by binary search on the sorted time index) and reads each quantile as an
+interpolation between two neighbouring sorted draws, with no sorting.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True, frozen=True)
+class ContributionSummary:
+    times: pd.DatetimeIndex
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    total_mean: np.ndarray
+    total_lower: np.ndarray
+    total_upper: np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class ContributionPosterior:
+    """Sorted contribution draws per ``(time, channel)`` and per time for the channel total.
+
+    The total is summed draw by draw before sorting, so its quantiles describe
+    the total itself rather than a sum of per-channel quantiles.
+    """
+
+    times: pd.DatetimeIndex
+    channels: Tuple[str, ...]
+    mean: np.ndarray
+    sorted_samples: np.ndarray
+    sorted_totals: np.ndarray
+
+    @classmethod
+    def from_draws(
+        cls, incremental_outcome: np.ndarray, times: Sequence, channels: Sequence
+    ) -> "ContributionPosterior":
+        """Build from a ``(chains, draws, times, channels)`` incremental-outcome tensor."""
+        n_times, n_channels = incremental_outcome.shape[-2:]
+        samples = np.array(incremental_outcome, dtype=np.float64).reshape(-1, n_times, n_channels)
+        totals = samples.sum(axis=2)
+        mean = samples.mean(axis=0)
+        samples.sort(axis=0)
+        totals.sort(axis=0)
+        return cls(
+            times=pd.DatetimeIndex(pd.to_datetime(times)),
+            channels=tuple(str(channel) for channel in channels),
+            mean=mean,
+            sorted_samples=samples,
+            sorted_totals=totals,
+        )
+
+    def window(self, start: Optional[str] = None, end: Optional[str] = None) -> slice:
+        """Positions of the weeks within ``[start, end]``."""
+        lo = self.times.searchsorted(pd.Timestamp(start), side="left") if start else 0
+        hi = self.times.searchsorted(pd.Timestamp(end), side="right") if end else len(self.times)
+        return slice(int(lo), int(max(lo, hi)))
+
+    def summarize(
+        self, start: Optional[str], end: Optional[str], credible_interval: float
+    ) -> ContributionSummary:
+        """Per-week mean and equal-tailed credible bounds, per channel and for the total."""
+        rows = self.window(start, end)
+        lower_q = (1 - credible_interval) / 2
+        samples = self.sorted_samples[:, rows, :]
+        totals = self.sorted_totals[:, rows]
+        mean = self.mean[rows]
+        return ContributionSummary(
+            times=self.times[rows],
+            mean=mean,
+            lower=sorted_quantile(samples, lower_q),
+            upper=sorted_quantile(samples, 1 - lower_q),
+            total_mean=mean.sum(axis=1),
+            total_lower=sorted_quantile(totals, lower_q),
+            total_upper=sorted_quantile(totals, 1 - lower_q),
+        )
+
+
+def sorted_quantile(sorted_draws: np.ndarray, q: float) -> np.ndarray:
+    """``np.quantile(draws, q, axis=0)`` (linear method) for draws already sorted on axis 0."""
+    position = q * (sorted_draws.shape[0] - 1)
+    below = int(np.floor(position))
+    above = min(below + 1, sorted_draws.shape[0] - 1)
+    fraction = position - below
+    return sorted_draws[below] + fraction * (sorted_draws[above] - sorted_draws[below])
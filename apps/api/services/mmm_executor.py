@@ -0,0 +1,179 @@
+"""Bounded executor for MMM analysis work.
+
+Meridian's analyzer runs long TensorFlow computations. Running them on
+Starlette's shared threadpool lets a handful of MMM requests starve every
+other sync endpoint, so MMM handlers submit their work here instead: a
+dedicated pool of ``workers`` plus at most ``queue_limit`` waiting jobs.
+Work beyond that is refused immediately (the router answers 503 with
+``Retry-After``) rather than queued without bound, and callers stop waiting
+after a timeout (504).
+
+The pool is made of threads by default. With ``processes=True`` it is a pool
+of long-lived ``spawn``-ed worker processes instead: each runs
+``initializer`` once (loading the model), so MMM throughput scales with cores
+rather than with web workers and is not bound by one interpreter's GIL. A
+worker exits after ``max_tasks_per_worker`` jobs and is replaced, which
+bounds memory growth, and a pool broken by a crashed worker is rebuilt.
+
+A running job cannot be interrupted, so a timed-out job keeps its slot until
+it finishes; admission therefore always reflects the work actually
+occupying the pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+EXECUTOR_KIND = os.getenv("MMM_EXECUTOR_KIND", "thread")
+EXECUTOR_WORKERS = int(os.getenv("MMM_EXECUTOR_WORKERS", "2"))
+EXECUTOR_QUEUE_LIMIT = int(os.getenv("MMM_EXECUTOR_QUEUE", "8"))
+REQUEST_TIMEOUT = float(os.getenv("MMM_REQUEST_TIMEOUT", "30"))
+WORKER_MAX_TASKS = int(os.getenv("MMM_WORKER_MAX_TASKS", "200"))
+
+
+class ExecutorSaturated(RuntimeError):
+    """Every worker is busy and the queue is full."""
+
+
+class ExecutorUnavailable(RuntimeError):
+    """A worker process died; the pool has been rebuilt but the job was lost."""
+
+
+class ComputeTimeout(TimeoutError):
+    """The job did not finish within the caller's timeout."""
+
+
+class ComputeExecutor:
+    """Thread or process pool with a hard cap on running plus queued jobs.
+
+    In process mode ``fn``, its arguments, its result and ``initializer``
+    must be picklable (module-level functions and plain data).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_limit: int,
+        name: str = "compute",
+        processes: bool = False,
+        initializer: Optional[Callable[[], None]] = None,
+        max_tasks_per_worker: Optional[int] = None,
+    ) -> None:
+        self._name = name
+        self._workers = max(1, workers)
+        self._capacity = self._workers + max(0, queue_limit)
+        self._processes = processes
+        self._initializer = initializer
+        self._max_tasks = max_tasks_per_worker if processes and max_tasks_per_worker else None
+        self._slots = BoundedSemaphore(self._capacity)
+        self._lock = Lock()
+        self._pool = self._new_pool()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._restarts = 0
+
+    async def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        """Run ``fn(*args)`` on the pool, or raise if the pool is saturated or too slow."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated(f"{self._capacity} MMM jobs already running or queued")
+        with self._lock:
+            self._in_flight += 1
+            pool = self._pool
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenExecutor as exc:
+            self._release(None)
+            self._restart(pool)
+            raise ExecutorUnavailable("MMM worker pool was restarted") from exc
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        try:
+            # Cancelling the wrapper also drops the job if it has not started yet.
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError as exc:
+            with self._lock:
+                self._timed_out += 1
+            raise ComputeTimeout(f"MMM job exceeded {timeout:g}s") from exc
+        except BrokenExecutor as exc:
+            self._restart(pool)
+            raise ExecutorUnavailable("MMM worker died while running the job") from exc
+
+    def warm_up(self, fn: Optional[Callable[[], object]] = None) -> None:
+        """Start the workers (running ``initializer``) and optionally run ``fn`` on them.
+
+        Blocks until done; meant for a startup thread. Errors are logged, not raised.
+        """
+        rounds = self._workers if self._processes else 1
+        futures = [self._pool.submit(fn or _noop) for _ in range(rounds)]
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                logger.warning("MMM worker warm-up failed: %s", future.exception())
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "kind": "process" if self._processes else "thread",
+                "workers": self._workers,
+                "capacity": self._capacity,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "restarts": self._restarts,
+                "max_tasks_per_worker": self._max_tasks,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _new_pool(self) -> Executor:
+        if self._processes:
+            return ProcessPoolExecutor(
+                max_workers=self._workers,
+                # TensorFlow is not fork-safe; spawn also allows max_tasks_per_child.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self._initializer,
+                max_tasks_per_child=self._max_tasks,
+            )
+        return ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix=self._name)
+
+    def _restart(self, broken: Executor) -> None:
+        with self._lock:
+            if self._pool is not broken:
+                return  # another caller already replaced it
+            self._pool = self._new_pool()
+            self._restarts += 1
+        logger.warning("Restarted broken %s worker pool", self._name)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future is not None:
+                self._completed += 1
+        self._slots.release()
+
+
+def _noop() -> None:
+    return None
@@ -0,0 +1,207 @@
+"""Budget allocation on cached MMM response curves.
+
+Meridian's ``Analyzer.response_curves`` is far too slow to call inside a
+search loop, so the curves are sampled once on a spend-multiplier grid into a
+:class:`ResponseCurveTable` and every optimisation only interpolates that
+table. Between grid points a curve is linear; beyond its largest sampled spend
+it is flat, so the optimiser never extrapolates growth the model did not show.
+
+The allocation itself is a dynamic programme over a discretised budget: the
+spend above each channel's minimum is split into ``steps`` equal units and
+``best[j]`` holds the largest total outcome reachable with ``j`` units across
+the channels processed so far. Each channel is one max-plus step over a
+``(steps + 1) x (steps + 1)`` array, so the result is globally optimal on the
+grid even for S-shaped curves, and ten channels at 1000 units take tens of
+milliseconds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_BUDGET_STEPS = 1000
+
+Bounds = Mapping[str, Tuple[Optional[float], Optional[float]]]
+
+
+class OptimizationError(ValueError):
+    """The requested budget or bounds admit no allocation."""
+
+
+@dataclass(slots=True, frozen=True)
+class ResponseCurveTable:
+    """Per-channel response curves sampled on a shared spend-multiplier grid.
+
+    ``spend``, ``mean``, ``lower`` and ``upper`` are ``(channels, points)``
+    arrays with spend increasing along each row; ``baseline_spend`` is the
+    historical spend of each channel (multiplier 1).
+    """
+
+    channels: Tuple[str, ...]
+    spend: np.ndarray
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    baseline_spend: np.ndarray
+    credible_interval: float
+
+    @classmethod
+    def from_arrays(
+        cls,
+        curves: Mapping[str, np.ndarray],
+        spend_multipliers: Sequence[float],
+        credible_interval: float,
+    ) -> "ResponseCurveTable":
+        """Build the table from cached response-curve arrays.
+
+        ``curves`` holds ``channel`` names and ``(channels, points)`` ``spend``,
+        ``mean``, ``ci_lo`` and ``ci_hi`` arrays sampled at ``spend_multipliers``.
+        """
+        multipliers = np.asarray(spend_multipliers, dtype=np.float64)
+        order = np.argsort(multipliers)
+        spend = np.asarray(curves["spend"], dtype=np.float64)[:, order]
+        return cls(
+            channels=tuple(str(channel) for channel in curves["channel"].tolist()),
+            spend=spend,
+            mean=np.asarray(curves["mean"], dtype=np.float64)[:, order],
+            lower=np.asarray(curves["ci_lo"], dtype=np.float64)[:, order],
+            upper=np.asarray(curves["ci_hi"], dtype=np.float64)[:, order],
+            baseline_spend=spend[:, -1] / multipliers[order[-1]],
+            credible_interval=credible_interval,
+        )
+
+    def outcome(self, spend: np.ndarray, curve: str = "mean") -> np.ndarray:
+        """Interpolated ``curve`` value at ``spend[c]`` for every channel ``c``."""
+        values = getattr(self, curve)
+        return np.array(
+            [np.interp(spend[c], self.spend[c], values[c]) for c in range(len(self.channels))]
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class BudgetAllocation:
+    """Optimal spend per channel with its expected outcome.
+
+    ``baseline_*`` describe the historical channel mix scaled to the same
+    budget, for comparison.
+    """
+
+    channels: Tuple[str, ...]
+    min_spend: np.ndarray
+    max_spend: np.ndarray
+    spend: np.ndarray
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    baseline_spend: np.ndarray
+    baseline_mean: np.ndarray
+
+    @property
+    def expected_outcome(self) -> float:
+        return float(self.mean.sum())
+
+    @property
+    def baseline_outcome(self) -> float:
+        return float(self.baseline_mean.sum())
+
+
+def optimize_budget(
+    table: ResponseCurveTable,
+    total_budget: float,
+    bounds: Optional[Bounds] = None,
+    steps: int = DEFAULT_BUDGET_STEPS,
+) -> BudgetAllocation:
+    """Split ``total_budget`` across channels to maximise expected incremental outcome.
+
+    ``bounds`` maps channel names to ``(min_spend, max_spend)``; ``None`` means
+    zero and the largest spend on the channel's curve respectively.
+    """
+    min_spend, max_spend = _resolve_bounds(table, bounds or {})
+    if total_budget < min_spend.sum():
+        raise OptimizationError("Total budget is below the sum of channel minimums")
+    if total_budget > max_spend.sum() * (1 + 1e-9):
+        raise OptimizationError("Total budget exceeds the sum of channel maximums")
+
+    residual = total_budget - min_spend.sum()
+    if residual > 0:
+        units = _allocate_units(table, min_spend, max_spend, residual / steps, steps)
+        spend = min_spend + units * (residual / steps)
+        # Rounding the upper bounds down to whole units can strand a few units; top up in order.
+        leftover = total_budget - spend.sum()
+        for c in range(len(spend)):
+            top_up = min(max(leftover, 0.0), max_spend[c] - spend[c])
+            spend[c] += top_up
+            leftover -= top_up
+    else:
+        spend = min_spend.copy()
+
+    total_baseline = table.baseline_spend.sum()
+    if total_baseline > 0:
+        baseline_spend = table.baseline_spend * (total_budget / total_baseline)
+    else:
+        baseline_spend = np.full(len(table.channels), total_budget / len(table.channels))
+    return BudgetAllocation(
+        channels=table.channels,
+        min_spend=min_spend,
+        max_spend=max_spend,
+        spend=spend,
+        mean=table.outcome(spend, "mean"),
+        lower=table.outcome(spend, "lower"),
+        upper=table.outcome(spend, "upper"),
+        baseline_spend=baseline_spend,
+        baseline_mean=table.outcome(baseline_spend, "mean"),
+    )
+
+
+def _resolve_bounds(table: ResponseCurveTable, bounds: Bounds) -> Tuple[np.ndarray, np.ndarray]:
+    unknown = sorted(set(bounds) - set(table.channels))
+    if unknown:
+        raise OptimizationError(f"Channel '{unknown[0]}' not found")
+    min_spend = np.zeros(len(table.channels))
+    max_spend = table.spend.max(axis=1).astype(np.float64)
+    for c, channel in enumerate(table.channels):
+        low, high = bounds.get(channel, (None, None))
+        if low is not None:
+            min_spend[c] = low
+        if high is not None:
+            max_spend[c] = high
+    if np.any(min_spend < 0) or np.any(min_spend > max_spend):
+        raise OptimizationError("Each channel needs 0 <= min_spend <= max_spend")
+    return min_spend, max_spend
+
+
+def _allocate_units(
+    table: ResponseCurveTable,
+    min_spend: np.ndarray,
+    max_spend: np.ndarray,
+    unit: float,
+    steps: int,
+) -> np.ndarray:
+    """Units above the minimum per channel, maximising the summed mean outcome."""
+    grid = np.arange(steps + 1)
+    # remaining[j, k]: units left for earlier channels when this one takes k of j.
+    remaining = grid[:, None] - grid[None, :]
+    feasible = remaining >= 0
+    remaining = np.where(feasible, remaining, 0)
+
+    best = np.full(steps + 1, -np.inf)
+    best[0] = 0.0
+    choices = np.empty((len(table.channels), steps + 1), dtype=np.intp)
+    for c in range(len(table.channels)):
+        gain = np.interp(min_spend[c] + grid * unit, table.spend[c], table.mean[c])
+        cap = int(np.floor((max_spend[c] - min_spend[c]) / unit + 1e-9))
+        gain[grid > cap] = -np.inf
+        candidates = np.where(feasible, best[remaining] + gain[None, :], -np.inf)
+        choices[c] = candidates.argmax(axis=1)
+        best = candidates[grid, choices[c]]
+
+    reachable = np.flatnonzero(np.isfinite(best))
+    j = int(reachable[-1])
+    units = np.zeros(len(table.channels))
+    for c in range(len(table.channels) - 1, -1, -1):
+        units[c] = choices[c, j]
+        j -= choices[c, j]
+    return units
@@ -0,0 +1,268 @@
+"""Response-curve cube: every channel's posterior response on one fine grid.
+
+Meridian's ``Analyzer.response_curves`` runs a full posterior pass per spend
+multiplier and keeps only the mean and one credible interval, so every new
+``points`` value, channel or credible level used to cost another set of
+passes. The cube instead keeps the incremental-outcome draws of all channels
+at a fine multiplier grid, sorted along the draw axis. Any request is then
+answered from memory: quantiles come from :func:`sorted_quantile` at the grid
+points and are linearly interpolated onto the requested multipliers.
+
+The unsorted draws are kept as well, so each posterior draw remains a whole
+curve. Curve analytics (saturation, diminishing returns, marginal ROI) run
+on ``(..., channels, points)`` arrays in one vectorized pass, for the mean
+curve and for every draw, which gives the saturation point its own credible
+interval.
+
+Because the cube is cheap to query, a request can also ask for an adaptive
+grid: starting from a coarse uniform grid, the interval whose chord deviates
+most from the curve is bisected until the point budget is spent. Points then
+cluster around the knee instead of along the flat saturated tail.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.mmm_contributions import sorted_quantile
+
+# 0-3x historical spend in 2.5% steps.
+CUBE_SPEND_MULTIPLIERS = np.linspace(0, 3, 121)
+
+
+class ResponseCurveError(ValueError):
+    """Raised when a curve is requested outside the range the cube covers."""
+
+
+@dataclass(slots=True, frozen=True)
+class ResponseCurveCube:
+    """``(samples, multipliers, channels)`` draws, as sampled and sorted, plus their mean.
+
+    ``spend`` is each channel's historical spend; the spend at multiplier ``m``
+    is ``m * spend``.
+    """
+
+    channels: Tuple[str, ...]
+    multipliers: np.ndarray
+    spend: np.ndarray
+    mean: np.ndarray
+    draws: np.ndarray
+    sorted_draws: np.ndarray
+
+    @classmethod
+    def from_draws(
+        cls,
+        draws: np.ndarray,
+        multipliers: Sequence[float],
+        spend: np.ndarray,
+        channels: Sequence[str],
+    ) -> "ResponseCurveCube":
+        """Build from ``(samples, multipliers, channels)`` incremental-outcome draws."""
+        multipliers = np.asarray(multipliers, dtype=np.float64)
+        order = np.argsort(multipliers)
+        samples = np.array(draws, dtype=np.float64)[:, order, :]
+        return cls(
+            channels=tuple(str(channel) for channel in channels),
+            multipliers=multipliers[order],
+            spend=np.asarray(spend, dtype=np.float64),
+            mean=samples.mean(axis=0),
+            draws=samples,
+            sorted_draws=np.sort(samples, axis=0),
+        )
+
+    def curves(
+        self,
+        spend_multipliers: Sequence[float],
+        credible_interval: float,
+        channels: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Curves for ``channels`` (default all) at ``spend_multipliers``.
+
+        Returns ``channel`` plus ``(channels, points)`` ``spend``, ``mean``,
+        ``ci_lo`` and ``ci_hi`` arrays, the layout of a cached
+        ``Analyzer.response_curves`` result.
+        """
+        columns = self._columns(channels)
+        targets = np.asarray(spend_multipliers, dtype=np.float64)
+        lower_q = (1 - credible_interval) / 2
+        draws = self.sorted_draws[:, :, columns]
+        grids = {
+            "mean": self.mean[:, columns],
+            "ci_lo": sorted_quantile(draws, lower_q),
+            "ci_hi": sorted_quantile(draws, 1 - lower_q),
+        }
+        curves = {name: self._resample(grid, targets, axis=0).T for name, grid in grids.items()}
+        curves["spend"] = self.spend[columns][:, None] * targets[None, :]
+        curves["channel"] = np.array([self.channels[col] for col in columns], dtype=str)
+        return curves
+
+    def analytics(
+        self,
+        spend_multipliers: Sequence[float],
+        credible_interval: float,
+        channels: Optional[Sequence[str]] = None,
+    ) -> "CurveAnalytics":
+        """Markers of the mean curve plus the per-draw spread of the saturation spend."""
+        columns = self._columns(channels)
+        targets = np.asarray(spend_multipliers, dtype=np.float64)
+        spend = self.spend[columns][:, None] * targets[None, :]
+        mean = self._resample(self.mean[:, columns], targets, axis=0).T
+        saturation, diminishing = curve_markers(spend, mean)
+        draw_saturation = np.sort(self._draw_saturation(targets, columns), axis=0)
+        lower_q = (1 - credible_interval) / 2
+        # Marginal ROI at historical spend: central difference over one cube step around 1x.
+        step = float(np.diff(self.multipliers).min())
+        around = self._resample(self.mean[:, columns], np.array([1 - step, 1 + step]), axis=0)
+        historical = self.spend[columns]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            marginal_roi = np.where(
+                historical > 0, (around[1] - around[0]) / (2 * step * historical), 0.0
+            )
+        return CurveAnalytics(
+            channels=tuple(self.channels[col] for col in columns),
+            historical_spend=self.spend[columns],
+            saturation_spend=saturation,
+            saturation_lower=sorted_quantile(draw_saturation, lower_q),
+            saturation_upper=sorted_quantile(draw_saturation, 1 - lower_q),
+            diminishing_returns_start=diminishing,
+            marginal_roi=marginal_roi,
+            credible_interval=credible_interval,
+        )
+
+    def max_multiplier(self, channel: str, spend_max: float) -> float:
+        """Multiplier of ``channel``'s historical spend that reaches ``spend_max``."""
+        spend = float(self.spend[self.channels.index(channel)])
+        if spend <= 0:
+            raise ResponseCurveError(f"Channel '{channel}' has no historical spend")
+        multiplier = spend_max / spend
+        limit = float(self.multipliers[-1])
+        if multiplier > limit:
+            raise ResponseCurveError(
+                f"spend_max exceeds the modelled range for '{channel}' (max {spend * limit:.2f})"
+            )
+        return multiplier
+
+    def adaptive_multipliers(self, channel: str, points: int, max_multiplier: float) -> np.ndarray:
+        """``points`` multipliers in ``[0, max_multiplier]``, denser where the mean curve bends.
+
+        A quarter of the budget seeds a uniform grid; each remaining point
+        bisects the interval whose midpoint lies furthest from its chord.
+        """
+        mean = self.mean[:, self.channels.index(channel)]
+
+        def chord_error(lo: float, hi: float) -> float:
+            f_lo, f_mid, f_hi = np.interp((lo, (lo + hi) / 2, hi), self.multipliers, mean)
+            return abs(f_mid - (f_lo + f_hi) / 2)
+
+        seed = np.linspace(0, max_multiplier, max(2, points // 4))
+        grid = seed.tolist()
+        heap = [(-chord_error(lo, hi), lo, hi) for lo, hi in zip(seed[:-1], seed[1:])]
+        heapq.heapify(heap)
+        while len(grid) < points:
+            _, lo, hi = heapq.heappop(heap)
+            mid = (lo + hi) / 2
+            grid.append(mid)
+            heapq.heappush(heap, (-chord_error(lo, mid), lo, mid))
+            heapq.heappush(heap, (-chord_error(mid, hi), mid, hi))
+        return np.sort(np.array(grid))
+
+    def _draw_saturation(self, targets: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """``(samples, channels)`` saturation spend of every draw on the ``targets`` grid.
+
+        A draw is linear between cube multipliers, so ``f(m) - k * m`` (``k``
+        being half the ROI at the first positive target) is too. Its first
+        root is solved on the cube grid and saturation is the first target at
+        or past it, so the cost does not grow with the number of targets. This
+        matches :func:`curve_markers` on the resampled draw unless the draw's
+        ROI recovers above the threshold between the root and that target.
+        """
+        positive = np.flatnonzero(targets > 0)
+        spend = self.spend[columns]
+        n_samples = self.draws.shape[0]
+        if positive.size == 0:
+            return np.broadcast_to(targets[-1] * spend, (n_samples, len(columns))).copy()
+        first = targets[positive[0]]
+        draws = self.draws[:, :, columns]
+        first_outcome = self._resample(draws, np.array([first]), axis=1)[:, 0, :]
+        slope = 0.5 * first_outcome / first
+        gap = draws - slope[:, None, :] * self.multipliers[None, :, None]
+
+        after = self.multipliers > first
+        crossed = (gap <= 0) & after[None, :, None]
+        node = np.where(crossed.any(axis=1), crossed.argmax(axis=1), len(self.multipliers) - 1)
+        # Segment [start, node] holds the root; it starts at the first target if that is later.
+        start = np.maximum(self.multipliers[node - 1], first)
+        start_gap = np.where(
+            self.multipliers[node - 1] > first,
+            np.take_along_axis(gap, (node - 1)[:, None, :], axis=1)[:, 0, :],
+            0.5 * first_outcome,
+        )
+        node_gap = np.take_along_axis(gap, node[:, None, :], axis=1)[:, 0, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = start + (self.multipliers[node] - start) * start_gap / (start_gap - node_gap)
+        root = np.where(node_gap <= 0, root, np.inf)
+        root = np.where(first_outcome <= 0, first, root)
+        hit = np.minimum(np.searchsorted(targets, root), len(targets) - 1)
+        return targets[hit] * spend[None, :]
+
+    def _columns(self, channels: Optional[Sequence[str]]) -> np.ndarray:
+        if channels is None:
+            return np.arange(len(self.channels))
+        return np.array([self.channels.index(channel) for channel in channels], dtype=np.intp)
+
+    def _resample(self, values: np.ndarray, targets: np.ndarray, axis: int) -> np.ndarray:
+        """Linear interpolation of ``values`` along its multiplier ``axis`` onto ``targets``."""
+        targets = np.clip(targets, self.multipliers[0], self.multipliers[-1])
+        upper = np.clip(np.searchsorted(self.multipliers, targets), 1, len(self.multipliers) - 1)
+        lo, hi = self.multipliers[upper - 1], self.multipliers[upper]
+        weight = (targets - lo) / (hi - lo)
+        shape = [1] * values.ndim
+        shape[axis] = len(targets)
+        weight = weight.reshape(shape)
+        below = np.take(values, upper - 1, axis=axis)
+        return below + weight * (np.take(values, upper, axis=axis) - below)
+
+
+@dataclass(slots=True, frozen=True)
+class CurveAnalytics:
+    """Per-channel curve markers; saturation bounds come from the per-draw curves."""
+
+    channels: Tuple[str, ...]
+    historical_spend: np.ndarray
+    saturation_spend: np.ndarray
+    saturation_lower: np.ndarray
+    saturation_upper: np.ndarray
+    diminishing_returns_start: np.ndarray
+    marginal_roi: np.ndarray
+    credible_interval: float
+
+
+def curve_markers(spend: np.ndarray, mean: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Saturation spend and start of diminishing returns along the last axis.
+
+    ``spend`` (increasing along the last axis) broadcasts against ``mean``, so
+    one call handles ``(channels, points)`` curves or ``(draws, channels,
+    points)`` posterior curves. Saturation is the first spend where ROI falls
+    to half its value at the first positive spend; diminishing returns start
+    where the marginal return (slope between neighbouring points) first
+    decreases.
+    """
+    mean = np.asarray(mean, dtype=np.float64)
+    spend = np.broadcast_to(np.asarray(spend, dtype=np.float64), mean.shape)
+    positive = spend > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(positive, mean / spend, np.inf)
+        slopes = np.diff(mean, axis=-1) / np.diff(spend, axis=-1)
+    initial_roi = np.take_along_axis(roi, positive.argmax(axis=-1)[..., None], axis=-1)
+    saturated = (roi <= initial_roi * 0.5) & positive.any(axis=-1, keepdims=True)
+    saturation_idx = np.where(saturated.any(axis=-1), saturated.argmax(axis=-1), mean.shape[-1] - 1)
+    bending = np.diff(slopes, axis=-1) < 0
+    bending_idx = np.where(bending.any(axis=-1), bending.argmax(axis=-1), 0)
+    return (
+        np.take_along_axis(spend, saturation_idx[..., None], axis=-1)[..., 0],
+        np.take_along_axis(spend, bending_idx[..., None], axis=-1)[..., 0],
+    )
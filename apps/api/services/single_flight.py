@@ -0,0 +1,75 @@
+"""Single-flight request coalescing with a short-lived result cache.
+
+Identical concurrent requests (say, one dashboard open in twenty tabs) share
+one computation: the first caller for a key starts it, later callers await
+the same task, and the result is then served from memory until the TTL
+expires. Failures are not cached. Keys are tuples whose first element names
+the endpoint, which is also how the hit/miss/coalesced counters are grouped.
+
+Everything runs on the event loop, so no locking is needed; the computation
+itself is shielded so a disconnecting first caller does not cancel it for
+everyone else.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Key = Tuple[Hashable, ...]
+
+
+class SingleFlightCache:
+    def __init__(self, ttl: float, max_entries: int = 256) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._values: "OrderedDict[Key, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Key, asyncio.Future] = {}
+        self._counters: Dict[Hashable, Counter] = {}
+
+    async def get(self, key: Key, compute: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached value for ``key``, joining or starting its computation."""
+        counter = self._counters.setdefault(key[0], Counter())
+        cached = self._values.get(key)
+        if cached is not None:
+            stored_at, value = cached
+            if monotonic() - stored_at < self._ttl:
+                counter["hit"] += 1
+                return value
+            del self._values[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            counter["coalesced"] += 1
+        else:
+            counter["miss"] += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "entries": len(self._values),
+            "in_flight": len(self._in_flight),
+            "endpoints": {
+                str(name): {kind: counter[kind] for kind in ("hit", "miss", "coalesced")}
+                for name, counter in self._counters.items()
+            },
+        }
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def _finish(self, key: Key, task: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._values[key] = (monotonic(), task.result())
+        self._values.move_to_end(key)
+        while len(self._values) > self._max_entries:
+            self._values.popitem(last=False)
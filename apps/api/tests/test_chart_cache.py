@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import asyncio
+import gzip
+import json
+import math
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.chart_cache import CachedChart, ChartCache
+
+
+def _spec(points: int, version: int = 1) -> dict:
+    return {"version": version, "data": {"values": [{"spend": float(i)} for i in range(points)]}}
+
+
+class CachedChartTests(unittest.TestCase):
+    def test_bytes_gzip_and_etag(self) -> None:
+        chart = CachedChart.from_content(_spec(200))
+
+        self.assertEqual(json.loads(chart.body), _spec(200))
+        self.assertEqual(gzip.decompress(chart.gzip_body), chart.body)
+        self.assertTrue(chart.matches(chart.etag))
+        self.assertTrue(chart.matches(f'"other", {chart.etag.removeprefix("W/")}'))
+        self.assertTrue(chart.matches("*"))
+        self.assertFalse(chart.matches(None))
+        self.assertFalse(chart.matches(CachedChart.from_content(_spec(200, 2)).etag))
+        self.assertIsNone(CachedChart.from_content({"small": True}).gzip_body)
+
+
+class ChartCacheTests(unittest.TestCase):
+    def test_misses_are_coalesced_and_hits_return_the_same_bytes(self) -> None:
+        cache = ChartCache(ttl=60, max_bytes=1 << 20)
+        calls = []
+
+        async def build() -> CachedChart:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return CachedChart.from_content(_spec(50))
+
+        async def scenario() -> list:
+            charts = await asyncio.gather(*(cache.get(("chart", 0.9), build) for _ in range(10)))
+            charts.append(await cache.get(("chart", 0.9), build))
+            return charts
+
+        charts = asyncio.run(scenario())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(chart is charts[0] for chart in charts))
+        stats = cache.stats()
+        self.assertEqual((stats["miss"], stats["coalesced"], stats["hit"]), (1, 9, 1))
+        self.assertEqual(stats["bytes"], charts[0].size)
+
+    def test_least_recently_used_entries_are_evicted_past_the_memory_cap(self) -> None:
+        size = CachedChart.from_content(_spec(100)).size
+        cache = ChartCache(ttl=60, max_bytes=size * 2 + 10)
+
+        async def build() -> CachedChart:
+            return CachedChart.from_content(_spec(100))
+
+        async def scenario() -> None:
+            await cache.get(("a",), build)
+            await cache.get(("b",), build)
+            await cache.get(("a",), build)  # "b" is now least recently used
+            await cache.get(("c",), build)
+            await cache.get(("a",), build)
+            await cache.get(("b",), build)
+
+        asyncio.run(scenario())
+        stats = cache.stats()
+        self.assertEqual((stats["hit"], stats["miss"], stats["eviction"]), (2, 4, 2))
+        self.assertLessEqual(stats["bytes"], size * 2 + 10)
+
+    def test_refresh_ahead_serves_the_old_version_while_rebuilding(self) -> None:
+        cache = ChartCache(ttl=60, max_bytes=1 << 20, refresh_after=0)
+        versions = []
+
+        async def build() -> CachedChart:
+            versions.append(len(versions) + 1)
+            return CachedChart.from_content(_spec(10, versions[-1]))
+
+        async def scenario() -> list:
+            first = await cache.get(("chart",), build)
+            stale = await cache.get(("chart",), build)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            fresh = await cache.get(("chart",), build)
+            return [first, stale, fresh]
+
+        first, stale, fresh = asyncio.run(scenario())
+        self.assertIs(stale, first)
+        self.assertEqual(json.loads(fresh.body)["version"], 2)
+        self.assertGreaterEqual(cache.stats()["refresh"], 1)
+
+    def test_entries_can_outlive_the_default_ttl_until_cleared(self) -> None:
+        cache = ChartCache(ttl=0, max_bytes=1 << 20)
+        calls = []
+
+        async def build() -> CachedChart:
+            calls.append(1)
+            return CachedChart.from_content(_spec(10))
+
+        async def scenario() -> None:
+            await cache.get(("contribution", "weekly"), build, ttl=math.inf)
+            await cache.get(("contribution", "weekly"), build, ttl=math.inf)
+            await cache.get(("curves",), build)
+            await cache.get(("curves",), build)
+            cache.clear()
+            await cache.get(("contribution", "weekly"), build, ttl=math.inf)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(calls), 4)
+        self.assertEqual((cache.stats()["hit"], cache.stats()["refresh"]), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
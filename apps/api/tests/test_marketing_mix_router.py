@@ -0,0 +1,223 @@
+import unittest
+import sys
+import os
+import math
+from typing import Dict, Optional
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyarrow
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+import routers.marketing_mix as marketing_mix
+from services.marketing_mix_scenarios import MAX_SCENARIOS
+
+
+class MarketingMixRouterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app = FastAPI()
+        app.include_router(marketing_mix.router)
+        cls.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        marketing_mix.FAST_JSON_ENABLED = False
+
+    def _get_both(self, url: str) -> tuple[bytes, bytes]:
+        marketing_mix.FAST_JSON_ENABLED = False
+        slow = self.client.get(url)
+        marketing_mix.FAST_JSON_ENABLED = True
+        fast = self.client.get(url)
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(fast.status_code, 200)
+        return slow.content, fast.content
+
+    def test_fast_json_matches_response_model_bytes(self) -> None:
+        geo = marketing_mix.get_marketing_mix_service().list_geos()[0]
+        for url in (
+            f"/marketing-mix/geos/{geo}",
+            f"/marketing-mix/geos/{geo}?start=2022-01-01&end=2022-05-01&channels=channel1&channels=3",
+            "/marketing-mix/national",
+            "/marketing-mix/national?start=2023-01-01&channels=channel0",
+        ):
+            slow, fast = self._get_both(url)
+            self.assertEqual(fast, slow, url)
+
+    def test_fast_json_writes_non_finite_floats_as_null_like_pydantic(self) -> None:
+        values = {"conversions": math.nan, "lift_vs_prev": math.inf}
+        fast = marketing_mix.FastJSONResponse(values)
+        self.assertEqual(fast.body, b'{"conversions":null,"lift_vs_prev":null}')
+        self.assertEqual(fast.body, TypeAdapter(Dict[str, Optional[float]]).dump_json(values))
+
+    def test_geo_series_points_shape(self) -> None:
+        geo = marketing_mix.get_marketing_mix_service().list_geos()[0]
+        payload = self.client.get(f"/marketing-mix/geos/{geo}?channels=channel2").json()
+        point = payload["points"][0]
+        self.assertEqual(payload["geo"], geo)
+        self.assertEqual([c["id"] for c in point["channels"]], ["channel2"])
+        self.assertEqual(point["total_spend"], point["channels"][0]["spend"])
+
+    def test_columnar_format_matches_rows(self) -> None:
+        geo = marketing_mix.get_marketing_mix_service().list_geos()[0]
+        for url, scalar_fields in (
+            (f"/marketing-mix/geos/{geo}?channels=channel1&channels=channel0", ("population",)),
+            ("/marketing-mix/national?start=2022-06-01", ()),
+        ):
+            rows = self.client.get(url)
+            columns = self.client.get(f"{url}&format=columnar")
+            self.assertEqual(columns.status_code, 200)
+            self.assertLess(len(columns.content), len(rows.content))
+
+            points = rows.json()["points"]
+            payload = columns.json()
+            self.assertEqual(payload["time"], [point["time"] for point in points])
+            for name in (
+                "conversions",
+                "promo",
+                "total_spend",
+                "spend_efficiency",
+                "lift_vs_prev",
+                *scalar_fields,
+            ):
+                self.assertEqual(payload[name], [point[name] for point in points], name)
+            for pos, channel in enumerate(payload["channels"]):
+                self.assertEqual(channel["id"], points[0]["channels"][pos]["id"])
+                for name in ("spend", "impressions", "organic_impressions"):
+                    self.assertEqual(
+                        channel[name], [point["channels"][pos][name] for point in points], name
+                    )
+
+    def test_unknown_format_is_rejected(self) -> None:
+        response = self.client.get("/marketing-mix/national?format=parquet")
+        self.assertEqual(response.status_code, 422)
+
+    def test_geo_batch_returns_each_geo_or_an_aggregate(self) -> None:
+        geos = marketing_mix.get_marketing_mix_service().list_geos()[:3]
+        body = {"geos": geos, "start": "2022-06-01", "channels": ["channel1"]}
+
+        each = self.client.post("/marketing-mix/geos/batch", json={**body, "aggregation": "none"})
+        self.assertEqual(each.status_code, 200)
+        series = each.json()["series"]
+        self.assertEqual([item["geo"] for item in series], geos)
+        single = self.client.get(f"/marketing-mix/geos/{geos[0]}?start=2022-06-01&channels=channel1")
+        self.assertEqual(series[0], single.json())
+
+        summed = self.client.post("/marketing-mix/geos/batch", json={**body, "aggregation": "sum"})
+        self.assertEqual(summed.status_code, 200)
+        point = summed.json()["points"][0]
+        self.assertAlmostEqual(
+            point["total_spend"], sum(item["points"][0]["total_spend"] for item in series)
+        )
+
+        missing = self.client.post("/marketing-mix/geos/batch", json={"geos": ["NoSuchGeo"]})
+        self.assertEqual(missing.status_code, 404)
+
+    def test_summary_and_channels_accept_a_window(self) -> None:
+        everything = self.client.get("/marketing-mix/summary").json()
+        trailing = self.client.get("/marketing-mix/summary?weeks=13").json()
+        total_spend = {m["label"]: m["value"] for m in trailing["metrics"]}["Total Spend"]
+        self.assertLess(total_spend, {m["label"]: m["value"] for m in everything["metrics"]}["Total Spend"])
+
+        channels = self.client.get("/marketing-mix/channels?start=2022-01-01&end=2022-03-31").json()
+        self.assertAlmostEqual(sum(channel["spend_share"] for channel in channels), 1.0)
+        self.assertEqual(self.client.get("/marketing-mix/summary?weeks=0").status_code, 422)
+
+    def test_reload_reports_current_generation(self) -> None:
+        original = marketing_mix.ADMIN_TOKEN
+        marketing_mix.ADMIN_TOKEN = "secret"
+        try:
+            response = self.client.post("/marketing-mix/reload", headers={"X-Admin-Token": "secret"})
+        finally:
+            marketing_mix.ADMIN_TOKEN = original
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["status"], "unchanged")
+        self.assertEqual(payload["generation"], marketing_mix.get_marketing_mix_service().generation)
+
+    def test_reload_requires_the_admin_token(self) -> None:
+        original = marketing_mix.ADMIN_TOKEN
+        try:
+            marketing_mix.ADMIN_TOKEN = ""
+            disabled = self.client.post("/marketing-mix/reload", headers={"X-Admin-Token": ""})
+            marketing_mix.ADMIN_TOKEN = "secret"
+            missing = self.client.post("/marketing-mix/reload?force=true")
+            wrong = self.client.post("/marketing-mix/reload", headers={"X-Admin-Token": "guess"})
+        finally:
+            marketing_mix.ADMIN_TOKEN = original
+        self.assertEqual(disabled.status_code, 403)
+        self.assertEqual(missing.status_code, 401)
+        self.assertEqual(wrong.status_code, 401)
+
+    def test_scenario_batch_expands_a_grid(self) -> None:
+        response = self.client.post(
+            "/marketing-mix/scenarios/batch",
+            json={"grid": {"sources": ["channel0", "channel1"], "ratios": [0.1, 0.2]}},
+        )
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        # 2 sources x 4 other targets x 2 ratios
+        self.assertEqual(payload["scenarios"], 16)
+        self.assertEqual(len(payload["spend"]), 16)
+        self.assertEqual(len(payload["spend"][0]), len(payload["channels"]))
+        self.assertNotIn(
+            True, [s == t for s, t in zip(payload["source_channel"], payload["target_channel"])]
+        )
+
+        single = self.client.post(
+            "/marketing-mix/scenarios/shift",
+            json={"source_channel": "channel0", "target_channel": "channel1", "shift_ratio": 0.1},
+        ).json()
+        self.assertAlmostEqual(payload["projected_revenue"][0], single["projected_revenue"], places=4)
+        self.assertEqual([c["spend"] for c in single["channels"]], payload["spend"][0])
+
+    def test_scenario_batch_requires_exactly_one_input(self) -> None:
+        url = "/marketing-mix/scenarios/batch"
+        self.assertEqual(self.client.post(url, json={}).status_code, 422)
+        both = {"grid": {"ratios": [0.1]}, "reallocations": [[[0.0] * 5] * 5]}
+        self.assertEqual(self.client.post(url, json=both).status_code, 422)
+        self.assertEqual(self.client.post(url, json={"reallocations": [[[0.1, 0.2]]]}).status_code, 400)
+
+    def test_scenario_batch_sizes_the_grid_before_expanding_it(self) -> None:
+        url = "/marketing-mix/scenarios/batch"
+        # 5 x 4 channel pairs x 5001 ratios is just over MAX_SCENARIOS.
+        response = self.client.post(url, json={"grid": {"ratios": [0.1] * 5001}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(MAX_SCENARIOS), response.json()["detail"])
+        too_many = {"grid": {"sources": ["channel0"], "ratios": [0.1] * (MAX_SCENARIOS + 1)}}
+        self.assertEqual(self.client.post(url, json=too_many).status_code, 422)
+        one_pair = {"grid": {"sources": ["channel0"], "targets": ["channel1"], "ratios": [0.1] * 5001}}
+        self.assertEqual(self.client.post(url, json=one_pair).json()["scenarios"], 5001)
+
+    def test_arrow_export_streams_every_geo(self) -> None:
+        service = marketing_mix.get_marketing_mix_service()
+        response = self.client.get(
+            "/marketing-mix/export/geos.arrow?start=2022-06-01&channels=channel1"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/vnd.apache.arrow.stream")
+
+        table = pyarrow.ipc.open_stream(response.content).read_all()
+        self.assertEqual(
+            [name for name in table.column_names if name.startswith("channel")],
+            ["channel1_spend", "channel1_impressions", "channel1_organic_impressions"],
+        )
+        geos = table.column("geo").to_pylist()
+        self.assertEqual(list(dict.fromkeys(geos)), service.list_geos())
+
+        geo = service.list_geos()[1]
+        expected = self.client.get(
+            f"/marketing-mix/geos/{geo}?start=2022-06-01&channels=channel1"
+        ).json()["points"]
+        rows = [row for row in table.to_pylist() if row["geo"] == geo]
+        self.assertEqual([row["time"].isoformat() for row in rows], [p["time"] for p in expected])
+        self.assertEqual([row["total_spend"] for row in rows], [p["total_spend"] for p in expected])
+        self.assertEqual(
+            [row["lift_vs_prev"] for row in rows], [p["lift_vs_prev"] for p in expected]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
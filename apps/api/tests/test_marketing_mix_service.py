@@ -1,13 +1,41 @@
 import unittest
 import sys
 import os
-from datetime import date
+import json
+import shutil
+import tempfile
+from datetime import date, timedelta
 from math import isclose
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from fastapi import HTTPException
 
 # Add the parent directory to the Python path so we can import the api module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.marketing_mix_service import MarketingMixService
+from services import marketing_mix_snapshot
+from services.file_utils import fingerprint, write_json_atomic
+from services.marketing_mix_service import (
+    DATA_FILENAMES,
+    MarketingMixDatasets,
+    MarketingMixService,
+)
+
+
+def _rows(series) -> list:
+    """Flatten records (or projected record proxies) for value comparisons."""
+    return [
+        (
+            record.time,
+            record.conversions,
+            record.revenue_per_conversion,
+            record.promo,
+            [(c.id, c.spend, c.impressions, c.organic_impressions) for c in record.channels],
+        )
+        for record in series
+    ]
 
 
 class MarketingMixServiceTests(unittest.TestCase):
@@ -38,6 +66,92 @@ class MarketingMixServiceTests(unittest.TestCase):
         summary = self.service.get_summary_metrics()
         self.assertTrue(isclose(total_spend, summary["total_spend"], rel_tol=1e-6))
 
+    def test_date_window_matches_full_scan(self) -> None:
+        geo = self.service.list_geos()[0]
+        full = self.service.get_geo_series(geo)
+        start, end = full[10].time, full[22].time
+
+        window = self.service.get_geo_series(geo, start=start, end=end)
+        expected = [record for record in full if start <= record.time <= end]
+        self.assertEqual(window, expected)
+        self.assertEqual(self.service.get_geo_series(geo, start=end, end=start), [])
+
+    def test_channel_filter_projects_without_copying(self) -> None:
+        geo = self.service.list_geos()[0]
+        full = self.service.get_geo_series(geo)
+        filtered = self.service.get_geo_series(geo, channels=["channel3", "1"])
+
+        self.assertEqual([c.id for c in filtered[0].channels], ["channel1", "channel3"])
+        self.assertIs(filtered[0].channels[0], full[0].channels[1])
+        self.assertEqual(filtered[0].conversions, full[0].conversions)
+
+    def test_geo_view_projects_channel_columns(self) -> None:
+        geo = self.service.list_geos()[0]
+        view = self.service.get_geo_view(geo, channels=["channel1", "channel2"])
+        self.assertEqual(view.channel_ids, ("channel1", "channel2"))
+        self.assertEqual(view.spend.shape, (len(view), 2))
+        self.assertTrue(np.shares_memory(view.spend, view.frame.spend))
+
+    def test_derived_metrics_match_weekly_loop(self) -> None:
+        view = self.service.get_national_view()
+        prev = None
+        for idx, record in enumerate(self.service.get_national_series()):
+            total_spend = sum(channel.spend for channel in record.channels)
+            conversions = record.conversions or 0.0
+            self.assertTrue(isclose(view.total_spend[idx], total_spend, rel_tol=1e-12))
+            if total_spend and conversions:
+                self.assertTrue(isclose(view.spend_efficiency[idx], conversions / total_spend))
+            if prev not in (None, 0):
+                self.assertTrue(isclose(view.lift_vs_prev[idx], (conversions - prev) / prev))
+            else:
+                self.assertTrue(np.isnan(view.lift_vs_prev[idx]))
+            if conversions:
+                prev = conversions
+
+    def test_lift_at_window_edge_uses_previous_week(self) -> None:
+        geo = self.service.list_geos()[0]
+        full = self.service.get_geo_view(geo)
+        start = full.frame.times[20].item()
+        window = self.service.get_geo_view(geo, start=start, channels=["channel2"])
+        self.assertEqual(window.lift_vs_prev[0], full.lift_vs_prev[20])
+        self.assertFalse(np.isnan(window.lift_vs_prev[0]))
+        self.assertTrue(np.allclose(window.total_spend, full.frame.spend[20:, 2]))
+
+    def test_geo_aggregation_matches_per_geo_loop(self) -> None:
+        geos = self.service.list_geos()[:5]
+        start = date(2022, 6, 1)
+        frames = [self.service.get_geo_frame(geo, start=start) for geo in geos]
+        by_week: dict = {}
+        for frame in frames:
+            for idx, week in enumerate(frame.times.tolist()):
+                by_week.setdefault(week, []).append(
+                    (frame.conversions[idx], frame.population[idx], frame.spend[idx, 1])
+                )
+
+        summed = self.service.get_geo_aggregate_view(geos, start=start, aggregation="sum")
+        mean = self.service.get_geo_aggregate_view(geos, start=start, aggregation="mean")
+        weighted = self.service.get_geo_aggregate_view(
+            geos, start=start, channels=["channel1"], aggregation="population_weighted"
+        )
+        self.assertEqual(summed.frame.times.tolist(), sorted(by_week))
+        for idx, week in enumerate(summed.frame.times.tolist()):
+            rows = by_week[week]
+            conversions = [row[0] for row in rows]
+            population = sum(row[1] for row in rows)
+            self.assertTrue(isclose(summed.frame.conversions[idx], sum(conversions)))
+            self.assertTrue(isclose(mean.frame.conversions[idx], sum(conversions) / len(rows)))
+            self.assertTrue(isclose(summed.frame.population[idx], population))
+            expected_spend = sum(row[1] * row[2] for row in rows) / population
+            self.assertTrue(isclose(weighted.spend[idx, 0], expected_spend))
+            self.assertTrue(isclose(weighted.total_spend[idx], expected_spend))
+
+    def test_geo_aggregation_lift_uses_week_before_window(self) -> None:
+        geos = self.service.list_geos()[:3]
+        full = self.service.get_geo_aggregate_view(geos)
+        start = full.frame.times[20].item()
+        window = self.service.get_geo_aggregate_view(geos, start=start)
+        self.assertEqual(window.lift_vs_prev[0], full.lift_vs_prev[20])
+
     def test_channel_totals_share_sum(self) -> None:
         totals = self.service.get_channel_totals()
         share_sum = sum(channel["spend_share"] for channel in totals.values())
@@ -51,6 +165,48 @@ class MarketingMixServiceTests(unittest.TestCase):
             self.assertIn("estimated_conversions", metrics)
             self.assertIn("roas", metrics)
 
+    def test_windowed_summary_matches_direct_sums(self) -> None:
+        start, end = date(2022, 1, 1), date(2022, 12, 31)
+        series = self.service.get_national_series(start=start, end=end)
+        spend = sum(channel.spend for record in series for channel in record.channels)
+        conversions = sum(record.conversions or 0.0 for record in series)
+        revenue = sum(
+            record.conversions * record.revenue_per_conversion
+            for record in series
+            if record.conversions and record.revenue_per_conversion
+        )
+
+        summary = self.service.get_summary_metrics(start=start, end=end)
+        self.assertTrue(isclose(summary["total_spend"], spend, rel_tol=1e-9))
+        self.assertTrue(isclose(summary["total_conversions"], conversions, rel_tol=1e-9))
+        self.assertTrue(isclose(summary["roas"], revenue / spend, rel_tol=1e-9))
+        self.assertEqual(len(summary["insights"]), 3)
+
+        totals = self.service.get_channel_totals(start=start, end=end)
+        channel1 = sum(record.channels[1].spend for record in series)
+        self.assertTrue(isclose(totals["channel1"]["spend"], channel1, rel_tol=1e-9))
+        self.assertTrue(
+            isclose(totals["channel1"]["average_weekly_spend"], channel1 / len(series), rel_tol=1e-9)
+        )
+
+    def test_trailing_weeks_window(self) -> None:
+        series = self.service.get_national_series()
+        trailing = self.service.get_summary_metrics(weeks=4)
+        expected = sum(channel.spend for record in series[-4:] for channel in record.channels)
+        self.assertTrue(isclose(trailing["total_spend"], expected, rel_tol=1e-9))
+        self.assertEqual(
+            trailing["recent_conversion_lift"],
+            self.service.get_summary_metrics()["recent_conversion_lift"],
+        )
+        everything = self.service.get_summary_metrics(weeks=len(series) + 10)
+        self.assertTrue(
+            isclose(
+                everything["total_spend"],
+                self.service.get_summary_metrics()["total_spend"],
+                rel_tol=1e-9,
+            )
+        )
+
     def test_simulate_budget_shift_respects_total_spend(self) -> None:
         summary = self.service.get_summary_metrics()
         base_totals = self.service.get_channel_totals()
@@ -62,6 +218,348 @@ class MarketingMixServiceTests(unittest.TestCase):
         self.assertLess(updated["channel0"]["spend"], base_totals["channel0"]["spend"])
         self.assertGreater(updated["channel1"]["spend"], base_totals["channel1"]["spend"])
 
+    def test_batch_shifts_match_single_shifts(self) -> None:
+        shifts = [
+            ("channel0", "channel1", 0.1),
+            ("channel3", "channel2", 0.5),
+            ("channel4", "channel0", 0.0),
+        ]
+        batch = self.service.simulate_budget_shifts(shifts)
+        channel_ids = list(self.service.get_channel_totals())
+        for row, shift in enumerate(shifts):
+            single = self.service.simulate_budget_shift(*shift)
+            for col, channel_id in enumerate(channel_ids):
+                for field in ("spend", "estimated_conversions", "estimated_revenue", "roas"):
+                    expected = single[channel_id][field]
+                    self.assertTrue(isclose(getattr(batch, field)[row, col], expected, rel_tol=1e-9))
+
+        matrices = np.zeros((1, len(channel_ids), len(channel_ids)))
+        matrices[0, 0, 1] = 0.1
+        reallocated = self.service.simulate_reallocations(matrices)
+        np.testing.assert_allclose(reallocated.spend[0], batch.spend[0])
+
+    def test_batch_shifts_reject_invalid_scenarios(self) -> None:
+        with self.assertRaises(HTTPException) as ctx:
+            self.service.simulate_budget_shifts(
+                [("channel0", "channel1", 0.1), ("channel0", "channel1", 0.6)]
+            )
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertIn("scenario 1", ctx.exception.detail)
+        with self.assertRaises(HTTPException) as ctx:
+            self.service.simulate_budget_shifts([("channel0", "channel99", 0.1)])
+        self.assertEqual(ctx.exception.status_code, 404)
+        with self.assertRaises(HTTPException):
+            self.service.simulate_reallocations(np.full((1, 5, 5), 0.3))
+
+
+class ColumnarBackendTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.records = MarketingMixService(backend="records")
+        cls.columnar = MarketingMixService(backend="columnar")
+
+    def test_records_are_built_on_first_use_only(self) -> None:
+        service = MarketingMixService(backend="records")
+        self.assertEqual(service._records, {})
+        service.get_summary_metrics()
+        service.geo_metadata()
+        self.assertEqual(service._records, {})
+
+        geo = service.list_geos()[0]
+        first = service.get_geo_series(geo)
+        self.assertEqual(list(service._records), [geo])
+        self.assertIs(service.get_geo_series(geo)[0], first[0])
+
+    def test_geo_metadata_matches_records_backend(self) -> None:
+        self.assertEqual(self.columnar.geo_metadata(), self.records.geo_metadata())
+
+    def test_geo_series_matches_records_backend(self) -> None:
+        geo = self.records.list_geos()[0]
+        kwargs = {"start": date(2022, 1, 1), "end": date(2022, 6, 30), "channels": ["channel1", "3"]}
+        self.assertEqual(
+            _rows(self.columnar.get_geo_series(geo, **kwargs)),
+            _rows(self.records.get_geo_series(geo, **kwargs)),
+        )
+
+    def test_geo_frame_is_columnar(self) -> None:
+        geo = self.columnar.list_geos()[0]
+        frame = self.columnar.get_geo_frame(geo)
+        self.assertEqual(frame.spend.shape, (len(frame), 5))
+        self.assertEqual(frame.times.dtype.kind, "M")
+        self.assertEqual(len(frame), self.columnar.get_geo_sample_size(geo))
+
+    def test_date_window_is_a_view(self) -> None:
+        geo = self.columnar.list_geos()[0]
+        full = self.columnar.get_geo_frame(geo)
+        window = self.columnar.get_geo_frame(geo, start=date(2022, 1, 1), end=date(2022, 3, 31))
+        self.assertTrue(0 < len(window) < len(full))
+        self.assertTrue(np.shares_memory(window.spend, full.spend))
+        self.assertTrue((window.times >= np.datetime64("2022-01-01")).all())
+        self.assertTrue((window.times <= np.datetime64("2022-03-31")).all())
+
+    def test_summary_and_totals_match_records_backend(self) -> None:
+        expected = self.records.get_summary_metrics()
+        actual = self.columnar.get_summary_metrics()
+        for key in ("total_spend", "total_conversions", "total_revenue", "roas", "cac",
+                    "promo_rate", "recent_conversion_lift", "recent_spend_lift"):
+            self.assertTrue(isclose(actual[key], expected[key], rel_tol=1e-9), key)
+
+        expected_totals = self.records.get_channel_totals()
+        for channel_id, metrics in self.columnar.get_channel_totals().items():
+            self.assertTrue(isclose(metrics["spend"], expected_totals[channel_id]["spend"], rel_tol=1e-9))
+            self.assertTrue(
+                isclose(metrics["spend_share"], expected_totals[channel_id]["spend_share"], rel_tol=1e-9)
+            )
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self._tmp.name) / "data"
+        self.data_dir.mkdir()
+        source_dir = Path(__file__).resolve().parent.parent / "data"
+        for name in DATA_FILENAMES.values():
+            shutil.copy2(source_dir / name, self.data_dir / name)
+        self.snapshot_dir = Path(self._tmp.name) / "snapshot"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _service(self, **kwargs) -> MarketingMixService:
+        return MarketingMixService(
+            data_dir=self.data_dir, use_snapshot=True, snapshot_dir=self.snapshot_dir, **kwargs
+        )
+
+    def test_snapshot_round_trip_matches_csv(self) -> None:
+        built = self._service(backend="columnar")
+        self.assertTrue((self.snapshot_dir / "manifest.json").exists())
+
+        loaded = self._service(backend="columnar")
+        geo = built.list_geos()[0]
+        self.assertEqual(loaded.list_geos(), built.list_geos())
+        self.assertEqual(loaded.get_geo_series(geo), built.get_geo_series(geo))
+        self.assertEqual(loaded.get_summary_metrics(), built.get_summary_metrics())
+
+        records = self._service(backend="records")
+        self.assertEqual(records.get_geo_series(geo), built.get_geo_series(geo))
+
+    def test_mmap_mode_serves_from_snapshot(self) -> None:
+        heap = self._service(backend="columnar")
+        mapped = self._service(backend="columnar", mmap=True)
+        self.assertFalse(heap.memory_mapped)
+        self.assertTrue(mapped.memory_mapped)
+
+        geo = heap.list_geos()[0]
+        self.assertEqual(mapped.get_geo_series(geo), heap.get_geo_series(geo))
+        self.assertEqual(mapped.get_summary_metrics(), heap.get_summary_metrics())
+
+    def test_mmap_mode_requires_columnar_backend(self) -> None:
+        with self.assertRaises(ValueError):
+            self._service(backend="records", mmap=True)
+
+    def test_touched_but_unchanged_source_stays_fresh(self) -> None:
+        self._service(backend="columnar")
+        snapshots = sorted(p.name for p in self.snapshot_dir.glob("snapshot-*"))
+
+        nat_path = self.data_dir / DATA_FILENAMES["national"]
+        os.utime(nat_path, ns=(0, 0))
+        self._service(backend="columnar")
+        self.assertEqual(sorted(p.name for p in self.snapshot_dir.glob("snapshot-*")), snapshots)
+
+    def test_stale_snapshot_is_rebuilt(self) -> None:
+        first = self._service(backend="columnar")
+        nat_path = self.data_dir / DATA_FILENAMES["national"]
+        lines = nat_path.read_text().splitlines(keepends=True)
+        nat_path.write_text("".join(lines[:-1]))
+
+        second = self._service(backend="columnar")
+        self.assertEqual(
+            len(second.get_national_series()), len(first.get_national_series()) - 1
+        )
+        # The replaced snapshot is kept for its grace period.
+        self.assertEqual(len(list(self.snapshot_dir.glob("snapshot-*"))), 2)
+        third = self._service(backend="columnar")
+        self.assertEqual(len(third.get_national_series()), len(second.get_national_series()))
+
+    def test_replaced_snapshot_survives_a_concurrent_loader(self) -> None:
+        self._service(backend="columnar", mmap=True)
+        nat_path = self.data_dir / DATA_FILENAMES["national"]
+        lines = nat_path.read_text().splitlines(keepends=True)
+        check = marketing_mix_snapshot._current_fingerprints
+        loaders = []
+
+        def publish_after_check(recorded, sources):
+            # The first loader has validated the old manifest; a second loader
+            # now sees rewritten data and publishes (and prunes) before the
+            # first one opens its arrays.
+            fingerprints = check(recorded, sources)
+            if not loaders:
+                loaders.append(None)
+                nat_path.write_text("".join(lines[:-1]))
+                loaders[0] = self._service(backend="columnar", mmap=True)
+            return fingerprints
+
+        with mock.patch.object(marketing_mix_snapshot, "_current_fingerprints", publish_after_check):
+            first = self._service(backend="columnar", mmap=True)
+        second = loaders[0]
+        self.assertTrue(first.memory_mapped)
+        self.assertEqual(len(first.get_national_series()), len(lines) - 1)
+        self.assertEqual(len(second.get_national_series()), len(lines) - 2)
+        self.assertEqual(len(list(self.snapshot_dir.glob("snapshot-*"))), 2)
+
+        # Past the grace period the next publish removes the replaced snapshot.
+        with mock.patch.object(marketing_mix_snapshot, "PRUNE_GRACE_SECONDS", 0):
+            nat_path.write_text("".join(lines[:-2]))
+            self._service(backend="columnar", mmap=True)
+        self.assertEqual(len(list(self.snapshot_dir.glob("snapshot-*"))), 1)
+
+
+class ReloadTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self._tmp.name) / "data"
+        self.data_dir.mkdir()
+        source_dir = Path(__file__).resolve().parent.parent / "data"
+        for name in DATA_FILENAMES.values():
+            shutil.copy2(source_dir / name, self.data_dir / name)
+        self.snapshot_dir = Path(self._tmp.name) / "snapshot"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _append_week(self, kind: str) -> None:
+        """Append a copy of the last week's rows, one week later."""
+        path = self.data_dir / DATA_FILENAMES[kind]
+        text = path.read_text()
+        header, *rows = text.splitlines()
+        time_idx = header.split(",").index("time")
+        last = max(row.split(",")[time_idx] for row in rows)
+        next_week = (date.fromisoformat(last) + timedelta(weeks=1)).isoformat()
+        appended = []
+        for row in rows:
+            cells = row.split(",")
+            if cells[time_idx] == last:
+                cells[time_idx] = next_week
+                appended.append(",".join(cells))
+        with path.open("a") as fh:
+            fh.write(("" if text.endswith("\n") else "\n") + "\n".join(appended) + "\n")
+
+    def test_append_extends_a_new_generation(self) -> None:
+        for backend in ("records", "columnar"):
+            with self.subTest(backend=backend):
+                datasets = MarketingMixDatasets(
+                    MarketingMixService(
+                        data_dir=self.data_dir,
+                        backend=backend,
+                        snapshot_dir=self.snapshot_dir / backend,
+                    )
+                )
+                first = datasets.current
+                self.assertEqual(datasets.reload()["status"], "unchanged")
+
+                self._append_week("geo")
+                self._append_week("national")
+                result = datasets.reload()
+                self.assertEqual(result["status"], "appended")
+                self.assertEqual(result["generation"], first.generation + 1)
+
+                current = datasets.current
+                fresh = MarketingMixService(data_dir=self.data_dir, backend=backend, use_snapshot=False)
+                geo = fresh.list_geos()[0]
+                self.assertEqual(_rows(current.get_geo_series(geo)), _rows(fresh.get_geo_series(geo)))
+                self.assertTrue(
+                    np.array_equal(
+                        current.get_geo_view(geo).lift_vs_prev,
+                        fresh.get_geo_view(geo).lift_vs_prev,
+                        equal_nan=True,
+                    )
+                )
+                self.assertEqual(current.get_summary_metrics(), fresh.get_summary_metrics())
+                self.assertEqual(current.get_channel_totals(), fresh.get_channel_totals())
+                # The previous generation is untouched for requests still using it.
+                self.assertEqual(
+                    len(first.get_national_series()) + 1, len(current.get_national_series())
+                )
+
+    def test_loaded_frames_keep_the_fingerprints_they_were_validated_with(self) -> None:
+        MarketingMixService(data_dir=self.data_dir, snapshot_dir=self.snapshot_dir)
+        unpack = marketing_mix_snapshot._unpack_frames
+        published = []
+
+        def publish_meanwhile(*args):
+            # Another worker appends a week and publishes its manifest mid-load.
+            if not published:
+                self._append_week("national")
+                manifest_path = self.snapshot_dir / marketing_mix_snapshot.MANIFEST_NAME
+                manifest = json.loads(manifest_path.read_text())
+                nat_path = self.data_dir / DATA_FILENAMES["national"]
+                manifest["sources"]["national"] = fingerprint(nat_path)
+                write_json_atomic(manifest_path, manifest)
+                published.append(True)
+            return unpack(*args)
+
+        with mock.patch.object(marketing_mix_snapshot, "_unpack_frames", publish_meanwhile):
+            datasets = MarketingMixDatasets(
+                MarketingMixService(data_dir=self.data_dir, snapshot_dir=self.snapshot_dir)
+            )
+        before = len(datasets.current.get_national_series())
+        self.assertEqual(datasets.reload()["status"], "appended")
+        self.assertEqual(len(datasets.current.get_national_series()), before + 1)
+
+    def test_rewrite_rebuilds(self) -> None:
+        datasets = MarketingMixDatasets(
+            MarketingMixService(data_dir=self.data_dir, snapshot_dir=self.snapshot_dir)
+        )
+        nat_path = self.data_dir / DATA_FILENAMES["national"]
+        lines = nat_path.read_text().splitlines(keepends=True)
+        nat_path.write_text("".join(lines[:-1]))
+
+        before = len(datasets.current.get_national_series())
+        self.assertEqual(datasets.reload()["status"], "rebuilt")
+        self.assertEqual(len(datasets.current.get_national_series()), before - 1)
+        self.assertEqual(datasets.reload(force=True)["status"], "rebuilt")
+        self.assertEqual(datasets.current.generation, 3)
+
+    def test_forced_rebuilds_are_rate_limited(self) -> None:
+        datasets = MarketingMixDatasets(
+            MarketingMixService(data_dir=self.data_dir, snapshot_dir=self.snapshot_dir),
+            force_interval=3600,
+        )
+        self.assertEqual(datasets.reload(force=True)["status"], "rebuilt")
+        self.assertEqual(datasets.reload(force=True)["status"], "unchanged")
+        self._append_week("national")
+        self.assertEqual(datasets.reload(force=True)["status"], "appended")
+        self.assertEqual(datasets.current.generation, 3)
+
+    def test_forced_reload_reparses_and_replaces_a_bad_snapshot(self) -> None:
+        expected = MarketingMixService(
+            data_dir=self.data_dir, backend="columnar", snapshot_dir=self.snapshot_dir
+        ).get_summary_metrics()["total_spend"]
+        manifest = json.loads((self.snapshot_dir / "manifest.json").read_text())
+        spend_path = self.snapshot_dir / manifest["snapshot"] / "national.spend.npy"
+        np.save(spend_path, np.load(spend_path) * 2)
+
+        def load() -> MarketingMixService:
+            return MarketingMixService(
+                data_dir=self.data_dir, backend="columnar", snapshot_dir=self.snapshot_dir
+            )
+
+        datasets = MarketingMixDatasets(load())
+        self.assertAlmostEqual(datasets.current.get_summary_metrics()["total_spend"], 2 * expected)
+        self.assertEqual(datasets.reload(force=True)["status"], "rebuilt")
+        self.assertAlmostEqual(datasets.current.get_summary_metrics()["total_spend"], expected)
+        self.assertAlmostEqual(load().get_summary_metrics()["total_spend"], expected)
+
+    def test_overlapping_append_rebuilds(self) -> None:
+        datasets = MarketingMixDatasets(
+            MarketingMixService(data_dir=self.data_dir, snapshot_dir=self.snapshot_dir)
+        )
+        nat_path = self.data_dir / DATA_FILENAMES["national"]
+        lines = nat_path.read_text().splitlines()
+        with nat_path.open("a") as fh:
+            fh.write(lines[-1] + "\n")  # a week that is already loaded
+        self.assertEqual(datasets.reload()["status"], "rebuilt")
+
 
 if __name__ == "__main__":
     unittest.main()
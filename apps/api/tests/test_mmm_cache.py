@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mmm_cache import AnalyzerResultCache, model_digest
+
+
+class AnalyzerResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.model_path = self.root / "saved_mmm.pkl"
+        self.model_path.write_bytes(b"model-v1")
+        self.cache_dir = self.root / "cache"
+        self.calls = 0
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _compute(self) -> dict:
+        self.calls += 1
+        return {"values": np.arange(6.0).reshape(2, 3), "channel": np.array(["tv", "search"])}
+
+    def _cache(self) -> AnalyzerResultCache:
+        return AnalyzerResultCache(self.cache_dir, model_digest(self.model_path, self.cache_dir))
+
+    def test_results_survive_a_new_cache_instance(self) -> None:
+        first = self._cache().get_or_compute("curves", {"confidence_level": 0.9}, self._compute)
+        # A fresh instance stands in for a restarted process or another worker.
+        second = self._cache().get_or_compute("curves", {"confidence_level": 0.9}, self._compute)
+
+        self.assertEqual(self.calls, 1)
+        np.testing.assert_array_equal(first["values"], second["values"])
+        self.assertEqual(second["channel"].tolist(), ["tv", "search"])
+        self.assertIsInstance(second["values"], np.memmap)
+
+        self._cache().get_or_compute("curves", {"confidence_level": 0.8}, self._compute)
+        self.assertEqual(self.calls, 2)
+
+    def test_changing_the_model_invalidates_and_prunes(self) -> None:
+        old = self._cache()
+        old.get_or_compute("curves", {}, self._compute)
+
+        self.model_path.write_bytes(b"model-v2")
+        new = self._cache()
+        self.assertNotEqual(new.model_dir, old.model_dir)
+        new.prune()
+        self.assertFalse(old.model_dir.exists())
+
+        new.get_or_compute("curves", {}, self._compute)
+        self.assertEqual(self.calls, 2)
+
+    def test_digest_reuses_the_recorded_hash_while_the_file_is_unchanged(self) -> None:
+        digest = model_digest(self.model_path, self.cache_dir)
+        stamp = (self.cache_dir / "model.json").read_text()
+        self.assertEqual(model_digest(self.model_path, self.cache_dir), digest)
+        self.assertEqual((self.cache_dir / "model.json").read_text(), stamp)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mmm_contributions import ContributionPosterior
+
+
+class ContributionPosteriorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        rng = np.random.default_rng(0)
+        cls.draws = rng.gamma(2.0, 10.0, size=(2, 50, 20, 3))  # chains, draws, times, channels
+        cls.times = pd.date_range("2024-01-01", periods=20, freq="W-MON")
+        cls.posterior = ContributionPosterior.from_draws(
+            cls.draws, cls.times, ["tv", "search", "social"]
+        )
+
+    def test_window_summary_matches_masking_the_full_tensor(self) -> None:
+        start, end = "2024-02-01", "2024-03-31"
+        mask = (self.times >= pd.Timestamp(start)) & (self.times <= pd.Timestamp(end))
+        window = self.draws[:, :, mask, :]
+
+        summary = self.posterior.summarize(start, end, 0.8)
+        self.assertTrue(summary.times.equals(self.times[mask]))
+        np.testing.assert_allclose(summary.mean, window.mean(axis=(0, 1)))
+        np.testing.assert_allclose(summary.lower, np.quantile(window, 0.1, axis=(0, 1)))
+        np.testing.assert_allclose(summary.upper, np.quantile(window, 0.9, axis=(0, 1)))
+
+        totals = window.sum(axis=3)
+        np.testing.assert_allclose(summary.total_mean, totals.mean(axis=(0, 1)))
+        np.testing.assert_allclose(summary.total_lower, np.quantile(totals, 0.1, axis=(0, 1)))
+        np.testing.assert_allclose(summary.total_upper, np.quantile(totals, 0.9, axis=(0, 1)))
+        # Summing per-channel bounds would overstate the spread of the total.
+        self.assertTrue(np.all(summary.total_lower > summary.lower.sum(axis=1)))
+
+    def test_quantiles_match_numpy_for_any_interval(self) -> None:
+        flat = self.draws.reshape(-1, 20, 3)
+        for interval in (0.5, 0.9, 0.99):
+            summary = self.posterior.summarize(None, None, interval)
+            q = (1 - interval) / 2
+            np.testing.assert_allclose(summary.lower, np.quantile(flat, q, axis=0))
+            np.testing.assert_allclose(summary.upper, np.quantile(flat, 1 - q, axis=0))
+
+    def test_open_and_empty_windows(self) -> None:
+        self.assertEqual(len(self.posterior.summarize(None, None, 0.9).times), 20)
+        self.assertEqual(len(self.posterior.summarize("2030-01-01", None, 0.9).times), 0)
+        self.assertEqual(len(self.posterior.summarize("2024-03-01", "2024-02-01", 0.9).times), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
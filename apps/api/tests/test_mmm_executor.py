@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mmm_executor import (
+    ComputeExecutor,
+    ComputeTimeout,
+    ExecutorSaturated,
+    ExecutorUnavailable,
+)
+
+_initialized_in = None
+
+
+def _initialize_worker() -> None:
+    global _initialized_in
+    _initialized_in = os.getpid()
+
+
+def _crash() -> None:
+    os._exit(1)
+
+
+def _worker_pid() -> int:
+    assert _initialized_in == os.getpid(), "initializer did not run in this worker"
+    return os.getpid()
+
+
+class ComputeExecutorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = ComputeExecutor(workers=1, queue_limit=1, name="test")
+        self.release = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.executor.shutdown()
+
+    def test_rejects_work_beyond_workers_plus_queue(self) -> None:
+        async def scenario() -> None:
+            running = asyncio.ensure_future(self.executor.run(self.release.wait))
+            queued = asyncio.ensure_future(self.executor.run(lambda: "queued"))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(ExecutorSaturated):
+                await self.executor.run(lambda: "rejected")
+
+            self.release.set()
+            self.assertTrue(await running)
+            self.assertEqual(await queued, "queued")
+            # Capacity is back once the jobs finish.
+            self.assertEqual(await self.executor.run(lambda: "accepted"), "accepted")
+
+        asyncio.run(scenario())
+        stats = self.executor.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_timeout_keeps_the_slot_until_the_job_finishes(self) -> None:
+        async def scenario() -> None:
+            with self.assertRaises(ComputeTimeout):
+                await self.executor.run(self.release.wait, timeout=0.05)
+            self.assertEqual(self.executor.stats()["in_flight"], 1)
+            self.release.set()
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.executor.stats()["in_flight"], 0)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.executor.stats()["timed_out"], 1)
+
+
+class ProcessExecutorTests(unittest.TestCase):
+    def test_workers_run_the_initializer_and_are_recycled(self) -> None:
+        executor = ComputeExecutor(
+            workers=1,
+            queue_limit=0,
+            name="test",
+            processes=True,
+            initializer=_initialize_worker,
+            max_tasks_per_worker=2,
+        )
+        try:
+            async def scenario() -> list:
+                return [await executor.run(_worker_pid, timeout=30) for _ in range(4)]
+
+            pids = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        self.assertNotIn(os.getpid(), pids)
+        # One worker, replaced after every two jobs.
+        self.assertEqual(len(set(pids)), 2)
+        self.assertEqual(executor.stats()["completed"], 4)
+
+    def test_a_crashed_worker_rebuilds_the_pool(self) -> None:
+        executor = ComputeExecutor(
+            workers=1, queue_limit=0, name="test", processes=True, initializer=_initialize_worker
+        )
+        try:
+            async def scenario() -> int:
+                with self.assertRaises(ExecutorUnavailable):
+                    await executor.run(_crash, timeout=30)
+                return await executor.run(_worker_pid, timeout=30)
+
+            self.assertNotEqual(asyncio.run(scenario()), os.getpid())
+        finally:
+            executor.shutdown()
+        self.assertEqual(executor.stats()["restarts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
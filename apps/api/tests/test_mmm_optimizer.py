@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+import itertools
+
+import numpy as np
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mmm_optimizer import OptimizationError, ResponseCurveTable, optimize_budget
+
+
+def _hill_table(channels: int, seed: int = 0) -> ResponseCurveTable:
+    """Synthetic Hill-shaped curves on a 0-3x multiplier grid, like the cached MMM curves."""
+    rng = np.random.default_rng(seed)
+    baseline = rng.uniform(1e5, 1e6, channels)
+    half = baseline * rng.uniform(0.5, 2.0, channels)
+    top = baseline * rng.uniform(1.0, 4.0, channels)
+    shape = rng.uniform(1.0, 3.0, channels)[:, None]
+    spend = baseline[:, None] * np.linspace(0, 3, 61)
+    mean = top[:, None] * spend**shape / (spend**shape + half[:, None] ** shape)
+    return ResponseCurveTable(
+        channels=tuple(f"channel{i}" for i in range(channels)),
+        spend=spend,
+        mean=mean,
+        lower=mean * 0.8,
+        upper=mean * 1.2,
+        baseline_spend=baseline,
+        credible_interval=0.9,
+    )
+
+
+class BudgetOptimizerTests(unittest.TestCase):
+    def test_matches_brute_force_on_the_grid(self) -> None:
+        table = _hill_table(3)
+        budget = float(table.baseline_spend.sum())
+        allocation = optimize_budget(table, budget, steps=60)
+
+        unit = budget / 60
+        best = -np.inf
+        for split in itertools.product(range(61), repeat=2):
+            if sum(split) > 60:
+                continue
+            spend = np.array([*split, 60 - sum(split)]) * unit
+            best = max(best, float(table.outcome(spend).sum()))
+        self.assertAlmostEqual(allocation.expected_outcome, best, places=4)
+        self.assertAlmostEqual(float(allocation.spend.sum()), budget, places=4)
+        self.assertGreaterEqual(allocation.expected_outcome, allocation.baseline_outcome - 1e-6)
+
+    def test_respects_channel_bounds(self) -> None:
+        table = _hill_table(5, seed=1)
+        budget = float(table.baseline_spend.sum())
+        bounds = {"channel0": (budget * 0.3, None), "channel1": (None, 1000.0)}
+        allocation = optimize_budget(table, budget, bounds)
+
+        self.assertGreaterEqual(allocation.spend[0], budget * 0.3 - 1e-6)
+        self.assertLessEqual(allocation.spend[1], 1000.0 + 1e-6)
+        self.assertTrue(np.all(allocation.spend <= table.spend.max(axis=1) + 1e-6))
+        self.assertAlmostEqual(float(allocation.spend.sum()), budget, places=2)
+
+    def test_rejects_infeasible_requests(self) -> None:
+        table = _hill_table(3)
+        with self.assertRaises(OptimizationError):
+            optimize_budget(table, 100.0, {"channel0": (200.0, None)})
+        with self.assertRaises(OptimizationError):
+            optimize_budget(table, float(table.spend.max(axis=1).sum()) * 2)
+        with self.assertRaises(OptimizationError):
+            optimize_budget(table, 100.0, {"unknown": (None, None)})
+        with self.assertRaises(OptimizationError):
+            optimize_budget(table, 100.0, {"channel0": (50.0, 10.0)})
+
+
+if __name__ == "__main__":
+    unittest.main()
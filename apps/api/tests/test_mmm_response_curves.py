@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mmm_response_curves import ResponseCurveCube, ResponseCurveError, curve_markers
+
+
+class ResponseCurveCubeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(7)
+        self.multipliers = np.linspace(0, 3, 31)
+        scale = rng.uniform(0.5, 1.5, size=(400, 1, 3))
+        # Concave curves per channel, one draw per row.
+        self.draws = scale * np.log1p(self.multipliers[None, :, None] * [[[1.0, 2.0, 4.0]]])
+        self.spend = np.array([100.0, 50.0, 10.0])
+        self.cube = ResponseCurveCube.from_draws(
+            self.draws, self.multipliers, self.spend, ["tv", "search", "social"]
+        )
+
+    def test_grid_points_match_direct_quantiles(self) -> None:
+        curves = self.cube.curves(self.multipliers, 0.8)
+
+        self.assertEqual(curves["channel"].tolist(), ["tv", "search", "social"])
+        self.assertEqual(curves["mean"].shape, (3, 31))
+        np.testing.assert_allclose(curves["mean"], self.draws.mean(axis=0).T)
+        np.testing.assert_allclose(curves["ci_lo"], np.quantile(self.draws, 0.1, axis=0).T)
+        np.testing.assert_allclose(curves["ci_hi"], np.quantile(self.draws, 0.9, axis=0).T)
+        np.testing.assert_allclose(curves["spend"], self.spend[:, None] * self.multipliers)
+
+    def test_resamples_any_grid_and_channel_subset(self) -> None:
+        targets = np.linspace(0, 2, 400)
+        curves = self.cube.curves(targets, 0.95, ["social", "tv"])
+
+        self.assertEqual(curves["channel"].tolist(), ["social", "tv"])
+        self.assertEqual(curves["mean"].shape, (2, 400))
+        np.testing.assert_allclose(curves["spend"][1], 100.0 * targets)
+        # Between grid points the curve is interpolated, never outside its neighbours.
+        grid = self.cube.curves(self.multipliers, 0.95, ["social"])["ci_hi"][0]
+        self.assertLessEqual(curves["ci_hi"][0].max(), grid[self.multipliers <= 2].max())
+        self.assertTrue(np.all(curves["ci_lo"] <= curves["mean"]))
+        self.assertTrue(np.all(curves["mean"] <= curves["ci_hi"]))
+
+    def test_unsorted_multipliers_are_ordered(self) -> None:
+        order = np.arange(31)[::-1]
+        cube = ResponseCurveCube.from_draws(
+            self.draws[:, order], self.multipliers[order], self.spend, ["tv", "search", "social"]
+        )
+        np.testing.assert_allclose(cube.mean, self.cube.mean)
+        np.testing.assert_allclose(cube.multipliers, self.multipliers)
+
+    def test_adaptive_grid_beats_uniform_at_the_same_budget(self) -> None:
+        fine = np.linspace(0, 3, 3001)
+        truth = np.interp(fine, self.cube.multipliers, self.cube.mean[:, 2])
+
+        def max_error(multipliers: np.ndarray) -> float:
+            mean = self.cube.curves(multipliers, 0.9, ["social"])["mean"][0]
+            return float(np.abs(np.interp(fine, multipliers, mean) - truth).max())
+
+        adaptive = self.cube.adaptive_multipliers("social", 16, 3.0)
+        self.assertEqual(len(adaptive), 16)
+        self.assertEqual((adaptive[0], adaptive[-1]), (0.0, 3.0))
+        self.assertTrue(np.all(np.diff(adaptive) > 0))
+        # The knee of log1p(4m) is near zero, so points gather there.
+        self.assertGreater(np.sum(adaptive < 1.0), np.sum(adaptive > 2.0))
+        self.assertLess(max_error(adaptive), max_error(np.linspace(0, 3, 16)))
+
+    def test_spend_max_maps_to_a_multiplier_within_the_cube(self) -> None:
+        self.assertAlmostEqual(self.cube.max_multiplier("tv", 150.0), 1.5)
+        with self.assertRaises(ResponseCurveError):
+            self.cube.max_multiplier("social", 31.0)
+
+    def test_markers_ignore_the_zero_spend_point(self) -> None:
+        spend = np.array([0.0, 1.0, 2.0, 4.0, 8.0])
+        mean = np.array([0.0, 1.0, 1.8, 2.0, 2.4])
+        saturation, diminishing = curve_markers(spend, mean)
+        self.assertEqual(saturation, 4.0)
+        self.assertEqual(diminishing, 0.0)
+
+    def test_markers_are_vectorized_over_leading_axes(self) -> None:
+        curves = self.cube.curves(np.linspace(0, 2, 50), 0.9)
+        saturation, diminishing = curve_markers(curves["spend"], curves["mean"])
+        for row in range(3):
+            single = curve_markers(curves["spend"][row], curves["mean"][row])
+            self.assertEqual((saturation[row], diminishing[row]), single)
+
+    def test_analytics_saturation_band_comes_from_per_draw_curves(self) -> None:
+        targets = np.linspace(0, 2, 400)
+        analytics = self.cube.analytics(targets, 0.8, ["search", "tv"])
+
+        # Brute force: resample every draw and mark it.
+        draws = np.stack(
+            [
+                np.interp(targets, self.multipliers, self.draws[s, :, col])
+                for s in range(self.draws.shape[0])
+                for col in (1, 0)
+            ]
+        ).reshape(-1, 2, 400)
+        per_draw, _ = curve_markers(self.spend[[1, 0], None] * targets, draws)
+        np.testing.assert_allclose(analytics.saturation_lower, np.quantile(per_draw, 0.1, axis=0))
+        np.testing.assert_allclose(analytics.saturation_upper, np.quantile(per_draw, 0.9, axis=0))
+        self.assertEqual(analytics.channels, ("search", "tv"))
+        self.assertTrue(np.all(analytics.saturation_lower <= analytics.saturation_upper))
+        # search is scale * log1p(2m) on spend 50m: slope 2/3 * scale / 50 at m=1.
+        scale = self.draws[:, -1, 1].mean() / np.log1p(6)
+        self.assertAlmostEqual(analytics.marginal_roi[0], 2 / 3 * scale / 50, delta=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add the parent directory to the Python path so we can import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.single_flight import SingleFlightCache
+
+
+class SingleFlightCacheTests(unittest.TestCase):
+    def test_concurrent_requests_share_one_computation(self) -> None:
+        cache = SingleFlightCache(ttl=60)
+        calls = []
+
+        async def compute() -> dict:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": len(calls)}
+
+        async def scenario() -> list:
+            results = await asyncio.gather(
+                *(cache.get(("curves", 0.9), compute) for _ in range(20))
+            )
+            results.append(await cache.get(("curves", 0.9), compute))
+            results.append(await cache.get(("curves", 0.8), compute))
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(result == {"value": 1} for result in results[:21]))
+        self.assertEqual(
+            cache.stats()["endpoints"]["curves"], {"hit": 1, "miss": 2, "coalesced": 19}
+        )
+
+    def test_failures_and_expired_entries_are_recomputed(self) -> None:
+        cache = SingleFlightCache(ttl=0)
+        calls = []
+
+        async def flaky() -> str:
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        async def scenario() -> None:
+            with self.assertRaises(RuntimeError):
+                await cache.get(("chart",), flaky)
+            self.assertEqual(await cache.get(("chart",), flaky), "ok")
+            self.assertEqual(await cache.get(("chart",), flaky), "ok")
+
+        asyncio.run(scenario())
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(cache.stats()["endpoints"]["chart"]["miss"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,8 +9,15 @@ export interface TimeSeriesDatum {
   value: number
 }
 
+/** Parallel arrays as returned by the `format=columnar` endpoints; null values are skipped. */
+export interface TimeSeriesColumns {
+  time: string[]
+  value: (number | null)[]
+}
+
 interface TimeSeriesChartProps {
-  data: TimeSeriesDatum[]
+  data?: TimeSeriesDatum[]
+  columns?: TimeSeriesColumns
   height?: number
   color?: string
   showArea?: boolean
@@ -27,6 +34,7 @@ const PADDING = { top: 24, right: 24, bottom: 36, left: 48 }
 
 export function TimeSeriesChart({
   data,
+  columns,
   height = DEFAULT_HEIGHT,
   color = "#34d399",
   showArea = false,
@@ -41,7 +49,21 @@ export function TimeSeriesChart({
   const [hoverIndex, setHoverIndex] = useState<number | null>(null)
 
   const { points, areaPath, linePath, minY, maxY, minX, maxX } = useMemo(() => {
-    if (!data.length) {
+    const parsed: { time: Date; value: number }[] = []
+    if (columns) {
+      for (let index = 0; index < columns.time.length; index += 1) {
+        const value = columns.value[index]
+        if (value !== null && value !== undefined) {
+          parsed.push({ time: new Date(columns.time[index]!), value })
+        }
+      }
+    } else {
+      for (const item of data ?? []) {
+        parsed.push({ time: new Date(item.time), value: item.value })
+      }
+    }
+
+    if (!parsed.length) {
       return {
         points: [],
         areaPath: "",
@@ -53,11 +75,6 @@ export function TimeSeriesChart({
       }
     }
 
-    const parsed = data.map((item) => ({
-      time: new Date(item.time),
-      value: item.value,
-    }))
-
     const minY = Math.min(...parsed.map((p) => p.value))
     const maxY = Math.max(...parsed.map((p) => p.value))
     const minX = Math.min(...parsed.map((p) => p.time.getTime()))
@@ -108,7 +125,7 @@ export function TimeSeriesChart({
       : ""
 
     return { points, areaPath, linePath, minY, maxY, minX, maxX }
-  }, [data, height, showArea, width])
+  }, [columns, data, height, showArea, width])
 
   const handleMouseMove = (event: React.MouseEvent<SVGRectElement>) => {
     if (!points.length) return
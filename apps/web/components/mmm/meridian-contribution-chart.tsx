@@ -5,7 +5,7 @@ import type { Result as VegaEmbedResult } from "vega-embed"
 import { getMMMContributionChart, MMMResponseCurvesVegaChart } from "@/lib/api/mmm"
 
 interface MeridianContributionChartProps {
-  timeGranularity?: "weekly" | "monthly" | "quarterly"
+  timeGranularity?: "weekly" | "quarterly"
 }
 
 interface ResponseCacheEntry {
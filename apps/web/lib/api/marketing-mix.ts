@@ -27,6 +27,55 @@ export interface GeoSeriesResponse {
   points: GeoMetricPoint[]
 }
 
+export interface ChannelColumns {
+  id: string
+  name: string
+  spend: number[]
+  impressions: number[]
+  organic_impressions: (number | null)[]
+}
+
+export interface SeriesColumns {
+  start: string
+  end: string
+  time: string[]
+  conversions: (number | null)[]
+  revenue_per_conversion: (number | null)[]
+  competitor_sales_control: (number | null)[]
+  sentiment_score_control: (number | null)[]
+  promo: (number | null)[]
+  total_spend: number[]
+  spend_efficiency: (number | null)[]
+  lift_vs_prev: (number | null)[]
+  channels: ChannelColumns[]
+}
+
+export interface GeoSeriesColumnsResponse extends SeriesColumns {
+  geo: string
+  population: (number | null)[]
+}
+
+export type NationalSeriesColumnsResponse = SeriesColumns
+
+export type GeoAggregation = "none" | "sum" | "mean" | "population_weighted"
+
+export interface GeoBatchRequest {
+  geos?: string[] | "all"
+  start?: string
+  end?: string
+  channels?: string[]
+  aggregation?: GeoAggregation
+}
+
+export interface GeoBatchResponse {
+  geos: string[]
+  aggregation: GeoAggregation
+  start: string
+  end: string
+  points: GeoMetricPoint[]
+  series: GeoSeriesResponse[]
+}
+
 export interface GeoListItem {
   geo: string
   start: string
@@ -102,6 +151,38 @@ export interface ScenarioResponse {
   channels: ScenarioChannelProjection[]
 }
 
+export interface ScenarioGrid {
+  sources?: string[]
+  targets?: string[]
+  ratios: number[]
+}
+
+/** Exactly one of `shifts`, `grid` or `reallocations` must be set. */
+export interface ScenarioBatchRequest extends AggregateWindow {
+  shifts?: ScenarioRequest[]
+  grid?: ScenarioGrid
+  reallocations?: number[][][]
+}
+
+/** Per-channel fields are scenarios x channels matrices, ordered like `channels`. */
+export interface ScenarioBatchResponse {
+  channels: string[]
+  scenarios: number
+  source_channel: string[] | null
+  target_channel: string[] | null
+  shift_ratio: number[] | null
+  spend: number[][]
+  estimated_conversions: number[][]
+  estimated_revenue: number[][]
+  roas: number[][]
+  cac: (number | null)[][]
+  total_spend: number[]
+  projected_conversions: number[]
+  projected_revenue: number[]
+  delta_conversions: number[]
+  delta_revenue: number[]
+}
+
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
 
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
@@ -132,6 +213,13 @@ export function getGeoSeries(
   return request<GeoSeriesResponse>(`/marketing-mix/geos/${geo}${suffix}`)
 }
 
+export function getGeoBatch(payload: GeoBatchRequest) {
+  return request<GeoBatchResponse>("/marketing-mix/geos/batch", {
+    method: "POST",
+    body: JSON.stringify(payload),
+  })
+}
+
 export function getNationalSeries(params?: { start?: string; end?: string; channels?: string[] }) {
   const query = new URLSearchParams()
   if (params?.start) query.append("start", params.start)
@@ -141,12 +229,50 @@ export function getNationalSeries(params?: { start?: string; end?: string; chann
   return request<NationalSeriesResponse>(`/marketing-mix/national${suffix}`)
 }
 
-export function getChannelAggregates() {
-  return request<ChannelAggregate[]>("/marketing-mix/channels")
+export function getGeoSeriesColumns(
+  geo: string,
+  params?: { start?: string; end?: string; channels?: string[] },
+) {
+  const query = new URLSearchParams({ format: "columnar" })
+  if (params?.start) query.append("start", params.start)
+  if (params?.end) query.append("end", params.end)
+  params?.channels?.forEach((channel) => query.append("channels", channel))
+  return request<GeoSeriesColumnsResponse>(`/marketing-mix/geos/${geo}?${query.toString()}`)
 }
 
-export function getSummary() {
-  return request<SummaryResponse>("/marketing-mix/summary")
+export function getNationalSeriesColumns(params?: {
+  start?: string
+  end?: string
+  channels?: string[]
+}) {
+  const query = new URLSearchParams({ format: "columnar" })
+  if (params?.start) query.append("start", params.start)
+  if (params?.end) query.append("end", params.end)
+  params?.channels?.forEach((channel) => query.append("channels", channel))
+  return request<NationalSeriesColumnsResponse>(`/marketing-mix/national?${query.toString()}`)
+}
+
+/** A date window; `weeks` keeps only its trailing weeks (e.g. 4, 13 or 52). */
+export interface AggregateWindow {
+  start?: string
+  end?: string
+  weeks?: number
+}
+
+function windowSuffix(window?: AggregateWindow) {
+  const query = new URLSearchParams()
+  if (window?.start) query.append("start", window.start)
+  if (window?.end) query.append("end", window.end)
+  if (window?.weeks) query.append("weeks", window.weeks.toString())
+  return query.toString() ? `?${query.toString()}` : ""
+}
+
+export function getChannelAggregates(window?: AggregateWindow) {
+  return request<ChannelAggregate[]>(`/marketing-mix/channels${windowSuffix(window)}`)
+}
+
+export function getSummary(window?: AggregateWindow) {
+  return request<SummaryResponse>(`/marketing-mix/summary${windowSuffix(window)}`)
 }
 
 export function runScenarioShift(payload: ScenarioRequest) {
@@ -155,3 +281,10 @@ export function runScenarioShift(payload: ScenarioRequest) {
     body: JSON.stringify(payload),
   })
 }
+
+export function runScenarioBatch(payload: ScenarioBatchRequest) {
+  return request<ScenarioBatchResponse>("/marketing-mix/scenarios/batch", {
+    method: "POST",
+    body: JSON.stringify(payload),
+  })
+}
@@ -35,6 +35,25 @@ export interface MMMContributionSeriesResponse {
   points: MMMContributionPoint[]
 }
 
+export interface MMMContributionChannelColumns {
+  id: string
+  name: string
+  mean: number[]
+  lower: number[]
+  upper: number[]
+  share: number[]
+}
+
+export interface MMMContributionColumnsResponse {
+  start: string
+  end: string
+  time: string[]
+  total_mean: number[]
+  total_lower: number[]
+  total_upper: number[]
+  channels: MMMContributionChannelColumns[]
+}
+
 export interface MMMResponseCurvePoint {
   spend: number
   mean: number
@@ -54,6 +73,54 @@ export interface MMMResponseCurvesResponse {
   channels: MMMResponseCurveChannel[]
 }
 
+export interface MMMCurveAnalyticsChannel {
+  id: string
+  name: string
+  historical_spend: number
+  saturation_spend: number
+  saturation_spend_lower: number
+  saturation_spend_upper: number
+  diminishing_returns_start: number
+  marginal_roi: number
+}
+
+export interface MMMCurveAnalyticsResponse {
+  spend_steps: number
+  credible_interval: number
+  channels: MMMCurveAnalyticsChannel[]
+}
+
+export interface MMMBudgetBounds {
+  min_spend?: number
+  max_spend?: number | null
+}
+
+export interface MMMBudgetOptimizationRequest {
+  total_budget: number
+  bounds?: Record<string, MMMBudgetBounds>
+}
+
+export interface MMMBudgetAllocationChannel {
+  id: string
+  name: string
+  spend: number
+  mean: number
+  lower: number
+  upper: number
+  min_spend: number
+  max_spend: number
+  baseline_spend: number
+  baseline_mean: number
+}
+
+export interface MMMBudgetOptimizationResponse {
+  total_budget: number
+  expected_outcome: number
+  baseline_outcome: number
+  credible_interval: number
+  channels: MMMBudgetAllocationChannel[]
+}
+
 export function getMMMContributions(params?: {
   start?: string
   end?: string
@@ -71,6 +138,20 @@ export function getMMMContributions(params?: {
   return request<MMMContributionSeriesResponse>(`/mmm/contributions${suffix}`)
 }
 
+export function getMMMContributionColumns(params?: {
+  start?: string
+  end?: string
+  credibleInterval?: number
+}) {
+  const query = new URLSearchParams({ format: "columnar" })
+  if (params?.start) query.append("start", params.start)
+  if (params?.end) query.append("end", params.end)
+  if (params?.credibleInterval) {
+    query.append("credible_interval", params.credibleInterval.toString())
+  }
+  return request<MMMContributionColumnsResponse>(`/mmm/contributions?${query.toString()}`)
+}
+
 export function getMMMResponseCurves(params?: {
   channels?: string[]
   spendSteps?: number
@@ -86,6 +167,21 @@ export function getMMMResponseCurves(params?: {
   return request<MMMResponseCurvesResponse>(`/mmm/response-curves${suffix}`)
 }
 
+export function getMMMCurveAnalytics(params?: {
+  channels?: string[]
+  spendSteps?: number
+  credibleInterval?: number
+}) {
+  const query = new URLSearchParams()
+  params?.channels?.forEach((channel) => query.append("channels", channel))
+  if (params?.spendSteps) query.append("spend_steps", params.spendSteps.toString())
+  if (params?.credibleInterval) {
+    query.append("credible_interval", params.credibleInterval.toString())
+  }
+  const suffix = query.toString() ? `?${query.toString()}` : ""
+  return request<MMMCurveAnalyticsResponse>(`/mmm/response-curves/analytics${suffix}`)
+}
+
 export function preloadMMMModel() {
   return request<{ status: string; model_loaded: boolean; analyzer_loaded: boolean; channels: string[] }>(
     `/mmm/preload`,
@@ -145,7 +241,7 @@ export function getMMMResponseCurvesChart(params?: {
 }
 
 export function getMMMContributionChart(params?: {
-  timeGranularity?: "weekly" | "monthly" | "quarterly"
+  timeGranularity?: "weekly" | "quarterly"
 }) {
   const query = new URLSearchParams()
   if (params?.timeGranularity) {
@@ -154,3 +250,10 @@ export function getMMMContributionChart(params?: {
   const suffix = query.toString() ? `?${query.toString()}` : ""
   return request<MMMResponseCurvesVegaChart>(`/mmm/contribution-chart${suffix}`)
 }
+
+export function optimizeMMMBudget(payload: MMMBudgetOptimizationRequest) {
+  return request<MMMBudgetOptimizationResponse>("/mmm/optimize", {
+    method: "POST",
+    body: JSON.stringify(payload),
+  })
+}